@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da Geração em Lote
+
+Mede a vazão (senhas por segundo) de `src.batch.generate_batch` com
+números crescentes de processos, para conferir a escala com os núcleos.
+
+Uso (na pasta GeradorUnimed):
+    python -m benchmarks.bench_batch [--quantidade 400000] [--formato csv]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.batch import WRITERS, generate_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quantidade", type=int, default=400000)
+    parser.add_argument("--formato", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--unicas", action="store_true")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    print(f"{args.quantidade} senhas ({args.formato}), {cpus} CPUs")
+    baseline = None
+    for workers in counts:
+        with tempfile.TemporaryDirectory() as output_dir:
+            # Fragmentos menores que a fatia de cada processo mantêm todos ocupados até o fim
+            shard_size = max(1000, args.quantidade // (workers * 4))
+            result = generate_batch(args.quantidade, output_dir, fmt=args.formato, workers=workers,
+                                    shard_size=shard_size, unique=args.unicas)
+        rate = result.count / result.seconds
+        baseline = baseline or rate
+        print(f"  {workers:>2} processo(s): {rate:10.0f} senhas/s | {rate / baseline:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
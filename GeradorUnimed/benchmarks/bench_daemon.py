@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Daemon de Senhas
+
+Compara o custo por senha de três formas de chamar o gerador a partir de
+um script: um processo `python -m src.cli` por senha (partida do
+interpretador e imports a cada vez), um processo `python -m src.client`
+por senha falando com o daemon, e um `DaemonClient` com a conexão aberta.
+
+Uso (na pasta GeradorUnimed):
+    python -m benchmarks.bench_daemon [--chamadas 5000] [--processos 20]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.client import DaemonClient
+from src.daemon import PasswordDaemon, PasswordService
+
+
+def _time(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chamadas", type=int, default=5000, help="Chamadas pela conexão aberta")
+    parser.add_argument("--processos", type=int, default=20, help="Processos iniciados em cada modo por processo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = PasswordService()
+        service.warm_up()
+        daemon = PasswordDaemon(os.path.join(directory, "gerador.sock"), service).bind()
+        threading.Thread(target=daemon.serve_forever, daemon=True).start()
+        try:
+            commands = {
+                "processo src.cli": [sys.executable, "-m", "src.cli"],
+                "processo src.client": [sys.executable, "-m", "src.client", "--socket", daemon.path, "gerar"],
+            }
+            for name, command in commands.items():
+                ms = _time(lambda: subprocess.run(command, cwd=project_root, check=True, capture_output=True),
+                           args.processos)
+                print(f"{name:>24}: {ms:8.3f} ms/senha")
+
+            with DaemonClient(daemon.path) as client:
+                for command, options in (("gerar", {}), ("frase", {}), ("analisar", {"senha": "Senha!Forte123"})):
+                    client.call(command, **options)
+                    ms = _time(lambda: client.call(command, **options), args.chamadas)
+                    print(f"{'conexão aberta ' + command:>24}: {ms:8.3f} ms/chamada")
+        finally:
+            daemon.shutdown()
+
+
+if __name__ == "__main__":
+    main()
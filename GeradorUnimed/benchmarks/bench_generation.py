@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da Geração de Senhas por Fonte de Aleatoriedade
+
+Gera o mesmo lote de senhas e frases-senha com cada fonte de `src.rng`.
+A fonte determinística mede só o custo do algoritmo; a diferença para as
+demais é o custo de obter a aleatoriedade do sistema operacional.
+
+Uso (na pasta GeradorUnimed):
+    python -m benchmarks.bench_generation [--quantidade 20000] [--comprimento 16]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.config import CONFIG
+from src.logic import PasswordGenerator
+from src.rng import BufferedRandomSource, SeededRandomSource, SystemRandomSource
+
+WORDLIST = [f"palavra{i}" for i in range(7776)]
+
+SOURCES = {
+    "sistema": SystemRandomSource,
+    "buffer": BufferedRandomSource,
+    "semente": lambda: SeededRandomSource(42),
+}
+
+
+def _time(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quantidade", type=int, default=20000)
+    parser.add_argument("--comprimento", type=int, default=16)
+    args = parser.parse_args()
+
+    specials = CONFIG["DEFAULTS"]["caracteres_especiais"]
+    print(f"{args.quantidade} senhas de {args.comprimento} caracteres e frases de 6 palavras")
+    for name, factory in SOURCES.items():
+        generator = PasswordGenerator(factory())
+        password_us = _time(lambda: generator.generate(args.comprimento, True, True, True, True, False, specials),
+                            args.quantidade)
+        phrase_us = _time(lambda: generator.generate_passphrase(6, "-", WORDLIST), args.quantidade)
+        print(f"  {name:>8}: senha {password_us:7.2f} µs | frase {phrase_us:7.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Pool de Aleatoriedade
+
+Compara sorteios de inteiros limitados feitos chamada a chamada pelo
+`secrets` (uma leitura do SO por sorteio) com o pool em blocos de
+`src.rng.BufferedRandomSource`, em uma thread e em várias ao mesmo tempo.
+
+Uso (na pasta GeradorUnimed):
+    python -m benchmarks.bench_random_pool [--sorteios 200000] [--threads 4]
+"""
+
+import argparse
+import os
+import secrets
+import sys
+import threading
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.rng import BufferedRandomSource
+
+# Tamanho de um alfabeto típico (letras, números e especiais padrão)
+ALPHABET_SIZE = 70
+
+
+def _run(randbelow, draws, threads):
+    """Executa `draws` sorteios divididos entre `threads` threads; retorna ns por sorteio."""
+    per_thread = draws // threads
+
+    def work():
+        for _ in range(per_thread):
+            randbelow(ALPHABET_SIZE)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (per_thread * threads) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sorteios", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--bloco", type=int, default=BufferedRandomSource.BLOCK_SIZE)
+    args = parser.parse_args()
+
+    print(f"{args.sorteios} sorteios em [0, {ALPHABET_SIZE}), bloco de {args.bloco} bytes")
+    for threads in sorted({1, args.threads}):
+        pool = BufferedRandomSource(args.bloco)
+        per_call_ns = _run(secrets.randbelow, args.sorteios, threads)
+        pool_ns = _run(pool.randbelow, args.sorteios, threads)
+        print(f"  {threads} thread(s): por chamada {per_call_ns:7.1f} ns | pool {pool_ns:7.1f} ns "
+              f"| leituras do SO: {args.sorteios // threads * threads} vs {pool.refills}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Holofote (Spotlight)
+
+Compara a composição alfa original (três camadas do tamanho da imagem)
+com a implementação por faixas de `src.imaging.apply_spotlight`.
+
+Cada variante roda em um subprocesso próprio para que o pico de memória
+(ru_maxrss) de uma não contamine a medição da outra.
+
+Uso (na pasta GeradorUnimed):
+    python -m benchmarks.bench_spotlight [--largura 3840] [--altura 2160]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def _legacy_spotlight(image, x1, y1, x2, y2):
+    """Implementação anterior, mantida apenas para comparação."""
+    from PIL import Image, ImageDraw
+    overlay = Image.new('RGBA', image.size, (0, 0, 0, 150))
+    mask = Image.new('L', image.size, 150)
+    ImageDraw.Draw(mask).rectangle([x1, y1, x2, y2], fill=0)
+    black_layer = Image.new('RGBA', image.size, (0, 0, 0, 0))
+    ImageDraw.Draw(black_layer).rectangle([0, 0, image.width, image.height], fill=(0, 0, 0))
+    black_layer.putalpha(mask)
+    return Image.alpha_composite(image.convert("RGBA"), black_layer)
+
+
+def _max_rss_kib():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # No macOS o valor vem em bytes, no Linux em KiB
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def _run_variant(variant, width, height, mode):
+    """Executa uma variante e imprime o resultado em JSON (modo subprocesso)."""
+    from PIL import Image
+    from src.imaging import apply_spotlight
+
+    image = Image.new(mode, (width, height), "gray")
+    box = (width // 4, height // 4, width * 3 // 4, height * 3 // 4)
+    baseline = _max_rss_kib()
+
+    start = time.perf_counter()
+    if variant == "legacy":
+        image = _legacy_spotlight(image, *box)
+    else:
+        apply_spotlight(image, *box)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "variant": variant,
+        "ms": round(elapsed * 1000, 2),
+        "peak_extra_mib": round((_max_rss_kib() - baseline) / 1024, 1),
+        "mode": image.mode,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--largura", type=int, default=3840)
+    parser.add_argument("--altura", type=int, default=2160)
+    parser.add_argument("--modo", default="RGBA")
+    parser.add_argument("--variante", choices=["legacy", "bands"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variante:
+        _run_variant(args.variante, args.largura, args.altura, args.modo)
+        return
+
+    print(f"Imagem {args.largura}x{args.altura} ({args.modo})")
+    for variant in ("legacy", "bands"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_spotlight", "--variante", variant,
+             "--largura", str(args.largura), "--altura", str(args.altura), "--modo", args.modo],
+            cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output)
+        print(f"  {result['variant']:>6}: {result['ms']:8.2f} ms | pico extra {result['peak_extra_mib']:7.1f} MiB | modo final {result['mode']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Responsividade da UI (sem display)
+
+Executa a aplicação real sobre o Tk falso de `tests/ui_harness.py`, com
+cliques, teclas, trocas de lista de palavras e seleções do histórico
+sintéticos, e mostra o tempo que cada callback ocupou na thread principal
+e as threads iniciadas durante a sessão.
+
+Uso (na pasta GeradorUnimed):
+    python -m benchmarks.bench_ui [--rodadas 50] [--animacao]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tests.ui_harness import UiHarness
+
+WORDLISTS = ("Inglês (Básico)", "Animais (PT-BR)", "Português (Básico)")
+
+
+def run_session(harness, rounds):
+    app = harness.app
+    for i in range(rounds):
+        harness.click(app.tab_senha.gerar_senha_btn)
+        harness.settle()
+        harness.click(app.tab_senha.copiar_btn)
+        harness.select_history(0)
+        harness.type_text(app.tab_analyzer.password_entry, "Senha@1")
+        harness.select_wordlist(WORDLISTS[i % len(WORDLISTS)])
+        harness.click(app.tab_frase.gerar_frase_btn)
+        harness.settle()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rodadas", type=int, default=50)
+    parser.add_argument("--animacao", action="store_true", help="Mantém a animação de fundo ligada")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        harness = UiHarness(config_dir, settings={"animacao_ativa": args.animacao})
+        try:
+            run_session(harness, args.rodadas)
+        finally:
+            harness.close()
+
+    print(f"{args.rodadas} rodadas, {harness.app.now_ms / 1000:.1f} s virtuais")
+    print(f"  {'callback':<60} {'chamadas':>8} {'total ms':>9} {'máx ms':>8}")
+    for name, (calls, total_ms, max_ms) in sorted(harness.report().items(), key=lambda item: -item[1][2]):
+        print(f"  {name[:60]:<60} {calls:>8} {total_ms:>9.2f} {max_ms:>8.2f}")
+    print("Threads iniciadas: " + ", ".join(f"{name}={n}" for name, n in sorted(harness.threads_started.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Gerador de Carga do Serviço HTTP
+
+Abre `--conexoes` conexões keep-alive com o serviço de `src.http_service` e
+envia requisições sem pausa durante `--duracao` segundos, medindo vazão,
+latências (p50/p95/p99) e os status recebidos (503 indica que o serviço
+recusou carga). Sem `--porta`, sobe o serviço em um processo separado, em
+uma porta livre de localhost, e o encerra ao fim.
+
+Cenários (`--cenario`):
+    gerar      uma senha por requisição
+    lote       lote de 500 senhas (vai para o pool de processos)
+    frase      uma frase-senha por requisição
+    analisar   lote de 20 senhas para análise
+
+Uso (na pasta GeradorUnimed):
+    python -m benchmarks.loadgen [--cenario gerar] [--conexoes 32] [--duracao 10] [--porta 8080]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+SCENARIOS = {
+    "gerar": ("/gerar", {"comprimento": 16}),
+    "lote": ("/gerar", {"comprimento": 16, "quantidade": 500}),
+    "frase": ("/frase", {"palavras": 5}),
+    "analisar": ("/analisar", [{"senha": f"Senha!{i:04d}xyz"} for i in range(20)]),
+}
+
+
+def _request(host, path, body):
+    data = json.dumps(body).encode('utf-8')
+    head = f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n"
+    return head.encode('latin-1') + data
+
+
+async def _connection(host, port, request, deadline, latencies, statuses):
+    """Uma conexão: envia a próxima requisição assim que a resposta anterior chega."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode('latin-1').split("\r\n")
+            length = next(int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length:"))
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[int(lines[0].split()[1])] += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, path, body, connections, duration):
+    latencies, statuses = [], Counter()
+    request = _request(host, path, body)
+    start = time.perf_counter()
+    await asyncio.gather(*(_connection(host, port, request, start + duration, latencies, statuses)
+                           for _ in range(connections)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_service(port, workers):
+    """Sobe `python -m src.http_service` e espera a porta aceitar conexões."""
+    command = [sys.executable, "-m", "src.http_service", "--porta", str(port)]
+    if workers is not None:
+        command += ["--processos", str(workers)]
+    process = subprocess.Popen(command, cwd=project_root, stderr=subprocess.DEVNULL)
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("O serviço HTTP não subiu a tempo.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenario", choices=sorted(SCENARIOS), default="gerar")
+    parser.add_argument("--conexoes", type=int, default=32)
+    parser.add_argument("--duracao", type=float, default=10.0, help="Segundos de carga")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=None, help="Serviço já em execução (padrão: sobe um)")
+    parser.add_argument("--processos", type=int, default=None, help="Processos do serviço iniciado aqui")
+    args = parser.parse_args()
+
+    process = None
+    port = args.porta
+    if port is None:
+        port = _free_port()
+        process = _start_service(port, args.processos)
+    try:
+        path, body = SCENARIOS[args.cenario]
+        latencies, statuses, elapsed = asyncio.run(run_load(args.host, port, path, body, args.conexoes, args.duracao))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    print(f"{args.cenario}: {len(latencies)} requisições em {elapsed:.1f} s com {args.conexoes} conexões "
+          f"({len(latencies) / elapsed:.0f} req/s)")
+    if latencies:
+        print(f"  latência: p50 {_percentile(latencies, 0.5):.2f} ms | p95 {_percentile(latencies, 0.95):.2f} ms"
+              f" | p99 {_percentile(latencies, 0.99):.2f} ms | máx {latencies[-1] * 1000:.2f} ms")
+    print("  status: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Anotação em Lote (sem interface gráfica)
+
+Aplica a mesma lista de operações do editor de capturas (holofote,
+retângulo, seta, corte e texto) a muitas imagens, usando um pool de
+processos. As operações vêm de um arquivo JSON no mesmo formato usado
+pelo editor, por exemplo:
+
+    [
+        {"op": "spotlight", "coords": [120, 300, 620, 360]},
+        {"op": "rectangle", "coords": [120, 300, 620, 360]},
+        {"op": "text", "coords": [120, 380], "text": "Campo de senha", "contrast_bg": true}
+    ]
+
+Uso (na pasta GeradorUnimed):
+    python -m src.annotate operacoes.json entrada/ saida/ [--processos 4]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+from src.imaging import render, validate_operation
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp")
+
+
+class AnnotationResult(NamedTuple):
+    """Resultado do processamento de uma imagem."""
+    source: str
+    destination: str
+    error: Optional[str] = None
+
+
+def load_operations(path) -> List[dict]:
+    """
+    Carrega e valida a lista de operações de um arquivo JSON.
+
+    Raises:
+        ValueError: se o arquivo não contiver uma lista de operações válidas.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        operations = json.load(f)
+    if not isinstance(operations, list):
+        raise ValueError("O arquivo de operações deve conter uma lista JSON")
+    return [validate_operation(operation) for operation in operations]
+
+
+def iter_images(input_dir, output_dir, extension=None) -> Iterator[Tuple[str, str]]:
+    """Percorre a pasta de entrada sob demanda, gerando pares (origem, destino)."""
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            name = entry.name
+            if extension:
+                name = os.path.splitext(name)[0] + "." + extension.lstrip(".")
+            yield entry.path, os.path.join(output_dir, name)
+
+
+def annotate_file(source, destination, operations) -> AnnotationResult:
+    """Abre uma imagem, aplica as operações em resolução total e salva o resultado."""
+    try:
+        with Image.open(source) as image:
+            result = render(image, operations)
+        if result.mode == "RGBA" and destination.lower().endswith((".jpg", ".jpeg")):
+            result = result.convert("RGB")
+        result.save(destination)
+        return AnnotationResult(source, destination)
+    except Exception as e: # Ex: DecompressionBombError, erro do decodificador; só este arquivo falha
+        return AnnotationResult(source, destination, f"{type(e).__name__}: {e}")
+
+
+def annotate_batch(jobs: Iterable[Tuple[str, str]], operations, workers=None, max_pending=None) -> Iterator[AnnotationResult]:
+    """
+    Processa os pares (origem, destino) em um pool de processos.
+
+    Os pares são consumidos de forma preguiçosa: no máximo `max_pending`
+    imagens ficam em andamento ao mesmo tempo, então a memória não cresce
+    com o tamanho do lote. Os resultados são gerados conforme terminam.
+    """
+    operations = [validate_operation(operation) for operation in operations]
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    jobs = iter(jobs)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        finished = deque()
+        while True:
+            for source, destination in jobs:
+                pending.add(executor.submit(annotate_file, source, destination, operations))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            finished.extend(future.result() for future in done)
+            while finished:
+                yield finished.popleft()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica anotações do editor de capturas a uma pasta de imagens.")
+    parser.add_argument("operacoes", help="Arquivo JSON com a lista de operações")
+    parser.add_argument("entrada", help="Pasta com as imagens de origem")
+    parser.add_argument("saida", help="Pasta onde as imagens anotadas serão salvas")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: nº de CPUs)")
+    parser.add_argument("--formato", default=None, help="Extensão de saída (ex: png). Padrão: mantém a original")
+    args = parser.parse_args(argv)
+
+    try:
+        operations = load_operations(args.operacoes)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao carregar as operações: {e}", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.saida, exist_ok=True)
+    processed = failed = 0
+    for result in annotate_batch(iter_images(args.entrada, args.saida, args.formato), operations, args.processos):
+        if result.error:
+            failed += 1
+            print(f"Erro em {result.source}: {result.error}", file=sys.stderr)
+        else:
+            processed += 1
+    print(f"{processed} imagens anotadas, {failed} com erro.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
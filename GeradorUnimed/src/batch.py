@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Geração em Lote
+
+Gera grandes volumes de senhas (ex: rotação anual de credenciais)
+dividindo o trabalho em fragmentos (shards) processados por um pool de
+processos. Cada processo usa seu próprio pool do CSPRNG do sistema e
+grava o fragmento diretamente no disco por um escritor em streaming
+(CSV, JSONL ou cifrado, veja `src.export`), então a memória não cresce
+com o tamanho do lote.
+
+A verificação opcional de unicidade percorre os fragmentos com um filtro
+de Bloom; só os possíveis repetidos são conferidos de forma exata e as
+repetições são substituídas por senhas novas.
+"""
+
+import csv
+import json
+import math
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+from src.bloom import BloomFilter
+from src.config import CONFIG
+from src.export import EncryptedShardWriter
+from src.logic import PasswordGenerator
+from src.rng import BufferedRandomSource
+
+SHARD_SIZE = 100_000
+MAX_REPLACEMENT_ATTEMPTS = 1000 # Tentativas para achar uma senha inédita
+
+
+class BatchPolicy(NamedTuple):
+    """Critérios das senhas do lote (mesmos do PasswordGenerator)."""
+    length: int = CONFIG["DEFAULTS"]["comprimento"]
+    use_upper: bool = True
+    use_lower: bool = True
+    use_digits: bool = True
+    use_special: bool = True
+    exclude_ambiguous: bool = False
+    special_chars: str = CONFIG["DEFAULTS"]["caracteres_especiais"]
+    target_bits: Optional[float] = None # Se definido, ignora `length` (modo de entropia-alvo)
+
+    def options(self):
+        return (self.use_upper, self.use_lower, self.use_digits, self.use_special,
+                self.exclude_ambiguous, self.special_chars)
+
+    def generator_function(self, generator):
+        """Retorna uma função sem argumentos que gera (senha, entropia) segundo a política."""
+        if self.target_bits is not None:
+            return lambda: generator.generate_for_entropy(self.target_bits, *self.options())
+        return lambda: generator.generate(self.length, *self.options())
+
+
+class ShardResult(NamedTuple):
+    index: int
+    path: str
+    count: int
+    seconds: float
+
+
+class BatchResult(NamedTuple):
+    paths: list
+    count: int
+    duplicates_replaced: int
+    seconds: float
+
+
+class CsvShardWriter:
+    """Grava as senhas em CSV (colunas senha, entropia), linha a linha."""
+    extension = "csv"
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["senha", "entropia"])
+
+    def write(self, password, entropy):
+        self._writer.writerow([password, f"{entropy:.2f}"])
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def read(path):
+        """Itera sobre (senha, entropia) de um fragmento gravado."""
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for password, entropy in reader:
+                yield password, float(entropy)
+
+
+class JsonlShardWriter:
+    """Grava uma senha por linha em JSON ({"senha": ..., "entropia": ...})."""
+    extension = "jsonl"
+
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, password, entropy):
+        self._file.write(json.dumps({"senha": password, "entropia": round(entropy, 2)}) + "\n")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def read(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                yield record["senha"], record["entropia"]
+
+
+WRITERS = {
+    "csv": CsvShardWriter,
+    "jsonl": JsonlShardWriter,
+    "enc": EncryptedShardWriter, # Exige writer_options={"passphrase": ...}
+}
+
+
+def _generate_shard(index, count, path, fmt, policy, writer_options):
+    """Gera um fragmento em um processo do pool, com um CSPRNG próprio."""
+    start = time.perf_counter()
+    generate = policy.generator_function(PasswordGenerator(BufferedRandomSource()))
+    with WRITERS[fmt](path, **writer_options) as writer:
+        for _ in range(count):
+            writer.write(*generate())
+    return ShardResult(index, path, count, time.perf_counter() - start)
+
+
+def _find_duplicates(paths, fmt, total, error_rate, writer_options, issued=None):
+    """
+    Retorna (repetidas, já emitidas, filtro, fragmentos afetados) para as senhas dos fragmentos.
+
+    Primeira passada: o filtro de Bloom separa os possíveis repetidos
+    (poucos, pela taxa de falsos positivos) e o registro `issued`, se
+    houver, aponta as senhas já emitidas em lotes anteriores. Segunda
+    passada: contagem exata apenas dos candidatos a repetidos. Os
+    fragmentos afetados são os que contêm alguma senha repetida ou já
+    emitida; só eles precisam ser reescritos.
+    """
+    read = lambda path: WRITERS[fmt].read(path, **writer_options)
+    bloom = BloomFilter(max(total, 1), error_rate)
+    candidates, reissued, affected = set(), set(), set()
+    for path in paths:
+        for password, _ in read(path):
+            if bloom.add(password):
+                candidates.add(password)
+            if issued is not None and password in issued:
+                reissued.add(password)
+                affected.add(path)
+    if not candidates:
+        return set(), reissued, bloom, affected
+
+    counts, found = Counter(), {}
+    for path in paths:
+        for password, _ in read(path):
+            if password in candidates:
+                counts[password] += 1
+                found.setdefault(path, set()).add(password)
+    repeated = {password for password, n in counts.items() if n > 1}
+    affected.update(path for path, passwords in found.items() if passwords & repeated)
+    return repeated, reissued, bloom, affected
+
+
+def _fresh_password(generate, bloom, issued):
+    """Gera uma senha certamente inédita no lote (ausente do filtro), e não emitida antes, e a registra."""
+    for _ in range(MAX_REPLACEMENT_ATTEMPTS):
+        password, entropy = generate()
+        if issued is not None and password in issued:
+            continue
+        if not bloom.add(password):
+            return password, entropy
+    raise ValueError("Não foi possível gerar senhas únicas: aumente o comprimento ou as classes.")
+
+
+def _replace_duplicates(paths, fmt, repeated, reissued, bloom, generate, writer_options, issued=None):
+    """
+    Reescreve os fragmentos `paths` (na ordem do lote): mantém a primeira
+    ocorrência de cada senha repetida e troca todas as ocorrências das já
+    emitidas. Em caso de erro, o arquivo temporário é apagado.
+    """
+    writer_class = WRITERS[fmt]
+    kept, replaced = set(), 0
+    for path in paths:
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=".lote-", suffix=".tmp", dir=directory)
+        os.close(fd)
+        changed = False
+        try:
+            with writer_class(temp_path, **writer_options) as writer:
+                for password, entropy in writer_class.read(path, **writer_options):
+                    if password in reissued or password in kept:
+                        password, entropy = _fresh_password(generate, bloom, issued)
+                        replaced += 1
+                        changed = True
+                    elif password in repeated:
+                        kept.add(password)
+                    writer.write(password, entropy)
+            if changed:
+                os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return replaced
+
+
+def _register_issued(paths, fmt, writer_options, issued):
+    """Registra todas as senhas do lote como emitidas."""
+    for path in paths:
+        for password, _ in WRITERS[fmt].read(path, **writer_options):
+            issued.add(password)
+    issued.flush()
+
+
+def generate_batch(total, output_dir, policy=BatchPolicy(), fmt="csv", workers=None,
+                   shard_size=SHARD_SIZE, unique=False, error_rate=0.001, writer_options=None, issued=None):
+    """
+    Gera `total` senhas em fragmentos de até `shard_size` dentro de `output_dir`.
+
+    Com `unique=True`, garante que nenhuma senha se repete no lote.
+    `writer_options` é repassado ao escritor (ex: a senha do formato "enc").
+    Com `issued` (um PersistentBloomFilter), senhas emitidas em lotes
+    anteriores também são trocadas e as do lote passam a constar nele;
+    isso implica `unique=True`.
+    Retorna um BatchResult com os caminhos dos fragmentos.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Formato desconhecido: {fmt} (use {', '.join(WRITERS)})")
+    if not any(policy.options()[:4]):
+        raise ValueError("Selecione ao menos uma classe de caracteres.")
+    if total < 0 or shard_size <= 0:
+        raise ValueError("A quantidade e o tamanho do fragmento devem ser positivos.")
+    if policy.target_bits is not None:
+        # Falha aqui, e não dentro de cada processo, se o alvo for inatingível
+        generator = PasswordGenerator()
+        generator.minimum_length(policy.target_bits, generator.character_classes(*policy.options()))
+
+    writer_options = writer_options or {}
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    num_shards = math.ceil(total / shard_size)
+    extension = WRITERS[fmt].extension
+    jobs = [
+        (index, min(shard_size, total - index * shard_size),
+         os.path.join(output_dir, f"lote_{index:05d}.{extension}"), fmt, policy, writer_options)
+        for index in range(num_shards)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_generate_shard, *job) for job in jobs]
+        shards = [future.result() for future in futures]
+    paths = [shard.path for shard in shards]
+
+    replaced = 0
+    if (unique or issued is not None) and total:
+        # Feito no processo principal: os fragmentos são gerados em paralelo,
+        # mas o registro em disco tem um único escritor
+        repeated, reissued, bloom, affected = _find_duplicates(paths, fmt, total, error_rate, writer_options, issued)
+        if affected:
+            # As substituições saem do filtro já com todo o lote, então são inéditas
+            generate = policy.generator_function(PasswordGenerator(BufferedRandomSource()))
+            replaced = _replace_duplicates([path for path in paths if path in affected], fmt, repeated, reissued,
+                                           bloom, generate, writer_options, issued)
+        if issued is not None:
+            _register_issued(paths, fmt, writer_options, issued)
+
+    return BatchResult(paths, total, replaced, time.perf_counter() - start)
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo do Filtro de Bloom
+
+Estrutura probabilística para testar se uma senha já foi vista usando
+poucos bits por item. Não há falsos negativos; a taxa de falsos positivos
+é escolhida na criação.
+
+- BloomFilter: em memória, usado na verificação de unicidade dos lotes.
+- PersistentBloomFilter: em arquivo mapeado na memória (mmap), registra
+  todas as senhas já emitidas. Guarda apenas bits de hashes com sal
+  (blake2b com chave aleatória por arquivo), nunca o texto das senhas.
+  A chave fica fora do arquivo, no cofre de chaves (veja `src.keystore`):
+  com ela ao lado dos bits, frases-senha curtas poderiam ser testadas
+  offline contra o registro.
+"""
+
+import base64
+import hashlib
+import math
+import os
+import struct
+import threading
+
+from src.keystore import KeyStore
+
+
+def filter_size(capacity, error_rate):
+    """Retorna (bits, funções de hash) ótimos para a capacidade e a taxa de erro."""
+    if capacity <= 0 or not 0 < error_rate < 1:
+        raise ValueError("A capacidade deve ser positiva e a taxa de erro estar entre 0 e 1.")
+    num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+    return num_bits, max(1, round(num_bits / capacity * math.log(2)))
+
+
+class BloomFilter:
+    """Filtro de Bloom em memória dimensionado para `capacity` itens."""
+
+    def __init__(self, capacity, error_rate=0.001, salt=b""):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits, self.num_hashes = filter_size(capacity, error_rate)
+        self.salt = salt
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _digest(self, item):
+        """Hash de 128 bits do item (com o sal como chave); as k posições derivam dele."""
+        if isinstance(item, str):
+            item = item.encode('utf-8')
+        return hashlib.blake2b(item, digest_size=16, key=self.salt).digest()
+
+    def _positions(self, item):
+        digest = self._digest(item)
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        """Adiciona o item. Retorna True se ele possivelmente já estava no filtro."""
+        present = True
+        bits = self._bits
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+
+class PersistentBloomFilter(BloomFilter):
+    """
+    Filtro de Bloom gravado em arquivo e acessado por mmap.
+
+    O arquivo só é criado (ou aberto) no primeiro uso; a capacidade e a
+    taxa de erro valem apenas na criação, depois são lidas do cabeçalho.
+    As consultas tocam só as k posições no mapa, então continuam rápidas
+    com dezenas de milhões de senhas. Pode ser compartilhado entre threads.
+
+    O cabeçalho guarda só o identificador da chave do blake2b; a chave fica
+    em `key_store` (padrão: o cofre do diretório do arquivo). Registros da
+    versão 1, com o sal no cabeçalho, têm o sal levado ao cofre e apagado
+    do arquivo na primeira abertura.
+
+    Acima da capacidade a taxa de falsos positivos dispara (com 1 milhão de
+    vagas: 7% com 3 milhões de itens, 98% com 10 milhões). Por isso, ao
+    encher, o arquivo é lacrado como `<caminho>.1`, `<caminho>.2`, ... e um
+    novo, com a mesma capacidade, passa a receber as senhas (filtro de Bloom
+    escalável); as consultas olham todos, e a taxa total fica perto de
+    `error_rate` vezes o número de arquivos.
+
+    O contador de itens é gravado no mapa a cada senha nova, então sobrevive
+    a um encerramento abrupto (e a virada de arquivo não atrasa). Enquanto
+    aberto, o registro fica travado para o processo por `<caminho>.lock`
+    (flock/msvcrt); outro processo que tente usá-lo recebe ValueError, em vez
+    de continuar gravando em um arquivo que já foi lacrado.
+    """
+    MAGIC = b"UNIBLM"
+    VERSION = 2
+    HEADER = struct.Struct(">6sBQBQQ32s") # marca, versão, bits, hashes, capacidade, itens, id da chave (v1: sal)
+    COUNT_OFFSET = HEADER.size - 32 - 8
+    KEY_ID_SIZE = 16
+    DEFAULT_CAPACITY = 1_000_000
+    DEFAULT_ERROR_RATE = 1e-6
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE, key_store=None,
+                 exclusive=True):
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.key_store = key_store
+        self.exclusive = exclusive # False só para os lacrados, já protegidos pela trava do registro
+        self.count = 0
+        self._lock = threading.RLock()
+        self._file = self._mmap = self._bits = None
+        self._lock_fd = None
+        self._sealed = [] # Arquivos cheios, só consultados
+
+    def _keys(self):
+        if self.key_store is None:
+            self.key_store = KeyStore(os.path.dirname(os.path.abspath(self.path)))
+        return self.key_store
+
+    @staticmethod
+    def _key_name(key_id):
+        return f"registro-{key_id[:PersistentBloomFilter.KEY_ID_SIZE].hex()}"
+
+    def _open(self):
+        """Abre o registro e os arquivos lacrados ao lado dele."""
+        if self._mmap is not None:
+            return
+        if self.exclusive:
+            self._acquire_file_lock()
+        try:
+            self._map()
+        except BaseException:
+            self._release_file_lock()
+            raise
+        paths = []
+        while os.path.exists(f"{self.path}.{len(paths) + 1}"):
+            paths.append(f"{self.path}.{len(paths) + 1}")
+        self._sealed = [PersistentBloomFilter(path, key_store=self._keys(), exclusive=False) for path in paths]
+
+    def _acquire_file_lock(self):
+        """Trava `<caminho>.lock` para este processo; ValueError se outro já o usa."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            raise ValueError(f"O registro {self.path} está em uso por outro processo.") from None
+        self._lock_fd = fd
+
+    def _release_file_lock(self):
+        if self._lock_fd is None:
+            return
+        if os.name == "nt":
+            import msvcrt
+            os.lseek(self._lock_fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._lock_fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._lock_fd) # No POSIX, fechar libera o flock
+        self._lock_fd = None
+
+    def _map(self):
+        """Mapeia o arquivo existente ou cria um novo, com chave aleatória e permissão restrita."""
+        import mmap
+        if not os.path.exists(self.path):
+            self._create()
+        self._file = open(self.path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        magic, version, self.num_bits, self.num_hashes, self.capacity, self.count, key_id = \
+            self.HEADER.unpack_from(self._mmap)
+        if magic != self.MAGIC or version not in (1, self.VERSION):
+            self._unmap()
+            raise ValueError(f"{self.path} não é um registro de senhas emitidas.")
+        if version == 1:
+            key_id = self._move_salt_to_key_store(key_id)
+        key = self._keys().get(self._key_name(key_id))
+        if not key:
+            self._unmap()
+            raise ValueError(f"A chave do registro {self.path} não está no cofre de chaves.")
+        self.salt = base64.b64decode(key)
+        self.error_rate = (1 - math.exp(-self.num_hashes / self.num_bits * self.capacity)) ** self.num_hashes
+        self._bits = memoryview(self._mmap)[self.HEADER.size:]
+
+    def _create(self):
+        """Cria o arquivo vazio; a chave vai antes para o cofre, senão o arquivo ficaria inutilizável."""
+        self.num_bits, self.num_hashes = filter_size(self.capacity, self.error_rate)
+        key_id = os.urandom(self.KEY_ID_SIZE)
+        self._keys().get_or_create(self._key_name(key_id), lambda: base64.b64encode(os.urandom(32)))
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.num_bits, self.num_hashes,
+                                  self.capacity, 0, key_id)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.truncate(self.HEADER.size + (self.num_bits + 7) // 8) # Arquivo esparso
+
+    def _move_salt_to_key_store(self, salt):
+        """Converte um registro da versão 1: o sal vai para o cofre e o cabeçalho passa a ter só o id."""
+        key_id = os.urandom(self.KEY_ID_SIZE)
+        self._keys().get_or_create(self._key_name(key_id), lambda: base64.b64encode(salt))
+        self._mmap[self.HEADER.size - 32:self.HEADER.size] = key_id.ljust(32, b"\0")
+        self._mmap[len(self.MAGIC)] = self.VERSION
+        self._mmap.flush()
+        return key_id
+
+    def _roll_over(self):
+        """Lacra o arquivo cheio e cria um novo no mesmo caminho."""
+        sealed_path = f"{self.path}.{len(self._sealed) + 1}"
+        self._unmap()
+        os.replace(self.path, sealed_path)
+        self._sealed.append(PersistentBloomFilter(sealed_path, key_store=self._keys(), exclusive=False))
+        self._map()
+
+    def add(self, item):
+        with self._lock:
+            self._open()
+            if super().__contains__(item) or any(item in sealed for sealed in self._sealed):
+                return True
+            if self.count >= self.capacity:
+                self._roll_over()
+            present = super().add(item)
+            if not present:
+                struct.pack_into(">Q", self._mmap, self.COUNT_OFFSET, self.count) # Vale mesmo sem close()
+            return present
+
+    def __contains__(self, item):
+        with self._lock:
+            self._open()
+            return super().__contains__(item) or any(item in sealed for sealed in self._sealed)
+
+    def __len__(self):
+        with self._lock:
+            self._open()
+            return self.count + sum(len(sealed) for sealed in self._sealed)
+
+    @property
+    def generations(self):
+        """Número de arquivos do registro (o atual e os lacrados)."""
+        with self._lock:
+            self._open()
+            return 1 + len(self._sealed)
+
+    def flush(self):
+        """Grava o contador no cabeçalho e sincroniza o mapa com o disco."""
+        with self._lock:
+            if self._mmap is None:
+                return
+            struct.pack_into(">Q", self._mmap, self.COUNT_OFFSET, self.count)
+            self._mmap.flush()
+
+    def close(self):
+        with self._lock:
+            self._unmap()
+            for sealed in self._sealed:
+                sealed.close()
+            self._sealed = []
+            self._release_file_lock()
+
+    def _unmap(self):
+        with self._lock:
+            if self._mmap is None:
+                return
+            if self._bits is not None:
+                self.flush()
+                self._bits.release()
+            self._mmap.close()
+            self._file.close()
+            self._file = self._mmap = self._bits = None
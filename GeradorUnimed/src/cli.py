@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Linha de Comando
+
+Gera senhas sem interface gráfica, para emissão em volume (ex: contas de
+serviço). Além do comprimento fixo, aceita uma entropia-alvo: cada senha
+terá o menor comprimento que atinge os bits pedidos com as classes de
+caracteres escolhidas.
+
+Com `--saida`, as senhas são gravadas em fragmentos por vários processos
+(veja `src.batch`), para lotes de milhões de senhas.
+
+Exemplos:
+    python -m src.cli --entropia 100 --quantidade 50 --sem-especiais
+    python -m src.cli --quantidade 1000000 --saida lote/ --formato jsonl --unicas
+    python -m src.cli --quantidade 1000000 --saida lote/ --formato enc --registro emitidas.bloom
+"""
+
+import argparse
+import math
+import sys
+
+from src.batch import WRITERS, BatchPolicy, generate_batch
+from src.bloom import PersistentBloomFilter
+from src.config import CONFIG
+from src.export import read_passphrase
+from src.logic import PasswordGenerator
+from src.rng import random_pool
+
+
+def policy_length(value):
+    """Comprimento dentro dos limites da política (os mesmos da interface)."""
+    length = int(value)
+    if not PasswordGenerator.MIN_LENGTH <= length <= PasswordGenerator.MAX_LENGTH:
+        raise argparse.ArgumentTypeError(
+            f"o comprimento deve estar entre {PasswordGenerator.MIN_LENGTH} e {PasswordGenerator.MAX_LENGTH}")
+    return length
+
+
+def target_bits(value):
+    """Entropia-alvo: um número finito e positivo de bits."""
+    bits = float(value)
+    if not math.isfinite(bits) or bits <= 0:
+        raise argparse.ArgumentTypeError("a entropia deve ser um número de bits finito e positivo")
+    return bits
+
+
+def check_target(target, options):
+    """Mensagem de erro se o alvo daria senhas abaixo do comprimento mínimo; None se ele é válido."""
+    generator = PasswordGenerator()
+    try:
+        generator.target_length(target, generator.character_classes(*options))
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def add_registry_arguments(parser):
+    """Opções do registro de senhas emitidas (também usadas pelo daemon e pelo serviço HTTP)."""
+    registro = parser.add_argument_group("registro de senhas emitidas")
+    registro.add_argument("--registro", default=None,
+                          help="Arquivo do registro (filtro de Bloom); senhas já emitidas são sorteadas de novo")
+    registro.add_argument("--registro-capacidade", type=int, default=PersistentBloomFilter.DEFAULT_CAPACITY,
+                          help="Capacidade ao criar o registro")
+    registro.add_argument("--registro-taxa-erro", type=float, default=PersistentBloomFilter.DEFAULT_ERROR_RATE,
+                          help="Taxa de falsos positivos ao criar o registro")
+
+
+def open_registry(args):
+    """PersistentBloomFilter pedido em `--registro` (aberto no primeiro uso), ou None."""
+    if not args.registro:
+        return None
+    return PersistentBloomFilter(args.registro, args.registro_capacidade, args.registro_taxa_erro)
+
+
+def build_parser():
+    defaults = CONFIG["DEFAULTS"]
+    parser = argparse.ArgumentParser(description="Gera senhas aleatórias pela linha de comando.")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument("--comprimento", type=policy_length, default=None,
+                      help=f"Comprimento fixo, de {PasswordGenerator.MIN_LENGTH} a {PasswordGenerator.MAX_LENGTH} "
+                           f"(padrão: {defaults['comprimento']})")
+    modo.add_argument("--entropia", type=target_bits, default=None,
+                      help="Entropia mínima em bits; usa o menor comprimento que a atinge")
+    parser.add_argument("--quantidade", type=int, default=1, help="Número de senhas a gerar")
+    parser.add_argument("--sem-maiusculas", action="store_true", help="Não usar letras maiúsculas")
+    parser.add_argument("--sem-minusculas", action="store_true", help="Não usar letras minúsculas")
+    parser.add_argument("--sem-numeros", action="store_true", help="Não usar números")
+    parser.add_argument("--sem-especiais", action="store_true", help="Não usar caracteres especiais")
+    parser.add_argument("--excluir-ambiguos", action="store_true", help="Excluir caracteres ambíguos (Il1O0o)")
+    parser.add_argument("--especiais", default=defaults["caracteres_especiais"],
+                        help="Caracteres especiais permitidos")
+    add_registry_arguments(parser)
+    lote = parser.add_argument_group("geração em lote")
+    lote.add_argument("--saida", default=None, help="Pasta onde os fragmentos do lote serão gravados")
+    lote.add_argument("--formato", choices=sorted(WRITERS), default="csv", help="Formato dos fragmentos")
+    lote.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: nº de CPUs)")
+    lote.add_argument("--unicas", action="store_true", help="Garante que nenhuma senha se repete no lote")
+    return parser
+
+
+def run_batch(args, options, issued):
+    """Gera o lote em fragmentos no disco e imprime um resumo."""
+    policy = BatchPolicy(CONFIG["DEFAULTS"]["comprimento"] if args.comprimento is None else args.comprimento,
+                         *options, target_bits=args.entropia)
+    try:
+        # O formato cifrado pede a senha de exportação (ou a lê de GERADOR_SENHA_EXPORTACAO)
+        writer_options = {"passphrase": read_passphrase(confirm=True)} if args.formato == "enc" else {}
+        result = generate_batch(args.quantidade, args.saida, policy, args.formato, args.processos,
+                                unique=args.unicas, writer_options=writer_options, issued=issued)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+    rate = result.count / result.seconds if result.seconds else 0
+    print(f"{result.count} senhas em {len(result.paths)} fragmentos ({rate:.0f}/s), "
+          f"{result.duplicates_replaced} repetições substituídas.", file=sys.stderr)
+    return 0
+
+
+def run_single(args, options, generator):
+    """Gera as senhas uma a uma e as imprime na saída padrão."""
+    try:
+        if args.entropia is not None:
+            # Valida o alvo uma vez; a tabela fica em cache para as demais senhas
+            generator.minimum_length(args.entropia, generator.character_classes(*options))
+            generate = lambda: generator.generate_for_entropy(args.entropia, *options)
+        else:
+            length = CONFIG["DEFAULTS"]["comprimento"] if args.comprimento is None else args.comprimento
+            generate = lambda: generator.generate(length, *options)
+
+        for _ in range(args.quantidade):
+            password, entropy = generate()
+            print(password)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+    print(f"{args.quantidade} senhas de {len(password)} caracteres, {entropy:.2f} bits cada.", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = (
+        not args.sem_maiusculas, not args.sem_minusculas, not args.sem_numeros,
+        not args.sem_especiais, args.excluir_ambiguos, args.especiais,
+    )
+    if args.quantidade < 1:
+        print("A quantidade deve ser ao menos 1.", file=sys.stderr)
+        return 2
+    if not any(options[:4]):
+        print("Selecione ao menos uma classe de caracteres.", file=sys.stderr)
+        return 2
+    error = check_target(args.entropia, options) if args.entropia is not None else None
+    if error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 2
+
+    issued = open_registry(args)
+    try:
+        if args.saida:
+            return run_batch(args, options, issued)
+        return run_single(args, options, PasswordGenerator(random_pool, issued=issued))
+    finally:
+        if issued is not None:
+            issued.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo do Cliente do Daemon
+
+Cliente leve do daemon de senhas (veja `src.daemon`). Usa apenas a
+biblioteca padrão: não importa `requests`, a criptografia nem as listas de
+palavras, e por isso abre rápido. Uma conexão atende quantas chamadas
+forem necessárias; em scripts com muitas chamadas, mantenha um
+`DaemonClient` aberto (ou peça várias senhas de uma vez com --quantidade)
+em vez de iniciar um processo por senha.
+
+O protocolo é uma linha JSON por requisição e uma por resposta:
+    {"comando": "gerar", "comprimento": 20}
+    {"ok": true, "senhas": ["..."], "entropia": 131.1}
+
+Exemplos:
+    python -m src.client gerar --comprimento 20 --quantidade 100
+    python -m src.client frase --palavras 5 --lista "Inglês (Básico)"
+    echo "minha senha" | python -m src.client verificar
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+from src.config import user_config_dir
+
+SOCKET_NAME = "gerador.sock"
+SOCKET_ENV = "GERADOR_SOCKET"
+
+
+def default_socket_path():
+    """Caminho do socket: a variável GERADOR_SOCKET ou o diretório do usuário."""
+    return os.environ.get(SOCKET_ENV) or os.path.join(user_config_dir(), SOCKET_NAME)
+
+
+class DaemonError(Exception):
+    """Erro devolvido pelo daemon ou falha na comunicação com ele."""
+
+
+class DaemonClient:
+    """Conexão persistente com o daemon; use como contexto ou chame `close`."""
+    def __init__(self, path=None, timeout=10):
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def connect(self):
+        if self._sock is not None:
+            return self
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonError("Sockets Unix não são suportados neste sistema.")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            raise DaemonError(f"Daemon indisponível em {self.path}: {e}") from e
+        self._sock = sock
+        self._file = sock.makefile('rwb')
+        return self
+
+    def close(self):
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = self._file = None
+
+    def call(self, command, **params):
+        """Envia um comando e devolve a resposta (dict); DaemonError se ela não for `ok`."""
+        self.connect()
+        message = json.dumps({"comando": command, **params}).encode('utf-8') + b"\n"
+        try:
+            self._file.write(message)
+            self._file.flush()
+            line = self._file.readline()
+        except OSError as e:
+            self.close()
+            raise DaemonError(f"Falha na comunicação com o daemon: {e}") from e
+        if not line:
+            self.close()
+            raise DaemonError("O daemon encerrou a conexão.")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("erro", "Erro desconhecido no daemon."))
+        return response
+
+    def generate(self, **options):
+        """Senhas aleatórias: {"senhas": [...], "entropia": bits}."""
+        return self.call("gerar", **options)
+
+    def passphrase(self, **options):
+        """Frases-senha: {"senhas": [...], "entropia": bits}."""
+        return self.call("frase", **options)
+
+    def analyze(self, password):
+        """Regras de força e entropia: {"regras": {...}, "entropia": bits}."""
+        return self.call("analisar", senha=password)
+
+    def check(self, password):
+        """True se vazada, False se não encontrada, None se a API falhou."""
+        return self.call("verificar", senha=password)["vazada"]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Cliente do daemon de senhas (python -m src.daemon).")
+    parser.add_argument("--socket", default=None, help=f"Caminho do socket (padrão: ${SOCKET_ENV} ou o diretório do usuário)")
+    commands = parser.add_subparsers(dest="comando", required=True)
+
+    gerar = commands.add_parser("gerar", help="Gera senhas aleatórias")
+    modo = gerar.add_mutually_exclusive_group()
+    modo.add_argument("--comprimento", type=int, default=None, help="Comprimento fixo")
+    modo.add_argument("--entropia", type=float, default=None, help="Entropia mínima em bits")
+    gerar.add_argument("--quantidade", type=int, default=1)
+    gerar.add_argument("--sem-maiusculas", dest="maiusculas", action="store_false")
+    gerar.add_argument("--sem-minusculas", dest="minusculas", action="store_false")
+    gerar.add_argument("--sem-numeros", dest="numeros", action="store_false")
+    gerar.add_argument("--sem-especiais", dest="especiais", action="store_false")
+    gerar.add_argument("--excluir-ambiguos", action="store_true")
+    gerar.add_argument("--especiais", dest="caracteres_especiais", default=None, help="Caracteres especiais permitidos")
+
+    frase = commands.add_parser("frase", help="Gera frases-senha")
+    frase.add_argument("--palavras", type=int, default=None)
+    frase.add_argument("--separador", default=None)
+    frase.add_argument("--lista", default=None, help="Nome da lista de palavras (ex: \"Inglês (Básico)\")")
+    frase.add_argument("--quantidade", type=int, default=1)
+
+    # A senha pode vir da entrada padrão, para não aparecer na lista de processos
+    for name, help_text in (("analisar", "Analisa a força de uma senha"),
+                            ("verificar", "Verifica se a senha aparece em vazamentos")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("senha", nargs="?", default=None, help="Senha (padrão: lida da entrada padrão)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    params = {key: value for key, value in vars(args).items()
+              if key not in ("socket", "comando") and value is not None}
+    if args.comando in ("analisar", "verificar") and "senha" not in params:
+        params["senha"] = sys.stdin.readline().rstrip("\r\n")
+
+    try:
+        with DaemonClient(args.socket) as client:
+            response = client.call(args.comando, **params)
+    except DaemonError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+
+    if args.comando in ("gerar", "frase"):
+        print("\n".join(response["senhas"]))
+    elif args.comando == "analisar":
+        for rule, ok in response["regras"].items():
+            print(f"{'✔' if ok else '❌'} {rule}")
+        print(f"{response['entropia']:.2f} bits")
+    else:
+        leaked = response["vazada"]
+        print({True: "vazada", False: "não encontrada"}.get(leaked, "erro na verificação"))
+        return {True: 1, False: 0}.get(leaked, 2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
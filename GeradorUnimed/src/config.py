@@ -4,8 +4,13 @@ Módulo de Configuração
 
 Este arquivo centraliza todas as constantes do projeto,
 como cores, fontes e configurações padrão, para fácil manutenção.
+Usa apenas a biblioteca padrão, para poder ser importado por
+clientes leves (veja `src.client`).
 """
 
+import os
+import sys
+
 # 2. MÓDULO DE CONFIGURAÇÃO (CONSTANTES)
 # Agrupar constantes melhora a manutenção e a clareza do código.
 CONFIG = {
@@ -33,6 +38,24 @@ CONFIG = {
         "TOOLTIP": ("Segoe UI", 8, "normal"),
         "ANIMACAO": ("Consolas", 18, "bold"),
     },
+    # Fontes dos widgets CustomTkinter (argumentos do CTkFont), criadas uma única vez em src/ui/styles.py
+    "FONTES_CTK": {
+        "CORPO": {"size": 14},
+        "CORPO_NEGRITO": {"size": 14, "weight": "bold"},
+        "SENHA": {"size": 16},
+        "CABECALHO": {"size": 24, "weight": "bold"},
+        "EDITOR": {"size": 12},
+        "EDITOR_NEGRITO": {"size": 12, "weight": "bold"},
+    },
+    # Cores que mudam com o tema (o modo corporativo troca todas de uma vez)
+    "TEMAS": {
+        "normal": {
+            "JANELA_FUNDO": "black",
+        },
+        "corporativo": {
+            "JANELA_FUNDO": "#1a1a1a", # Cinza escuro, sem a animação
+        },
+    },
     "DEFAULTS": {
         "comprimento": 16,
         "incluir_maiusculas": True,
@@ -45,5 +68,23 @@ CONFIG = {
         "num_palavras": 4,
         "separador": "-",
         "lista_palavras_selecionada": "Português (Básico)",
+        "historico_capacidade": 100,
+        "registro_capacidade": 1_000_000, # Senhas emitidas (filtro de Bloom em disco)
+        "registro_taxa_erro": 1e-6,
+        "limite_travamento_ms": 500, # Tempo sem resposta do loop do Tk registrado como travamento
     }
 }
+
+
+APP_DIR_NAME = "GeradorUnimed"
+
+
+def user_config_dir() -> str:
+    """Retorna o diretório de configuração do usuário para a aplicação."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Application Support")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, APP_DIR_NAME)
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo do Daemon de Senhas
+
+Processo de fundo, opcional, que mantém tudo pronto para gerar e verificar
+senhas: o PasswordGenerator com o pool de aleatoriedade, as listas de
+palavras já lidas, o cache de prefixos da API Pwned Passwords e uma sessão
+HTTP com keep-alive. Scripts falam com ele por um socket Unix (veja
+`src.client`) e não pagam, a cada chamada, a partida do interpretador, os
+imports, a leitura das listas e o handshake TLS.
+
+O socket é criado com permissão apenas para o usuário (0600). Cada conexão
+é atendida por uma thread e pode enviar quantas requisições quiser, uma
+linha JSON por vez. Os parâmetros seguem os limites da interface
+(comprimento de 8 a 64, de 3 a 10 palavras, entropia que dê ao menos 8
+caracteres); fora deles a resposta é {"ok": false}.
+
+Com `--registro` (as mesmas opções de `src.cli`), as senhas entregues
+entram no registro de senhas emitidas e nunca repetem uma já emitida.
+
+Uso:
+    python -m src.daemon [--socket CAMINHO] [--sem-aquecimento] [--registro emitidas.bloom]
+"""
+
+import argparse
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+
+import requests
+
+from src.cli import add_registry_arguments, open_registry
+from src.client import default_socket_path
+from src.config import CONFIG
+from src.logic import PasswordGenerator, PasswordValidator, check_pwned, use_pwned_session
+from src.metrics import metrics
+from src.resources import assets
+from src.rng import random_pool
+
+PROTOCOL_VERSION = 1
+MAX_REQUEST_BYTES = 64 * 1024
+MAX_QUANTITY = 1000 # Senhas por requisição
+LENGTH_RANGE = (PasswordGenerator.MIN_LENGTH, PasswordGenerator.MAX_LENGTH) # Os mesmos limites da interface
+WORDS_RANGE = (3, 10)
+
+REQUEST_SECONDS = metrics.histogram("daemon_requisicao_segundos", "Tempo para atender uma requisição ao daemon.")
+
+
+class PasswordService:
+    """Comandos atendidos pelo daemon; cada um recebe parâmetros e devolve um dict."""
+    def __init__(self, generator=None, validator=None, bundle=assets, issued=None):
+        self.generator = generator or PasswordGenerator(random_pool, issued=issued)
+        self.validator = validator or PasswordValidator()
+        self.assets = bundle
+        self.defaults = CONFIG["DEFAULTS"]
+        self._wordlists = {} # Nome de exibição -> palavras já separadas
+        self.commands = {
+            "ping": self.ping,
+            "gerar": self.generate,
+            "frase": self.passphrase,
+            "analisar": self.analyze,
+            "verificar": self.check,
+        }
+
+    def warm_up(self):
+        """Lê e separa todas as listas de palavras antes da primeira requisição."""
+        for name in self.assets.wordlists():
+            self.wordlist(name)
+
+    def wordlist(self, name):
+        words = self._wordlists.get(name)
+        if words is None:
+            resource = self.assets.wordlists().get(name)
+            if resource is None:
+                raise ValueError(f"Lista de palavras desconhecida: {name}")
+            words = self._wordlists.setdefault(name, self.assets.read_text(resource).split())
+        return words
+
+    def handle(self, request):
+        """Executa uma requisição; erros de uso viram {"ok": False, "erro": ...}."""
+        if not isinstance(request, dict):
+            return {"ok": False, "erro": "A requisição deve ser um objeto JSON."}
+        params = dict(request)
+        handler = self.commands.get(params.pop("comando", None))
+        if handler is None:
+            return {"ok": False, "erro": f"Comando desconhecido. Use: {', '.join(self.commands)}."}
+        try:
+            with REQUEST_SECONDS.time():
+                result = handler(**params)
+        except (TypeError, ValueError) as e:
+            return {"ok": False, "erro": str(e)}
+        return {"ok": True, **result}
+
+    def _bounded(self, value, default, limits, name):
+        """`value` (ou `default`, se None) como inteiro; ValueError fora de `limits`."""
+        value = default if value is None else int(value)
+        low, high = limits
+        if not low <= value <= high:
+            raise ValueError(f"{name} deve estar entre {low} e {high}.")
+        return value
+
+    def _quantity(self, quantidade):
+        return self._bounded(quantidade, 1, (1, MAX_QUANTITY), "A quantidade")
+
+    def ping(self):
+        return {"versao": PROTOCOL_VERSION}
+
+    def generate(self, comprimento=None, entropia=None, quantidade=1, maiusculas=True, minusculas=True,
+                 numeros=True, especiais=True, excluir_ambiguos=False, caracteres_especiais=None):
+        options = (bool(maiusculas), bool(minusculas), bool(numeros), bool(especiais), bool(excluir_ambiguos),
+                   caracteres_especiais or self.defaults["caracteres_especiais"])
+        if not any(options[:4]):
+            raise ValueError("Selecione ao menos uma classe de caracteres.")
+        if comprimento is not None and entropia is not None:
+            raise ValueError("Informe o comprimento ou a entropia, não ambos.")
+        if entropia is not None:
+            target = float(entropia)
+            if not math.isfinite(target):
+                raise ValueError("A entropia deve ser um número finito de bits.")
+            # Recusa alvos que dariam senhas abaixo do comprimento mínimo
+            self.generator.target_length(target, self.generator.character_classes(*options))
+            draw = lambda: self.generator.generate_for_entropy(target, *options)
+        else:
+            length = self._bounded(comprimento, self.defaults["comprimento"], LENGTH_RANGE, "O comprimento")
+            draw = lambda: self.generator.generate(length, *options)
+        results = [draw() for _ in range(self._quantity(quantidade))]
+        return {"senhas": [password for password, _ in results], "entropia": results[-1][1]}
+
+    def passphrase(self, palavras=None, separador=None, lista=None, quantidade=1):
+        words = self.wordlist(lista or self.defaults["lista_palavras_selecionada"])
+        num_words = self._bounded(palavras, self.defaults["num_palavras"], WORDS_RANGE, "O número de palavras")
+        separator = self.defaults["separador"] if separador is None else str(separador)
+        results = [self.generator.generate_passphrase(num_words, separator, words)
+                   for _ in range(self._quantity(quantidade))]
+        return {"senhas": [phrase for phrase, _ in results], "entropia": results[-1][1]}
+
+    def analyze(self, senha, caracteres_especiais=None):
+        if not isinstance(senha, str):
+            raise ValueError("A senha deve ser um texto.")
+        specials = caracteres_especiais or self.defaults["caracteres_especiais"]
+        return {"regras": self.validator.analyze(senha), "entropia": self.generator.analyze_password(senha, specials)}
+
+    def check(self, senha):
+        if not isinstance(senha, str):
+            raise ValueError("A senha deve ser um texto.")
+        return {"vazada": check_pwned(senha)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Atende as requisições de uma conexão, uma linha JSON por vez."""
+    def handle(self):
+        service = self.server.service
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                self._send({"ok": False, "erro": f"Requisição maior que {MAX_REQUEST_BYTES} bytes."})
+                return
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"ok": False, "erro": "JSON inválido."}
+            else:
+                response = service.handle(request)
+            self._send(response)
+
+    def _send(self, response):
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+
+
+class PasswordDaemon:
+    """Servidor do socket Unix que repassa as requisições ao PasswordService."""
+    def __init__(self, path=None, service=None):
+        self.path = path or default_socket_path()
+        self.service = service or PasswordService()
+        self.server = None
+
+    def bind(self):
+        """Cria o socket (0600); falha se outro daemon já estiver atendendo no mesmo caminho."""
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise OSError("Sockets Unix não são suportados neste sistema.")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._remove_stale_socket()
+        server = socketserver.ThreadingUnixStreamServer(self.path, _RequestHandler, bind_and_activate=False)
+        server.daemon_threads = True
+        server.service = self.service
+        old_umask = os.umask(0o177) # O socket nasce sem acesso para grupo e outros
+        try:
+            server.server_bind()
+            server.server_activate()
+        except OSError:
+            server.server_close()
+            raise
+        finally:
+            os.umask(old_umask)
+        self.server = server
+        return self
+
+    def _remove_stale_socket(self):
+        """Remove o socket deixado por um daemon que não encerrou direito."""
+        try:
+            mode = os.stat(self.path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise OSError(f"{self.path} existe e não é um socket.")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.remove(self.path)
+        else:
+            raise OSError(f"Já existe um daemon atendendo em {self.path}.")
+        finally:
+            probe.close()
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def shutdown(self):
+        """Para de atender (chamado de outra thread) e remove o socket."""
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.server_close()
+            self.server = None
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daemon local que atende geração e verificação de senhas.")
+    parser.add_argument("--socket", default=None, help="Caminho do socket (padrão: $GERADOR_SOCKET ou o diretório do usuário)")
+    parser.add_argument("--sem-aquecimento", action="store_true", help="Não ler as listas de palavras na partida")
+    add_registry_arguments(parser)
+    args = parser.parse_args(argv)
+
+    issued = open_registry(args)
+    service = PasswordService(issued=issued)
+    if not args.sem_aquecimento:
+        service.warm_up()
+    use_pwned_session(requests.Session()) # Reaproveita a conexão TLS entre as verificações
+    daemon = PasswordDaemon(args.socket, service)
+    try:
+        daemon.bind()
+    except OSError as e:
+        if issued is not None:
+            issued.close()
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    # SIGTERM encerra como Ctrl+C, removendo o socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Daemon atendendo em {daemon.path}", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        if issued is not None:
+            issued.close() # Grava o contador e libera a trava do registro
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
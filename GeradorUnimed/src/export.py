@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Exportação Criptografada
+
+Grava lotes de senhas já cifrados, em blocos de tamanho fixo, enquanto a
+geração acontece: a memória usada não depende do tamanho do lote e o
+texto puro nunca chega ao disco.
+
+Formato (.enc):
+    cabeçalho  "UNIEXP", versão, parâmetros do scrypt, sal, prefixo do
+               nonce e tamanho do bloco (37 bytes)
+    blocos     [tamanho (4 bytes)][AES-256-GCM(bloco de linhas JSONL)]
+
+A chave vem da senha de exportação via scrypt. Cada bloco usa o nonce
+prefixo + contador + marca de último bloco, e o cabeçalho entra como dado
+autenticado; assim, blocos alterados, reordenados ou removidos do fim são
+detectados na leitura. Como o cabeçalho não é confiável, parâmetros do
+scrypt e tamanhos de bloco fora dos limites são recusados antes de
+derivar a chave ou alocar o bloco.
+
+Uso:
+    python -m src.export verificar lote/lote_00000.enc
+    python -m src.export ler lote/lote_00000.enc > senhas.jsonl
+"""
+
+import argparse
+import getpass
+import hashlib
+import json
+import os
+import struct
+import sys
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+MAGIC = b"UNIEXP"
+VERSION = 1
+HEADER = struct.Struct(">6sBBBB16s7sI")
+CHUNK_LENGTH = struct.Struct(">I")
+CHUNK_SIZE = 64 * 1024
+SCRYPT_LOG2_N = 15 # n = 32768, r = 8: ~32 MiB por derivação
+SCRYPT_R = 8
+SCRYPT_P = 1
+# Limites aceitos na leitura: o cabeçalho vem de um arquivo não confiável
+SCRYPT_LOG2_N_RANGE = range(10, 21)
+SCRYPT_R_RANGE = range(1, 17)
+SCRYPT_P_RANGE = range(1, 5)
+MAX_SCRYPT_MEMORY = 1 << 30
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+TAG_SIZE = 16 # Autenticação do AES-GCM, somada a cada bloco
+PASSPHRASE_ENV = "GERADOR_SENHA_EXPORTACAO"
+
+
+def derive_key(passphrase, salt, log2_n=SCRYPT_LOG2_N, r=SCRYPT_R, p=SCRYPT_P):
+    """Deriva a chave AES-256 da senha de exportação."""
+    return hashlib.scrypt(passphrase.encode('utf-8'), salt=salt, n=1 << log2_n, r=r, p=p,
+                          maxmem=256 * r * (1 << log2_n), dklen=32)
+
+
+def _nonce(prefix, counter, last):
+    return prefix + counter.to_bytes(4, "big") + (b"\x01" if last else b"\x00")
+
+
+class EncryptedShardWriter:
+    """Escritor de fragmentos cifrados, compatível com os escritores de `src.batch`."""
+    extension = "enc"
+
+    def __init__(self, path, passphrase, chunk_size=CHUNK_SIZE, scrypt_log2_n=SCRYPT_LOG2_N):
+        if not passphrase:
+            raise ValueError("A exportação criptografada exige uma senha.")
+        salt, self._prefix = os.urandom(16), os.urandom(7)
+        self.chunk_size = chunk_size
+        self._header = HEADER.pack(MAGIC, VERSION, scrypt_log2_n, SCRYPT_R, SCRYPT_P, salt, self._prefix, chunk_size)
+        self._aead = AESGCM(derive_key(passphrase, salt, scrypt_log2_n))
+        self._buffer = bytearray()
+        self._counter = 0
+        self._file = open(path, 'wb')
+        self._file.write(self._header)
+
+    def _write_chunk(self, plaintext, last):
+        ciphertext = self._aead.encrypt(_nonce(self._prefix, self._counter, last), bytes(plaintext), self._header)
+        self._file.write(CHUNK_LENGTH.pack(len(ciphertext)))
+        self._file.write(ciphertext)
+        self._counter += 1
+
+    def write(self, password, entropy):
+        self._buffer += (json.dumps({"senha": password, "entropia": round(entropy, 2)}) + "\n").encode('utf-8')
+        while len(self._buffer) >= self.chunk_size:
+            self._write_chunk(self._buffer[:self.chunk_size], last=False)
+            self._buffer[:self.chunk_size] = bytes(self.chunk_size) # Apaga o texto puro antes de descartar
+            del self._buffer[:self.chunk_size]
+
+    def close(self, complete=True):
+        """Grava o último bloco (marcado como final) e fecha o arquivo."""
+        if self._file.closed:
+            return
+        try:
+            if complete:
+                self._write_chunk(self._buffer, last=True)
+        finally:
+            self._buffer[:] = bytes(len(self._buffer))
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        # Em caso de erro o arquivo fica sem o bloco final e é recusado na leitura
+        self.close(complete=exc_type is None)
+
+    @staticmethod
+    def read(path, passphrase, **writer_options):
+        """Itera sobre (senha, entropia), decifrando um bloco por vez (opções de escrita são ignoradas)."""
+        for line in iter_lines(path, passphrase):
+            record = json.loads(line)
+            yield record["senha"], record["entropia"]
+
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Arquivo truncado.")
+    return data
+
+
+def iter_chunks(path, passphrase):
+    """Decifra e autentica os blocos de um arquivo .enc, em ordem."""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError("Arquivo truncado.")
+        magic, version, log2_n, r, p, salt, prefix, chunk_size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Não é um arquivo de exportação do Gerador Unimed.")
+        if (log2_n not in SCRYPT_LOG2_N_RANGE or r not in SCRYPT_R_RANGE or p not in SCRYPT_P_RANGE
+                or 128 * r * (1 << log2_n) * p > MAX_SCRYPT_MEMORY):
+            raise ValueError("Parâmetros do scrypt fora dos limites aceitos.")
+        if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError("Tamanho de bloco inválido no cabeçalho.")
+        max_length = chunk_size + TAG_SIZE
+        aead = AESGCM(derive_key(passphrase, salt, log2_n, r, p))
+
+        length = f.read(CHUNK_LENGTH.size)
+        counter = 0
+        while length:
+            if len(length) != CHUNK_LENGTH.size:
+                raise ValueError("Arquivo truncado.")
+            size = CHUNK_LENGTH.unpack(length)[0]
+            if size > max_length:
+                raise ValueError("Bloco maior que o tamanho declarado no cabeçalho.")
+            ciphertext = _read_exact(f, size)
+            length = f.read(CHUNK_LENGTH.size)
+            last = not length # O último bloco é o que termina o arquivo
+            try:
+                yield aead.decrypt(_nonce(prefix, counter, last), ciphertext, header)
+            except InvalidTag:
+                raise ValueError("Senha incorreta ou arquivo alterado/truncado.") from None
+            counter += 1
+        if counter == 0:
+            raise ValueError("Arquivo truncado.")
+
+
+def iter_lines(path, passphrase):
+    """Itera sobre as linhas JSONL decifradas, mesmo que cruzem blocos."""
+    carry = b""
+    for chunk in iter_chunks(path, passphrase):
+        lines = (carry + chunk).split(b"\n")
+        carry = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8')
+    if carry:
+        yield carry.decode('utf-8')
+
+
+def verify(path, passphrase):
+    """Confere a integridade do arquivo inteiro e retorna o número de senhas."""
+    return sum(1 for _ in iter_lines(path, passphrase))
+
+
+def read_passphrase(confirm=False):
+    """Lê a senha de exportação da variável de ambiente ou do terminal."""
+    passphrase = os.environ.get(PASSPHRASE_ENV)
+    if passphrase:
+        return passphrase
+    passphrase = getpass.getpass("Senha de exportação: ")
+    if confirm and getpass.getpass("Confirme a senha: ") != passphrase:
+        raise ValueError("As senhas não conferem.")
+    return passphrase
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Confere ou lê arquivos de exportação criptografados (.enc).")
+    parser.add_argument("acao", choices=["verificar", "ler"], help="verificar: confere a integridade; ler: imprime o JSONL")
+    parser.add_argument("arquivos", nargs="+", help="Arquivos .enc")
+    args = parser.parse_args(argv)
+
+    try:
+        passphrase = read_passphrase()
+        for path in args.arquivos:
+            if args.acao == "verificar":
+                print(f"{path}: {verify(path, passphrase)} senhas, íntegro.")
+            else:
+                for line in iter_lines(path, passphrase):
+                    print(line)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
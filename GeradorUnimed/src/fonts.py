@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Fontes
+
+Este arquivo contém o gerenciador de fontes usado nas anotações de texto
+do editor de capturas. As fontes são resolvidas e carregadas uma única vez
+por (família, tamanho) e as métricas de cada linha ficam em cache.
+Não há código de interface gráfica aqui.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+
+from PIL import ImageFont
+
+# Arquivos candidatos por família, em ordem de preferência (Windows/Linux/macOS)
+FONT_CANDIDATES = {
+    "sans": ["arial.ttf", "LiberationSans-Regular.ttf", "DejaVuSans.ttf", "segoeui.ttf"],
+    "mono": ["consola.ttf", "LiberationMono-Regular.ttf", "DejaVuSansMono.ttf"],
+}
+DEFAULT_FAMILY = "sans"
+DEFAULT_SIZE = 24
+
+# Diretórios varridos quando o fontconfig (fc-list) não está disponível
+FONT_DIRS = [
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+    os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"),
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+]
+
+METRICS_CACHE_SIZE = 512
+
+
+class FontManager:
+    """Resolve, carrega e mede fontes com cache, com descoberta em segundo plano."""
+    def __init__(self, candidates=None):
+        self.candidates = dict(candidates or FONT_CANDIDATES)
+        self._paths: Dict[str, Optional[str]] = {}
+        self._fonts: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+        self._metrics: Dict[Tuple[str, int, str], Tuple[int, int]] = {}
+        self._system_fonts: Optional[Dict[str, str]] = None
+        self._lock = threading.RLock()
+        self._discovery_thread = None
+
+    # --- Descoberta de Fontes do Sistema ---
+
+    def start_discovery(self, preload=((DEFAULT_FAMILY, DEFAULT_SIZE),)):
+        """
+        Indexa as fontes do sistema em uma thread de fundo e pré-carrega as
+        fontes indicadas, para que a primeira anotação não pause a UI.
+        """
+        with self._lock:
+            if self._discovery_thread is not None:
+                return self._discovery_thread
+
+            def run():
+                self._index_system_fonts()
+                for family, size in preload:
+                    self.get_font(family, size)
+
+            self._discovery_thread = threading.Thread(target=run, daemon=True)
+            self._discovery_thread.start()
+            return self._discovery_thread
+
+    def _index_system_fonts(self) -> Dict[str, str]:
+        """Mapeia o nome de arquivo (minúsculo) de cada fonte para seu caminho."""
+        with self._lock:
+            if self._system_fonts is not None:
+                return self._system_fonts
+
+        index = {}
+        for path in self._list_font_files():
+            index.setdefault(os.path.basename(path).lower(), path)
+
+        with self._lock:
+            self._system_fonts = index
+        return index
+
+    def _list_font_files(self):
+        """Lista os arquivos de fonte via fontconfig ou varrendo os diretórios conhecidos."""
+        if sys.platform != "win32" and shutil.which("fc-list"):
+            try:
+                output = subprocess.run(
+                    ["fc-list", "--format", "%{file}\n"],
+                    capture_output=True, text=True, timeout=10, check=True
+                ).stdout
+                return [line.strip() for line in output.splitlines() if line.strip()]
+            except (OSError, subprocess.SubprocessError):
+                pass
+
+        files = []
+        for font_dir in FONT_DIRS:
+            if not font_dir or not os.path.isdir(font_dir):
+                continue
+            for root, _, filenames in os.walk(font_dir):
+                files.extend(
+                    os.path.join(root, name) for name in filenames
+                    if name.lower().endswith((".ttf", ".otf", ".ttc"))
+                )
+        return files
+
+    # --- Resolução e Carregamento ---
+
+    def resolve(self, family: str = DEFAULT_FAMILY) -> Optional[str]:
+        """Retorna o arquivo de fonte da família, resolvido uma única vez."""
+        with self._lock:
+            if family in self._paths:
+                return self._paths[family]
+
+            system_fonts = self._system_fonts or {}
+            resolved = None
+            for font_name in self.candidates.get(family, [family]):
+                if font_name.lower() in system_fonts:
+                    resolved = system_fonts[font_name.lower()]
+                    break
+                if self._system_fonts is None:
+                    # Índice ainda não existe: deixa o Pillow procurar (busca no disco)
+                    try:
+                        ImageFont.truetype(font_name, DEFAULT_SIZE)
+                        resolved = font_name
+                        break
+                    except OSError:
+                        continue
+
+            self._paths[family] = resolved
+            return resolved
+
+    def get_font(self, family: str = DEFAULT_FAMILY, size: int = DEFAULT_SIZE):
+        """Retorna a fonte carregada para (família, tamanho), com fallback para a padrão."""
+        key = (family, int(size))
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                return font
+
+            path = self.resolve(family)
+            try:
+                font = ImageFont.truetype(path, key[1]) if path else ImageFont.load_default()
+            except OSError:
+                font = ImageFont.load_default()
+            self._fonts[key] = font
+            return font
+
+    # --- Métricas ---
+
+    def line_metrics(self, line: str, family: str = DEFAULT_FAMILY, size: int = DEFAULT_SIZE) -> Tuple[int, int]:
+        """Retorna (largura, altura) de uma linha de texto, com cache."""
+        key = (family, int(size), line)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            left, top, right, bottom = self.get_font(family, size).getbbox(line)
+            metrics = (right - left, bottom - top)
+            if len(self._metrics) >= METRICS_CACHE_SIZE:
+                self._metrics.clear()
+            self._metrics[key] = metrics
+        return metrics
+
+
+# Instância compartilhada por todos os editores
+font_manager = FontManager()
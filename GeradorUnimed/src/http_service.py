@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo do Serviço HTTP
+
+Serviço HTTP local, em asyncio, que expõe a mesma política de geração e
+análise da aplicação para outros sistemas internos (ex: admissão no RH,
+portal da central de serviços). Os comandos e parâmetros são os do daemon
+(veja `PasswordService` em `src.daemon`):
+
+    POST /gerar      {"comprimento": 20, "quantidade": 50}
+    POST /frase      {"palavras": 5, "lista": "Inglês (Básico)"}
+    POST /analisar   {"senha": "..."}
+    POST /verificar  {"senha": "..."}
+    GET  /saude
+
+O corpo pode ser um objeto (uma requisição) ou uma lista de objetos (lote,
+até MAX_BATCH_ITEMS; em /verificar, até MAX_CHECK_ITEMS); um lote responde
+{"resultados": [...]}, com o `ok` de cada item. Corpos maiores que
+MAX_BODY_BYTES são recusados com 413. Conexões keep-alive paradas por mais
+de IDLE_TIMEOUT segundos são encerradas.
+
+Nenhuma geração roda no loop: lotes grandes (a partir de `pool_threshold`
+sorteios, isto é, quantidade vezes comprimento) vão para um pool de
+processos e os demais para threads. As verificações de vazamento, que só
+esperam a rede, têm threads próprias, para não atrasar a geração. Quando
+já há `max_pending` requisições em andamento, as novas recebem 503 com
+Retry-After, em vez de formar uma fila sem limite.
+
+Com `--registro` (as mesmas opções de `src.cli`), as senhas entregues
+entram no registro de senhas emitidas. O registro tem um único processo
+escritor, então nesse caso os lotes grandes também são gerados em threads
+deste processo, e não no pool.
+
+Uso:
+    python -m src.http_service [--host 127.0.0.1] [--porta 8080] [--processos 4] [--registro emitidas.bloom]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+import requests
+
+from src.cli import add_registry_arguments, open_registry
+from src.daemon import PasswordService
+from src.logic import PasswordGenerator, use_pwned_session
+from src.metrics import metrics
+from src.rng import BufferedRandomSource
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_ITEMS = 1000
+MAX_CHECK_ITEMS = 20 # Cada verificação pode esperar a API por até 5 s
+MAX_PENDING = 64 # Requisições em andamento antes de responder 503
+POOL_THRESHOLD = 200 * 16 # Sorteios por requisição a partir dos quais o lote vai para o pool
+CHECK_THREADS = 8
+IDLE_TIMEOUT = 15 # Segundos de espera pela próxima requisição (ou pelo resto dela)
+DEFAULT_ITEM_SIZE = 16
+
+ROUTES = {
+    "/gerar": "gerar",
+    "/frase": "frase",
+    "/analisar": "analisar",
+    "/verificar": "verificar",
+}
+
+HTTP_REQUEST_SECONDS = metrics.histogram("http_requisicao_segundos", "Tempo para atender uma requisição HTTP.")
+HTTP_REJECTED = metrics.counter("http_recusadas_total", "Requisições HTTP recusadas com 503 por excesso de carga.")
+
+
+class HttpError(Exception):
+    """Erro que vira uma resposta HTTP com `status`."""
+    def __init__(self, status, message, close=False):
+        super().__init__(message)
+        self.status = status
+        self.close = close # Encerra a conexão (ex: corpo não lido)
+
+
+def run_items(service, command, items):
+    """Executa cada item do lote com `service` e devolve as respostas, na ordem."""
+    return [service.handle({**item, "comando": command}) if isinstance(item, dict)
+            else {"ok": False, "erro": "Cada item do lote deve ser um objeto JSON."}
+            for item in items]
+
+
+_worker_service = None
+
+
+def _run_in_worker(command, items):
+    """Executa o lote em um processo do pool, com um CSPRNG próprio."""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = PasswordService(PasswordGenerator(BufferedRandomSource()))
+    return run_items(_worker_service, command, items)
+
+
+def _item_size(item):
+    """Sorteios por senha do item: caracteres, palavras ou, pela entropia, ~6 bits por caractere."""
+    if item.get("entropia") is not None:
+        return math.ceil(float(item["entropia"]) / 6)
+    return int(item.get("comprimento") or item.get("palavras") or DEFAULT_ITEM_SIZE)
+
+
+def _batch_cost(items):
+    """Sorteios que o lote vai fazer: `quantidade` senhas do tamanho de cada item."""
+    cost = 0
+    for item in items:
+        try:
+            cost += max(1, int(item.get("quantidade", 1))) * max(1, _item_size(item)) if isinstance(item, dict) else 1
+        except (TypeError, ValueError, OverflowError):
+            cost += 1 # O item será recusado pelo serviço
+    return cost
+
+
+class PasswordHttpService:
+    """Servidor HTTP/1.1 (com keep-alive) sobre `PasswordService`."""
+    def __init__(self, service=None, workers=None, max_pending=MAX_PENDING, pool_threshold=POOL_THRESHOLD):
+        self.service = service or PasswordService()
+        self.workers = (os.cpu_count() or 1) if workers is None else workers # 0: sem pool de processos
+        self.max_pending = max_pending
+        self.pool_threshold = pool_threshold
+        self.pending = 0
+        self.executor = None
+        self.checks = None
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        if self.workers:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.checks = ThreadPoolExecutor(max_workers=CHECK_THREADS, thread_name_prefix="http-verificacao")
+        self.server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        return self
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        if self.checks is not None:
+            self.checks.shutdown(wait=False, cancel_futures=True)
+            self.checks = None
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    with HTTP_REQUEST_SECONDS.time():
+                        status, payload, extra = await self.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload, extra = e.status, {"ok": False, "erro": str(e)}, {}
+                    keep_alive = not e.close
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e: # Ex: pool de processos quebrado; a conexão não fica sem resposta
+                    status, payload, extra = 500, {"ok": False, "erro": f"Erro interno: {e}"}, {}
+                    keep_alive = False
+                await self._send(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass # Cliente desconectou no meio da requisição
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Lê (método, caminho, cabeçalhos, corpo); None se a conexão terminou entre requisições."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None # Conexão parada: libera o socket
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise HttpError(400, "Requisição incompleta.", close=True)
+        except asyncio.LimitOverrunError:
+            raise HttpError(431, f"Cabeçalhos maiores que {MAX_HEADER_BYTES} bytes.", close=True)
+
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(400, "Linha de requisição inválida.", close=True)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        if version == "HTTP/1.0":
+            headers.setdefault("connection", "close")
+
+        if "transfer-encoding" in headers:
+            raise HttpError(411, "Envie o corpo com Content-Length.", close=True)
+        try:
+            length = int(headers.get("content-length", 0))
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            raise HttpError(400, "Content-Length inválido.", close=True)
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f"Corpo maior que {MAX_BODY_BYTES} bytes.", close=True)
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), IDLE_TIMEOUT) if length > 0 else b""
+        except asyncio.TimeoutError:
+            raise HttpError(408, "Tempo esgotado esperando o corpo.", close=True)
+        return method, target.split("?", 1)[0], headers, body
+
+    async def dispatch(self, method, path, body):
+        """Atende uma requisição já lida; retorna (status, payload, cabeçalhos extras)."""
+        if path == "/saude":
+            return 200, {"ok": True, "pendentes": self.pending, "processos": self.workers}, {}
+        command = ROUTES.get(path)
+        if command is None:
+            raise HttpError(404, f"Caminho desconhecido. Use: {', '.join(ROUTES)}.")
+        if method != "POST":
+            raise HttpError(405, "Use POST.")
+        try:
+            document = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "JSON inválido.")
+        batch = isinstance(document, list)
+        items = document if batch else [document]
+        limit = MAX_CHECK_ITEMS if command == "verificar" else MAX_BATCH_ITEMS
+        if len(items) > limit:
+            raise HttpError(413, f"O lote aceita até {limit} itens.")
+
+        if self.pending >= self.max_pending:
+            HTTP_REJECTED.inc()
+            return 503, {"ok": False, "erro": "Serviço sobrecarregado, tente novamente."}, {"Retry-After": "1"}
+        self.pending += 1
+        try:
+            results = await self._execute(command, items)
+        finally:
+            self.pending -= 1
+
+        if batch:
+            return 200, {"ok": True, "resultados": results}, {}
+        return (200 if results[0]["ok"] else 400), results[0], {}
+
+    async def _execute(self, command, items):
+        loop = asyncio.get_running_loop()
+        if command == "verificar":
+            # Só espera a rede: threads bastam, e o cache de prefixos fica neste processo
+            return await loop.run_in_executor(self.checks, run_items, self.service, command, items)
+        pool = self.executor is not None and self.service.generator.issued is None # Registro: só este processo escreve
+        if pool and _batch_cost(items) >= self.pool_threshold:
+            return await loop.run_in_executor(self.executor, _run_in_worker, command, items)
+        # Mesmo lotes pequenos saem do loop: /saude e as demais conexões continuam respondendo
+        return await loop.run_in_executor(None, run_items, self.service, command, items)
+
+    async def _send(self, writer, status, payload, extra, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": str(len(body)),
+            **extra,
+        }
+        if not keep_alive:
+            headers["Connection"] = "close"
+        head = f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b"\r\n" + body)
+        await writer.drain()
+
+
+async def serve(host, port, workers=None, max_pending=MAX_PENDING, issued=None):
+    service = PasswordService(issued=issued)
+    service.warm_up()
+    use_pwned_session(requests.Session()) # Reaproveita a conexão TLS entre as verificações
+    http_service = await PasswordHttpService(service, workers, max_pending).start(host, port)
+    print(f"Serviço HTTP atendendo em http://{host}:{http_service.port}", file=sys.stderr)
+    try:
+        await http_service.server.serve_forever()
+    finally:
+        await http_service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de geração e análise de senhas.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: só a máquina local)")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--processos", type=int, default=None,
+                        help="Processos para lotes grandes (padrão: nº de CPUs; 0 desliga o pool)")
+    parser.add_argument("--max-pendentes", type=int, default=MAX_PENDING,
+                        help="Requisições em andamento antes de responder 503")
+    add_registry_arguments(parser)
+    args = parser.parse_args(argv)
+    issued = open_registry(args)
+    try:
+        asyncio.run(serve(args.host, args.porta, args.processos, args.max_pendentes, issued))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if issued is not None:
+            issued.close() # Grava o contador e libera a trava do registro
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Processamento de Imagem
+
+Este arquivo contém as operações de edição de imagem usadas pelo
+editor de capturas de tela. Não há código de interface gráfica aqui,
+para que as mesmas operações possam ser reutilizadas fora do Tk.
+
+As edições são descritas como operações (dicionários) em coordenadas da
+imagem original, por exemplo `{"op": "rectangle", "coords": [x1, y1, x2, y2]}`.
+Elas são reaplicadas sobre uma prévia reduzida para exibição e sobre a
+imagem em resolução total apenas na exportação.
+"""
+
+import math
+
+from PIL import Image, ImageColor, ImageDraw
+
+from src.fonts import DEFAULT_FAMILY, DEFAULT_SIZE, font_manager
+
+# Opacidade padrão do escurecimento do Holofote (0-255)
+SPOTLIGHT_OPACITY = 150
+
+# Estilo das anotações (em pixels da imagem original)
+ANNOTATION_COLOR = "red"
+RECTANGLE_WIDTH = 4
+ARROW_WIDTH = 4
+ARROW_HEAD_LENGTH = 20
+ARROW_HEAD_ANGLE = math.pi / 6  # 30 graus
+TEXT_PADDING = 10
+TEXT_LINE_SPACING = 5
+MIN_CROP_SIZE = 5
+
+# Operações suportadas e o número de coordenadas de cada uma
+OPERATIONS = {"spotlight": 4, "rectangle": 4, "arrow": 4, "crop": 4, "text": 2}
+
+
+def _clamp_box(image: Image.Image, x1, y1, x2, y2):
+    """Normaliza e limita as coordenadas de um retângulo ao tamanho da imagem."""
+    x1, x2 = sorted((int(round(x1)), int(round(x2))))
+    y1, y2 = sorted((int(round(y1)), int(round(y2))))
+    width, height = image.size
+    return (
+        max(0, min(x1, width)), max(0, min(y1, height)),
+        max(0, min(x2, width)), max(0, min(y2, height)),
+    )
+
+
+# --- Operações de Desenho ---
+
+def apply_spotlight(image: Image.Image, x1, y1, x2, y2, opacity=SPOTLIGHT_OPACITY):
+    """
+    Aplica o efeito de Holofote (escurece tudo menos a seleção) no próprio objeto.
+
+    Em vez de compor uma camada preta do tamanho da imagem, escurece apenas
+    as quatro faixas ao redor da seleção com `Image.paste` e uma máscara
+    constante. A imagem mantém o modo original e nenhuma cópia completa é feita.
+
+    Returns:
+        A própria imagem recebida, modificada.
+    """
+    left, top, right, bottom = _clamp_box(image, x1, y1, x2, y2)
+    width, height = image.size
+    # Como no ImageDraw.rectangle, a borda direita/inferior pertence à seleção
+    right, bottom = min(right + 1, width), min(bottom + 1, height)
+
+    # Em modo paleta ("P") o preto é pintado pelo índice 0.
+    black = ImageColor.getcolor("black", image.mode) if image.mode != "P" else 0
+
+    bands = (
+        (0, 0, width, top),              # Faixa superior
+        (0, bottom, width, height),      # Faixa inferior
+        (0, top, left, bottom),          # Faixa esquerda
+        (right, top, width, bottom),     # Faixa direita
+    )
+    for box in bands:
+        band_width, band_height = box[2] - box[0], box[3] - box[1]
+        if band_width <= 0 or band_height <= 0:
+            continue
+        mask = Image.new("L", (band_width, band_height), opacity)
+        image.paste(black, box, mask)
+    return image
+
+
+def draw_rectangle(image: Image.Image, x1, y1, x2, y2, width=RECTANGLE_WIDTH):
+    """Desenha a moldura de destaque."""
+    x1, x2 = sorted((x1, x2))
+    y1, y2 = sorted((y1, y2))
+    ImageDraw.Draw(image).rectangle([x1, y1, x2, y2], outline=ANNOTATION_COLOR, width=max(1, round(width)))
+    return image
+
+
+def draw_arrow(image: Image.Image, x1, y1, x2, y2, width=ARROW_WIDTH, head_length=ARROW_HEAD_LENGTH):
+    """Desenha uma seta com cabeça calculada geometricamente."""
+    draw = ImageDraw.Draw(image)
+
+    # Linha principal
+    draw.line([x1, y1, x2, y2], fill=ANNOTATION_COLOR, width=max(1, round(width)))
+
+    # Pontos da cabeça: a ponta (x2, y2) e dois pontos a +-30 graus da linha
+    angle = math.atan2(y2 - y1, x2 - x1)
+    p1 = (x2, y2)
+    p2 = (
+        x2 - head_length * math.cos(angle - ARROW_HEAD_ANGLE),
+        y2 - head_length * math.sin(angle - ARROW_HEAD_ANGLE)
+    )
+    p3 = (
+        x2 - head_length * math.cos(angle + ARROW_HEAD_ANGLE),
+        y2 - head_length * math.sin(angle + ARROW_HEAD_ANGLE)
+    )
+
+    # Desenha triângulo preenchido para a cabeça
+    draw.polygon([p1, p2, p3], fill=ANNOTATION_COLOR)
+    return image
+
+
+def draw_text(image: Image.Image, x, y, text, contrast_bg=True, font_size=DEFAULT_SIZE, scale=1.0):
+    """Desenha texto multilinha, opcionalmente sobre um fundo de contraste."""
+    draw = ImageDraw.Draw(image)
+    font_size = max(1, round(font_size * scale))
+    font = font_manager.get_font(DEFAULT_FAMILY, font_size)
+
+    # Calcula o tamanho do texto (multiline) com as métricas em cache
+    lines = text.splitlines()
+    max_width = 0
+    line_heights = []
+    for line in lines:
+        w, h = font_manager.line_metrics(line, DEFAULT_FAMILY, font_size)
+        max_width = max(max_width, w)
+        line_heights.append(h + TEXT_LINE_SPACING * scale)
+    total_height = sum(line_heights)
+
+    if contrast_bg:
+        # Retângulo de fundo branco com texto preto
+        pad = TEXT_PADDING * scale
+        draw.rectangle([x, y, x + max_width + (pad * 2), y + total_height + (pad * 2)], fill="white", outline="black")
+        text_color = "black"
+    else:
+        # Sem fundo, usa cor de destaque
+        pad = 0
+        text_color = ANNOTATION_COLOR
+
+    current_y = y + pad
+    for line, line_height in zip(lines, line_heights):
+        draw.text((x + pad, current_y), line, fill=text_color, font=font)
+        current_y += line_height
+    return image
+
+
+def crop_box(x1, y1, x2, y2, bounds):
+    """
+    Normaliza uma seleção de corte e a limita a `bounds` (left, top, right, bottom).
+
+    Returns:
+        A caixa de corte ou None se a seleção for pequena demais.
+    """
+    left, right = sorted((x1, x2))
+    top, bottom = sorted((y1, y2))
+    left, top = max(left, bounds[0]), max(top, bounds[1])
+    right, bottom = min(right, bounds[2]), min(bottom, bounds[3])
+
+    # Evita cortes de tamanho 0
+    if right - left < MIN_CROP_SIZE or bottom - top < MIN_CROP_SIZE:
+        return None
+    return (int(round(left)), int(round(top)), int(round(right)), int(round(bottom)))
+
+
+# --- Aplicação de Operações ---
+
+def validate_operation(operation):
+    """
+    Verifica se uma operação está bem formada.
+
+    Raises:
+        ValueError: se a operação for desconhecida ou tiver campos inválidos.
+    """
+    if not isinstance(operation, dict):
+        raise ValueError(f"Operação inválida: {operation!r}")
+    kind = operation.get("op")
+    if kind not in OPERATIONS:
+        raise ValueError(f"Operação desconhecida: {kind}")
+    coords = operation.get("coords")
+    if (not isinstance(coords, (list, tuple)) or len(coords) != OPERATIONS[kind]
+            or not all(isinstance(value, (int, float)) for value in coords)):
+        raise ValueError(f"'{kind}' exige {OPERATIONS[kind]} coordenadas numéricas")
+    if kind == "text" and not isinstance(operation.get("text"), str):
+        raise ValueError("'text' exige o campo 'text'")
+    return operation
+
+
+def content_box(operations, size):
+    """Retorna a área visível (após os cortes) em coordenadas da imagem original."""
+    box = (0, 0, size[0], size[1])
+    for operation in operations:
+        if operation["op"] == "crop":
+            box = crop_box(*operation["coords"], bounds=box) or box
+    return box
+
+
+def apply_operation(image: Image.Image, operation, origin=(0, 0), scale=1.0):
+    """
+    Desenha uma operação em `image`.
+
+    As coordenadas da operação estão no espaço da imagem original; `origin`
+    é o ponto da original que corresponde ao canto (0, 0) de `image` e
+    `scale` a escala entre as duas. Cortes são tratados por `content_box`.
+    """
+    kind = validate_operation(operation)["op"]
+    coords = operation["coords"]
+    points = [(value - origin[i % 2]) * scale for i, value in enumerate(coords)]
+
+    if kind == "spotlight":
+        apply_spotlight(image, *points, opacity=operation.get("opacity", SPOTLIGHT_OPACITY))
+    elif kind == "rectangle":
+        draw_rectangle(image, *points, width=RECTANGLE_WIDTH * scale)
+    elif kind == "arrow":
+        draw_arrow(image, *points, width=ARROW_WIDTH * scale, head_length=ARROW_HEAD_LENGTH * scale)
+    elif kind == "text":
+        draw_text(image, points[0], points[1], operation["text"],
+                  contrast_bg=operation.get("contrast_bg", True), scale=scale)
+    return image
+
+
+def render(source: Image.Image, operations):
+    """
+    Aplica as operações em resolução total e retorna uma nova imagem.
+
+    O corte final é feito antes do desenho, então só a área exportada
+    é copiada e processada. `source` não é modificada.
+    """
+    box = content_box(operations, source.size)
+    image = source.crop(box)
+    if image.mode not in ("RGB", "RGBA", "L"):
+        image = image.convert("RGBA")
+    for operation in operations:
+        if operation["op"] != "crop":
+            apply_operation(image, operation, origin=box[:2])
+    return image
+
+
+class Viewport:
+    """
+    Janela de visualização (zoom/pan) sobre uma imagem possivelmente enorme.
+
+    Mantém apenas a imagem original e uma pirâmide de reduções criada sob
+    demanda. Cada redesenho gera uma prévia do tamanho da janela, então o
+    custo acompanha a janela e não a imagem.
+    """
+    MAX_SCALE = 8.0
+    MIN_ZOOM = 1.0  # Relativo ao encaixe na janela
+    REDUCIBLE_MODES = ("RGB", "RGBA", "L", "LA")
+
+    def __init__(self, source: Image.Image, width=1, height=1):
+        self.source = source
+        self.operations = []
+        self._levels = {1: source}
+        self.window = (max(1, int(width)), max(1, int(height)))
+        self.box = (0, 0, source.width, source.height)
+        self.zoom = 1.0
+        self.center = None
+        self.origin = (0, 0) # Posição da prévia no canvas (após o último render)
+        self.region = self.box # Área da original exibida (após o último render)
+        self.reset_view()
+
+    # --- Geometria ---
+
+    @property
+    def fit_scale(self):
+        """Escala que encaixa a área visível na janela (nunca amplia)."""
+        box_width, box_height = self.box[2] - self.box[0], self.box[3] - self.box[1]
+        return min(self.window[0] / box_width, self.window[1] / box_height, 1.0)
+
+    @property
+    def scale(self):
+        return min(self.fit_scale * self.zoom, self.MAX_SCALE)
+
+    def reset_view(self):
+        """Volta ao encaixe na janela, centralizado."""
+        self.zoom = 1.0
+        self.center = ((self.box[0] + self.box[2]) / 2, (self.box[1] + self.box[3]) / 2)
+
+    def resize(self, width, height):
+        self.window = (max(1, int(width)), max(1, int(height)))
+
+    def visible_region(self):
+        """Área da imagem original exibida na janela, limitada à área de conteúdo."""
+        scale = self.scale
+        region = []
+        for axis in (0, 1):
+            low, high = self.box[axis], self.box[axis + 2]
+            half = self.window[axis] / scale / 2
+            if half * 2 >= high - low:
+                start, end = low, high
+            else:
+                start = min(max(self.center[axis] - half, low), high - half * 2)
+                end = start + half * 2
+            region.append((start, end))
+        return (region[0][0], region[1][0], region[0][1], region[1][1])
+
+    def to_image(self, x, y):
+        """Converte coordenadas do canvas para a imagem original."""
+        scale = self.scale
+        return (self.region[0] + (x - self.origin[0]) / scale,
+                self.region[1] + (y - self.origin[1]) / scale)
+
+    def to_canvas(self, x, y):
+        """Converte coordenadas da imagem original para o canvas."""
+        scale = self.scale
+        return ((x - self.region[0]) * scale + self.origin[0],
+                (y - self.region[1]) * scale + self.origin[1])
+
+    def zoom_at(self, factor, x, y):
+        """Aplica zoom mantendo fixo o ponto sob o cursor (coordenadas do canvas)."""
+        anchor = self.to_image(x, y)
+        old_scale = self.scale
+        self.zoom = max(self.MIN_ZOOM, min(self.zoom * factor, self.MAX_SCALE / self.fit_scale))
+        new_scale = self.scale
+        self.center = (
+            anchor[0] + (self.center[0] - anchor[0]) * old_scale / new_scale,
+            anchor[1] + (self.center[1] - anchor[1]) * old_scale / new_scale,
+        )
+
+    def pan(self, dx, dy):
+        """Desloca a visualização em pixels do canvas."""
+        scale = self.scale
+        self.center = (self.center[0] - dx / scale, self.center[1] - dy / scale)
+        # Mantém o centro dentro da área exibível
+        region = self.visible_region()
+        self.center = ((region[0] + region[2]) / 2, (region[1] + region[3]) / 2)
+
+    # --- Operações ---
+
+    def add_operation(self, operation):
+        """Registra uma operação (em coordenadas da original). Cortes redefinem a área visível."""
+        if operation["op"] == "crop":
+            box = crop_box(*operation["coords"], bounds=self.box)
+            if box is None:
+                return False
+            operation = dict(operation, coords=list(box))
+            self.box = box
+            self.reset_view()
+        self.operations.append(operation)
+        return True
+
+    # --- Renderização ---
+
+    def _level(self, scale):
+        """Retorna (imagem, fator) da pirâmide mais leve com resolução suficiente."""
+        factor = 1
+        while factor * 2 <= 1 / scale and self.source.width // (factor * 2) > 0 and self.source.height // (factor * 2) > 0:
+            factor *= 2
+        if factor not in self._levels:
+            previous = max(f for f in self._levels if f < factor)
+            image = self._levels[previous]
+            if image.mode not in self.REDUCIBLE_MODES:
+                image = image.convert("RGBA") # reduce() não aceita P, 1, I;16...
+            while previous < factor:
+                image = image.reduce(2)
+                previous *= 2
+                self._levels[previous] = image
+        return self._levels[factor], factor
+
+    def render(self):
+        """Gera a prévia do tamanho da janela com as operações aplicadas."""
+        scale = self.scale
+        self.region = self.visible_region()
+        size = (max(1, round((self.region[2] - self.region[0]) * scale)),
+                max(1, round((self.region[3] - self.region[1]) * scale)))
+        self.origin = ((self.window[0] - size[0]) // 2, (self.window[1] - size[1]) // 2)
+
+        level, factor = self._level(scale)
+        level_box = tuple(value / factor for value in self.region)
+        resample = Image.NEAREST if scale >= 2 else Image.BILINEAR
+        proxy = level.resize(size, resample, box=level_box)
+        if proxy.mode not in ("RGB", "RGBA"):
+            proxy = proxy.convert("RGBA")
+
+        for operation in self.operations:
+            if operation["op"] != "crop":
+                apply_operation(proxy, operation, origin=self.region[:2], scale=scale)
+        return proxy
+
+    def render_full(self):
+        """Aplica todas as operações em resolução total (exportação)."""
+        return render(self.source, self.operations)
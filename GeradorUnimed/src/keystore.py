@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo do Cofre de Chaves
+
+Guarda as chaves locais (ex: a do histórico cifrado) fora dos arquivos
+que elas protegem:
+
+- KeyringBackend: cofre do sistema pelo pacote `keyring` (Chaves do
+  macOS, Gerenciador de Credenciais do Windows, Secret Service no Linux),
+  quando instalado e com um cofre disponível.
+- FileBackend: arquivo `<nome>.key` no diretório da aplicação, com
+  permissão apenas para o usuário; no Windows, onde essa permissão não vale,
+  o conteúdo é protegido pela DPAPI (só o mesmo usuário consegue abri-lo).
+
+Chaves já gravadas em arquivo por versões anteriores são levadas para o
+cofre do sistema no primeiro uso. As chaves são bytes ASCII (ex: chaves
+Fernet em base64).
+"""
+
+import base64
+import os
+import sys
+import threading
+
+SERVICE = "GeradorUnimed"
+DPAPI_HEADER = b"DPAPI1:"
+
+_lock = threading.Lock() # A criação de uma chave nunca corre em paralelo (nem entre instâncias)
+
+
+def _dpapi(data, protect):
+    """Cifra (`protect`) ou decifra `data` com a DPAPI do Windows, presa ao usuário atual."""
+    import ctypes
+    from ctypes import wintypes
+
+    class DataBlob(ctypes.Structure):
+        _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+    buffer = ctypes.create_string_buffer(data, len(data))
+    blob_in = DataBlob(len(data), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
+    blob_out = DataBlob()
+    crypt32 = ctypes.windll.crypt32
+    function = crypt32.CryptProtectData if protect else crypt32.CryptUnprotectData
+    CRYPTPROTECT_UI_FORBIDDEN = 0x1
+    if not function(ctypes.byref(blob_in), None, None, None, None, CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)):
+        raise ctypes.WinError()
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+class FileBackend:
+    """Chaves em arquivos `<nome>.key` (0600; DPAPI no Windows)."""
+    def __init__(self, directory, protect=sys.platform == "win32"):
+        self.directory = directory
+        self.protect = protect
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.key")
+
+    def get(self, name):
+        try:
+            with open(self.path(name), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if data.startswith(DPAPI_HEADER):
+            return _dpapi(base64.b64decode(data[len(DPAPI_HEADER):]), protect=False)
+        return data.strip() # Formato antigo: a chave em texto
+
+    def put(self, name, key):
+        """Grava uma chave nova. Retorna a que ficou valendo (a de outro processo, se ele criou antes)."""
+        data = DPAPI_HEADER + base64.b64encode(_dpapi(key, protect=True)) if self.protect else key
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            fd = os.open(self.path(name), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return self.get(name)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return key
+
+    def delete(self, name):
+        try:
+            os.remove(self.path(name))
+        except FileNotFoundError:
+            pass
+
+
+class KeyringBackend:
+    """Chaves no cofre do sistema, pelo pacote `keyring`."""
+    def __init__(self, keyring_module, scope):
+        self.keyring = keyring_module
+        self.scope = scope # Separa as chaves de diretórios de configuração diferentes
+
+    def _user(self, name):
+        return f"{name}:{self.scope}"
+
+    def get(self, name):
+        value = self.keyring.get_password(SERVICE, self._user(name))
+        return value.encode('ascii') if value else None
+
+    def put(self, name, key):
+        self.keyring.set_password(SERVICE, self._user(name), key.decode('ascii'))
+        return key
+
+
+def system_keyring(scope):
+    """KeyringBackend se o pacote `keyring` estiver instalado e houver um cofre utilizável; senão None."""
+    try:
+        import keyring
+        from keyring.errors import KeyringError
+    except ImportError:
+        return None
+    try:
+        if getattr(keyring.get_keyring(), "priority", 0) <= 0: # Só o cofre "fail"/nulo disponível
+            return None
+        return KeyringBackend(keyring, scope)
+    except (KeyringError, RuntimeError):
+        return None
+
+
+class KeyStore:
+    """Obtém ou cria chaves pelo nome, no cofre do sistema ou, sem ele, em arquivo."""
+    def __init__(self, directory, backend=None):
+        self.files = FileBackend(directory)
+        self.backend = backend if backend is not None else (system_keyring(os.path.abspath(directory)) or self.files)
+
+    def get(self, name):
+        """Retorna a chave `name`, ou None se ela não existir."""
+        with _lock:
+            return self._get(name)
+
+    def get_or_create(self, name, generate):
+        """Retorna a chave `name`, criando-a com `generate()` (bytes ASCII) se ainda não existir."""
+        with _lock:
+            return self._get(name) or self.backend.put(name, generate())
+
+    def _get(self, name):
+        key = self.backend.get(name)
+        if key or self.backend is self.files:
+            return key
+        legacy = self.files.get(name)
+        if legacy:
+            # Chave de uma versão anterior: vai para o cofre e sai do disco
+            self.backend.put(name, legacy)
+            self.files.delete(name)
+        return legacy
@@ -3,49 +3,262 @@
 Módulo de Lógica (Backend)
 
 Este arquivo contém as classes responsáveis pela lógica de negócio
-da aplicação, como a geração de senhas e o gerenciamento de configurações.
+da aplicação, como a geração de senhas, o histórico e o gerenciamento de
+configurações.
 Não há código de interface gráfica aqui.
 """
 
+import bisect
 import functools
 import hashlib
 import json
 import math
 import os
-import secrets
 import string
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
 import requests
+from cryptography.fernet import Fernet, InvalidToken
 
-from src.config import CONFIG
+from src.config import CONFIG, user_config_dir
+from src.keystore import KeyStore
+from src.metrics import metrics
+from src.rng import SystemRandomSource
 
 # 3. CLASSES DE LÓGICA (BACKEND)
 # Responsáveis pela lógica de negócio, sem interação com a UI.
 
+GENERATION_SECONDS = metrics.histogram("geracao_segundos", "Tempo para gerar uma senha ou frase-senha (inclui novos sorteios).")
+PWNED_CHECK_SECONDS = metrics.histogram("verificacao_vazamento_segundos", "Tempo da verificação de vazamento (Pwned Passwords).")
+PWNED_LOOKUPS = metrics.counter("pwned_cache_consultas_total", "Consultas de prefixo ao cache da API Pwned Passwords.")
+PWNED_MISSES = metrics.counter("pwned_cache_falhas_total", "Consultas de prefixo que exigiram uma requisição à API.")
+
+
+def write_atomic(path, data: bytes, prefix=".tmp-"):
+    """Grava em um arquivo temporário no mesmo diretório e o renomeia por cima do atual."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 class SettingsManager:
-    """Gerencia o carregamento e salvamento das configurações em um arquivo JSON."""
-    def __init__(self, filename="config.json"):
-        self.filename = filename
+    """
+    Gerencia as configurações em um arquivo JSON no diretório do usuário.
+
+    As alterações são registradas com `set` assim que acontecem e gravadas
+    por uma única thread de fundo após um pequeno atraso (agrupando rajadas
+    de mudanças). A gravação é atômica (arquivo temporário + rename), então
+    uma queda nunca deixa o arquivo pela metade. As configurações lidas
+    ficam em cache e só as chaves alteradas são serializadas novamente.
+
+    O lock das configurações só protege a memória: o documento é montado
+    sob ele e gravado fora, para que um disco lento nunca bloqueie `set`
+    (chamado na thread do Tk).
+    """
+    FLUSH_DELAY = 1.0 # segundos
+    LEGACY_FILENAME = "config.json" # Versões antigas gravavam no diretório atual
+
+    def __init__(self, filename=None, flush_delay=FLUSH_DELAY):
+        self.filename = filename or os.path.join(user_config_dir(), "config.json")
         self.defaults = CONFIG["DEFAULTS"]
+        self.flush_delay = flush_delay
+        self._settings = None # Cache das configurações atuais
+        self._encoded = {}    # Chave -> valor já serializado em JSON
+        self._dirty = set()
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock() # Serializa as gravações em disco
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_at = None # Horário (monotônico) da próxima gravação agendada
+        self._worker = None
 
     def load_settings(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    settings = self.defaults.copy()
-                    settings.update(json.load(f))
-                    return settings
-            except (json.JSONDecodeError, IOError):
-                return self.defaults
-        return self.defaults
+        """Retorna uma cópia das configurações (padrões + arquivo), lendo o disco uma única vez."""
+        with self._lock:
+            if self._settings is None:
+                settings = dict(self.defaults)
+                for path in (self.filename, self.LEGACY_FILENAME):
+                    if os.path.exists(path):
+                        try:
+                            with open(path, 'r', encoding='utf-8') as f:
+                                settings.update(json.load(f))
+                            break
+                        except (json.JSONDecodeError, IOError):
+                            continue
+                self._settings = settings
+                self._encoded = {key: json.dumps(value) for key, value in settings.items()}
+            return dict(self._settings)
+
+    def set(self, key, value):
+        """Registra uma alteração e agenda a gravação em segundo plano."""
+        with self._lock:
+            if self._settings is None:
+                self.load_settings()
+            if key in self._settings and self._settings[key] == value:
+                return
+            self._settings[key] = value
+            self._dirty.add(key)
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Adia a gravação (debounce); a thread de gravação é criada uma única vez."""
+        self._flush_at = time.monotonic() + self.flush_delay
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._flush_loop, name="unimed-configuracoes", daemon=True)
+            self._worker.start()
+        self._wakeup.notify()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while self._flush_at is None or time.monotonic() < self._flush_at:
+                    self._wakeup.wait(None if self._flush_at is None else self._flush_at - time.monotonic())
+            self.flush()
 
     def save_settings(self, settings):
+        """Registra todas as configurações recebidas e grava imediatamente."""
+        for key, value in settings.items():
+            self.set(key, value)
+        self.flush()
+
+    def flush(self):
+        """Grava as alterações pendentes no disco. Retorna True se algo foi gravado."""
+        with self._write_lock:
+            with self._lock:
+                self._flush_at = None
+                if not self._dirty:
+                    return False
+                # Serializa apenas as chaves alteradas; as demais reaproveitam o cache
+                for key in self._dirty:
+                    self._encoded[key] = json.dumps(self._settings[key])
+                document = "{" + ",".join(f"{json.dumps(key)}:{encoded}" for key, encoded in self._encoded.items()) + "}"
+                written = set(self._dirty)
+                self._dirty.clear()
+            try:
+                self._write_atomic(document) # Fora do lock: `set` continua livre durante o fsync
+            except IOError as e:
+                print(f"Erro ao salvar configurações: {e}")
+                with self._lock:
+                    self._dirty |= written # Tenta de novo na próxima gravação
+                return False
+            return True
+
+    def _write_atomic(self, document):
+        """Grava o documento JSON de forma atômica."""
+        write_atomic(self.filename, document.encode('utf-8'), prefix=".config-")
+
+
+class PasswordHistory:
+    """
+    Histórico das senhas geradas, com capacidade limitada e persistência criptografada.
+
+    As senhas ficam em um OrderedDict (da mais antiga para a mais recente),
+    o que torna a deduplicação e a reordenação O(1). Ao passar da
+    capacidade, as mais antigas são descartadas. O arquivo é cifrado com
+    Fernet (AES-128-CBC + HMAC) com uma chave guardada fora dele, no cofre
+    do sistema ou, sem cofre, protegida pela DPAPI/permissão do usuário
+    (veja `src.keystore`).
+    """
+    DEFAULT_CAPACITY = 100
+    VISIBLE_ITEMS = 10 # Quantas senhas aparecem no menu de histórico
+
+    KEY_NAME = "historico"
+
+    def __init__(self, filename=None, key_store=None, capacity=DEFAULT_CAPACITY):
+        self.filename = filename
+        if filename and key_store is None:
+            key_store = KeyStore(os.path.dirname(os.path.abspath(filename)))
+        self.key_store = key_store
+        self.capacity = max(1, int(capacity))
+        self._items = OrderedDict() # Senha -> None; a mais recente fica no fim
+        self._lock = threading.Lock()
+        self._fernet = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, password):
+        return password in self._items
+
+    def __iter__(self):
+        """Itera da senha mais recente para a mais antiga."""
+        with self._lock:
+            items = list(reversed(self._items))
+        return iter(items)
+
+    def add(self, password):
+        """Adiciona (ou promove ao topo) uma senha, descartando as mais antigas se necessário."""
+        with self._lock:
+            if password in self._items:
+                self._items.move_to_end(password)
+            else:
+                self._items[password] = None
+                while len(self._items) > self.capacity:
+                    self._items.popitem(last=False)
+
+    def window(self, size=VISIBLE_ITEMS):
+        """Retorna as `size` senhas mais recentes, da mais nova para a mais antiga."""
+        with self._lock:
+            iterator = reversed(self._items)
+            return [password for _, password in zip(range(size), iterator)]
+
+    def search(self, term, limit=None):
+        """Retorna as senhas que contêm `term` (sem diferenciar maiúsculas), das mais recentes primeiro."""
+        term = term.lower()
+        matches = [password for password in self if term in password.lower()]
+        return matches if limit is None else matches[:limit]
+
+    def clear(self):
+        """Remove todas as senhas do histórico (em memória)."""
+        with self._lock:
+            self._items.clear()
+
+    def _get_fernet(self):
+        """Obtém a chave no cofre (criando-a na primeira vez); o cofre serializa a criação."""
+        if self._fernet is None:
+            self._fernet = Fernet(self.key_store.get_or_create(self.KEY_NAME, Fernet.generate_key))
+        return self._fernet
+
+    def load(self):
+        """Lê o histórico cifrado do disco. Retorna False se não houver arquivo válido."""
+        if not self.filename or not os.path.exists(self.filename):
+            return False
+        try:
+            with open(self.filename, 'rb') as f:
+                token = f.read()
+            passwords = json.loads(self._get_fernet().decrypt(token))
+        except (InvalidToken, ValueError, IOError) as e:
+            print(f"Erro ao carregar histórico: {e}")
+            return False
+        with self._lock:
+            self._items = OrderedDict.fromkeys(passwords[-self.capacity:])
+        return True
+
+    def save(self):
+        """Grava o histórico cifrado de forma atômica. Retorna True se algo foi gravado."""
+        if not self.filename:
+            return False
+        with self._lock:
+            document = json.dumps(list(self._items)).encode('utf-8')
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=4)
+            write_atomic(self.filename, self._get_fernet().encrypt(document), prefix=".historico-")
         except IOError as e:
-            print(f"Erro ao salvar configurações: {e}")
+            print(f"Erro ao salvar histórico: {e}")
+            return False
+        return True
 
 
 class PasswordValidator:
@@ -89,9 +302,58 @@ class PasswordValidator:
         }
 
 
+@functools.lru_cache(maxsize=64)
+def _length_entropy_table(class_sizes: tuple, max_length: int) -> tuple:
+    """
+    Tabela comprimento -> entropia (bits) para uma política de classes obrigatórias.
+
+    Conta, por inclusão-exclusão, as senhas de cada comprimento que têm ao
+    menos um caractere de cada classe (classes disjuntas com os tamanhos
+    dados). Como só depende dos tamanhos, a tabela é calculada uma vez por
+    alfabeto/política e reaproveitada.
+    """
+    total = sum(class_sizes)
+    table = []
+    for length in range(max_length + 1):
+        count = 0
+        for mask in range(1 << len(class_sizes)):
+            excluded = sum(size for i, size in enumerate(class_sizes) if mask >> i & 1)
+            sign = -1 if bin(mask).count("1") % 2 else 1
+            count += sign * (total - excluded) ** length
+        table.append(math.log2(count) if count > 0 else 0.0)
+    return tuple(table)
+
+
 class PasswordGenerator:
-    """Gera e analisa senhas e frases-senha."""
+    """
+    Gera e analisa senhas e frases-senha.
+
+    Todo sorteio passa por `random_source` (veja `src.rng`); o padrão é o
+    CSPRNG do sistema. Se `issued` (um filtro de Bloom, veja `src.bloom`)
+    for informado, cada senha emitida é registrada nele e uma senha já
+    emitida antes é descartada e sorteada de novo.
+    """
     CARACTERES_AMBIGUOS = "Il1O0o"
+    MIN_LENGTH = 8 # Limites da política, os mesmos do controle deslizante da interface
+    MAX_LENGTH = 64
+    MAX_TARGET_LENGTH = 256 # Limite do modo de entropia-alvo
+    MAX_ISSUE_ATTEMPTS = 100 # Sorteios até achar uma senha ainda não emitida
+    ISSUE_FAILURE = "Não foi possível gerar uma senha inédita: aumente o comprimento ou as classes."
+    PASSPHRASE_ISSUE_FAILURE = ("Não foi possível gerar uma frase-senha inédita: "
+                                "aumente o número de palavras ou use uma lista maior.")
+
+    def __init__(self, random_source=None, issued=None):
+        self.random = random_source or SystemRandomSource()
+        self.issued = issued
+
+    def _issue(self, draw, *args, failure=ISSUE_FAILURE):
+        """Sorteia com `draw(*args)` até obter uma senha inédita e a registra; ValueError(`failure`) se não houver."""
+        for _ in range(self.MAX_ISSUE_ATTEMPTS):
+            password, entropy = draw(*args)
+            # Mensagens de erro (entropia 0) não são senhas e não entram no registro
+            if self.issued is None or entropy == 0 or not self.issued.add(password):
+                return password, entropy
+        raise ValueError(failure)
 
     def analyze_password(self, password, special_chars_pool):
         """Calcula a entropia de uma senha em bits."""
@@ -103,13 +365,18 @@ class PasswordGenerator:
         if pool == 0: return 0
         return len(password) * math.log2(pool)
 
+    @GENERATION_SECONDS.timed
     def generate(self, length, use_upper, use_lower, use_digits, use_special, exclude_ambiguous, special_chars):
         """Gera uma senha aleatória baseada nos critérios fornecidos."""
+        return self._issue(self._draw_password, length, use_upper, use_lower, use_digits, use_special,
+                           exclude_ambiguous, special_chars)
+
+    def _draw_password(self, length, use_upper, use_lower, use_digits, use_special, exclude_ambiguous, special_chars):
         alphabet, guaranteed_chars = "", []
-        if use_upper: alphabet += string.ascii_uppercase; guaranteed_chars.append(secrets.choice(string.ascii_uppercase))
-        if use_lower: alphabet += string.ascii_lowercase; guaranteed_chars.append(secrets.choice(string.ascii_lowercase))
-        if use_digits: alphabet += string.digits; guaranteed_chars.append(secrets.choice(string.digits))
-        if use_special and special_chars: alphabet += special_chars; guaranteed_chars.append(secrets.choice(special_chars))
+        if use_upper: alphabet += string.ascii_uppercase; guaranteed_chars.append(self.random.choice(string.ascii_uppercase))
+        if use_lower: alphabet += string.ascii_lowercase; guaranteed_chars.append(self.random.choice(string.ascii_lowercase))
+        if use_digits: alphabet += string.digits; guaranteed_chars.append(self.random.choice(string.digits))
+        if use_special and special_chars: alphabet += special_chars; guaranteed_chars.append(self.random.choice(special_chars))
 
         if exclude_ambiguous:
             alphabet = "".join(c for c in alphabet if c not in self.CARACTERES_AMBIGUOS)
@@ -122,39 +389,128 @@ class PasswordGenerator:
             remaining_length = 0
             guaranteed_chars = guaranteed_chars[:length]
 
-        remaining_chars = [secrets.choice(alphabet) for _ in range(remaining_length)]
+        remaining_chars = [self.random.choice(alphabet) for _ in range(remaining_length)]
         password_list = guaranteed_chars + remaining_chars
-        secrets.SystemRandom().shuffle(password_list)
+        self.random.shuffle(password_list)
         final_password = "".join(password_list)
         entropy = len(final_password) * math.log2(len(alphabet)) if alphabet else 0
         return final_password, entropy
 
+    def character_classes(self, use_upper, use_lower, use_digits, use_special, exclude_ambiguous, special_chars):
+        """Retorna as classes de caracteres selecionadas, sem repetições e sem sobreposição."""
+        selected = [
+            (use_upper, string.ascii_uppercase),
+            (use_lower, string.ascii_lowercase),
+            (use_digits, string.digits),
+            (use_special, special_chars or ""),
+        ]
+        seen, classes = set(), []
+        for enabled, chars in selected:
+            if not enabled:
+                continue
+            chars = "".join(c for c in dict.fromkeys(chars) if c not in seen)
+            if exclude_ambiguous:
+                chars = "".join(c for c in chars if c not in self.CARACTERES_AMBIGUOS)
+            if chars:
+                classes.append(chars)
+                seen.update(chars)
+        return classes
+
+    def minimum_length(self, target_bits, classes, max_length=MAX_TARGET_LENGTH, min_length=MIN_LENGTH):
+        """
+        Menor comprimento cuja entropia (exigindo todas as classes) atinge `target_bits`.
+
+        Nunca fica abaixo de `min_length` (o mínimo da política) nem do número
+        de classes obrigatórias; alvos não finitos (ex: NaN) geram ValueError.
+        """
+        if not math.isfinite(target_bits):
+            raise ValueError("A entropia-alvo deve ser um número finito.")
+        table = _length_entropy_table(tuple(len(chars) for chars in classes), max_length)
+        length = max(bisect.bisect_left(table, target_bits), len(classes), min_length)
+        if length > max_length:
+            raise ValueError(f"Não é possível atingir {target_bits} bits com até {max_length} caracteres.")
+        return length, table[length]
+
+    def target_length(self, target_bits, classes, max_length=MAX_TARGET_LENGTH):
+        """Como `minimum_length`, mas recusa alvos que caberiam em menos de MIN_LENGTH caracteres."""
+        needed, _ = self.minimum_length(target_bits, classes, max_length, min_length=1)
+        if needed < self.MIN_LENGTH:
+            _, floor = self.minimum_length(0, classes, max_length)
+            raise ValueError(f"{target_bits:g} bits dariam senhas de {needed} caracteres; o mínimo é "
+                             f"{self.MIN_LENGTH} ({floor:.1f} bits com estas classes).")
+        return self.minimum_length(target_bits, classes, max_length)
+
+    @GENERATION_SECONDS.timed
+    def generate_for_entropy(self, target_bits, use_upper, use_lower, use_digits, use_special, exclude_ambiguous,
+                             special_chars, max_length=MAX_TARGET_LENGTH):
+        """
+        Gera a senha mais curta que atinge `target_bits` de entropia com as classes escolhidas.
+
+        Os caracteres são sorteados uniformemente do alfabeto e a senha é
+        descartada se faltar alguma classe; assim ela é uniforme entre as
+        senhas válidas e a entropia informada é exata.
+        """
+        classes = self.character_classes(use_upper, use_lower, use_digits, use_special, exclude_ambiguous, special_chars)
+        if not classes: return "Selecione uma opção!", 0
+        length, entropy = self.minimum_length(target_bits, classes, max_length)
+
+        alphabet = "".join(classes)
+        class_sets = [set(chars) for chars in classes]
+
+        def draw():
+            while True:
+                password = "".join(self.random.choice(alphabet) for _ in range(length))
+                if all(not chars.isdisjoint(password) for chars in class_sets):
+                    return password, entropy
+        return self._issue(draw)
+
+    @GENERATION_SECONDS.timed
     def generate_passphrase(self, num_words, separator, wordlist):
         """Gera uma frase-senha a partir de uma lista de palavras."""
+        return self._issue(self._draw_passphrase, num_words, separator, wordlist,
+                           failure=self.PASSPHRASE_ISSUE_FAILURE)
+
+    def _draw_passphrase(self, num_words, separator, wordlist):
         if not wordlist: return "A lista de palavras está vazia!", 0
         try:
-            chosen_words = [secrets.choice(wordlist) for _ in range(num_words)]
+            chosen_words = [self.random.choice(wordlist) for _ in range(num_words)]
             passphrase = separator.join(chosen_words)
             entropy = num_words * math.log2(len(wordlist))
             return passphrase, entropy
         except IndexError:
             return "Lista de palavras vazia!", 0
 
+
+_pwned_session = None # Sessão HTTP persistente, se configurada com use_pwned_session
+
+
+def use_pwned_session(session):
+    """
+    Passa a consultar a API Pwned Passwords por `session` (ex: `requests.Session()`),
+    que mantém a conexão TLS aberta entre as consultas. Com None, cada consulta
+    abre uma conexão nova.
+    """
+    global _pwned_session
+    _pwned_session = session
+
+
 @functools.lru_cache(maxsize=128)
 def _fetch_pwned_hashes(prefix: str) -> str:
     """
     Busca os hashes que correspondem ao prefixo na API Pwned Passwords.
     O resultado é cacheado para evitar requisições repetidas.
     """
+    PWNED_MISSES.inc() # Só executa quando o prefixo não está no cache
     url = f"https://api.pwnedpasswords.com/range/{prefix}"
     headers = {
         'User-Agent': 'GeradorSenhaUnimed/1.0'
     }
-    response = requests.get(url, headers=headers, timeout=5)
+    response = (_pwned_session or requests).get(url, headers=headers, timeout=5)
     response.raise_for_status()
     return response.text
 
 
+@PWNED_CHECK_SECONDS.timed
 def check_pwned(password: str) -> Optional[bool]:
     """
     Verifica se a senha aparece em vazamentos de dados usando a API Pwned Passwords.
@@ -174,6 +530,7 @@ def check_pwned(password: str) -> Optional[bool]:
         prefix, suffix = sha1_password[:5], sha1_password[5:]
 
         # Busca os hashes usando a função com cache
+        PWNED_LOOKUPS.inc()
         hashes_text = _fetch_pwned_hashes(prefix)
 
         # A resposta é uma lista de sufixos de hash e suas contagens
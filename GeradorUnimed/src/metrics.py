@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Métricas
+
+Este arquivo define uma instrumentação leve (contadores, histogramas e
+medições de tempo) para os caminhos críticos da lógica e da UI. As
+métricas são declaradas uma vez, no carregamento de cada módulo, e
+consultadas no painel de diagnóstico da aplicação (Ctrl+Shift+D) ou
+exportadas em JSON ou no formato de texto do Prometheus.
+
+A coleta começa desligada: cada registro custa apenas a leitura de um
+atributo, e as medições de tempo devolvem um contexto compartilhado que não
+faz nada. Ela é ligada pelo painel de diagnóstico ou pela variável de
+ambiente GERADOR_METRICAS=1. Não há código de interface gráfica aqui.
+"""
+
+import bisect
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+PREFIX = "gerador_"
+ENABLE_ENV = "GERADOR_METRICAS"
+
+# Limites (em segundos) dos histogramas de tempo
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _NullSpan:
+    """Contexto usado quando a coleta está desligada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Mede o tempo de um bloco e o registra no histograma ao sair."""
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Counter:
+    """Contador monotônico (ex: consultas ao cache)."""
+    kind = "counter"
+
+    def __init__(self, registry, name, help_text):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        if not self.registry.enabled:
+            return
+        with self.registry.lock:
+            self.value += amount
+
+    def reset(self):
+        self.value = 0
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Distribuição de valores em faixas fixas (ex: durações em segundos)."""
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1) # A última faixa é +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self.registry.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """Contexto que mede o bloco: `with histograma.time(): ...`."""
+        return _Span(self) if self.registry.enabled else _NULL_SPAN
+
+    def timed(self, func):
+        """Decorador que mede cada chamada de `func`."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.registry.enabled:
+                return func(*args, **kwargs)
+            with _Span(self):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def observe_since(self, start):
+        """Registra o tempo decorrido desde `start` (de `MetricsRegistry.clock`)."""
+        if start is not None:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q):
+        """Estimativa do quantil `q` pelo limite superior da faixa (None sem amostras)."""
+        if not self.count:
+            return None
+        rank, total = q * self.count, 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return math.inf
+
+    def snapshot(self):
+        cumulative, total = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            cumulative.append(["+Inf" if bound == math.inf else bound, total])
+        return {"contagem": self.count, "soma": self.sum, "faixas": cumulative}
+
+
+class MetricsRegistry:
+    """Conjunto das métricas da aplicação."""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self._metrics = {}
+
+    def _declare(self, cls, name, *args):
+        with self.lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Métrica já declarada com outro tipo: {name}")
+            return metric
+
+    def counter(self, name, help_text=""):
+        return self._declare(Counter, name, help_text)
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        return self._declare(Histogram, name, help_text, buckets)
+
+    def clock(self):
+        """Marca de tempo para `Histogram.observe_since` (None com a coleta desligada)."""
+        return time.perf_counter() if self.enabled else None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self.lock:
+            for metric in self._metrics.values():
+                metric.reset()
+
+    def __iter__(self):
+        return iter(sorted(self._metrics.values(), key=lambda m: m.name))
+
+    def snapshot(self):
+        """Valores atuais de todas as métricas, prontos para JSON."""
+        with self.lock:
+            return {
+                "timestamp": time.time(),
+                "contadores": {m.name: m.snapshot() for m in self if m.kind == "counter"},
+                "histogramas": {m.name: m.snapshot() for m in self if m.kind == "histogram"},
+            }
+
+    def to_prometheus(self):
+        """Texto no formato de exposição do Prometheus."""
+        lines = []
+        with self.lock:
+            for metric in self:
+                name = PREFIX + metric.name
+                if metric.help:
+                    lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+                if metric.kind == "counter":
+                    lines.append(f"{name} {metric.value}")
+                    continue
+                for bound, total in metric.snapshot()["faixas"]:
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {total}')
+                lines.append(f"{name}_sum {metric.sum!r}")
+                lines.append(f"{name}_count {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Grava as métricas em `path`: JSON se terminar em .json, senão texto do Prometheus."""
+        from src.logic import write_atomic # Import tardio: src.logic também é instrumentado
+
+        if path.endswith(".json"):
+            data = json.dumps(self.snapshot(), indent=2)
+        else:
+            data = self.to_prometheus()
+        write_atomic(path, data.encode('utf-8'), prefix=".metricas-")
+
+
+# Métricas compartilhadas por toda a aplicação
+metrics = MetricsRegistry(enabled=os.environ.get(ENABLE_ENV) == "1")
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Recursos (Assets)
+
+Este arquivo dá acesso aos recursos empacotados em `src/assets` (listas de
+palavras, ícones) por `importlib.resources`, sem caminhos montados a partir
+de `__file__`. Assim os recursos são encontrados tanto na árvore de código
+quanto dentro de um executável congelado ou de um zip (PyInstaller,
+zipapp), onde são lidos direto do arquivo compactado, sem extração.
+
+O manifesto (`src/assets/manifest.json`) é gerado no build e lista nome,
+tamanho, hash e número de palavras de cada recurso. A aplicação descobre
+as listas de palavras e seus metadados só pelo manifesto: nenhum diretório
+é listado e nenhum arquivo é aberto antes de ser realmente usado.
+
+Para regenerar o manifesto após alterar os recursos:
+    python -m src.resources
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from importlib import resources
+
+PACKAGE = "src"
+ASSETS_DIR = "assets"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Nome de exibição de cada lista de palavras (as demais usam o nome do arquivo)
+WORDLIST_NAMES = {
+    "wordlists/portugues_basico.txt": "Português (Básico)",
+    "wordlists/ingles_basico.txt": "Inglês (Básico)",
+    "wordlists/animais_pt_br.txt": "Animais (PT-BR)",
+}
+
+
+def _walk(traversable, prefix=""):
+    """Lista (nome relativo, recurso) de todos os arquivos, em ordem."""
+    for entry in sorted(traversable.iterdir(), key=lambda e: e.name):
+        name = f"{prefix}{entry.name}"
+        if entry.is_dir():
+            if entry.name != "__pycache__":
+                yield from _walk(entry, f"{name}/")
+        elif name != MANIFEST_NAME:
+            yield name, entry
+
+
+def build_manifest(root=None):
+    """Monta o manifesto dos recursos em `root` (por padrão, `src/assets`)."""
+    root = root or resources.files(PACKAGE) / ASSETS_DIR
+    files = {}
+    for name, entry in _walk(root):
+        data = entry.read_bytes()
+        info = {"tamanho": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        if name.startswith("wordlists/") and name.endswith(".txt"):
+            info["palavras"] = len(data.decode('utf-8').split())
+            info["nome"] = WORDLIST_NAMES.get(name, os.path.basename(name))
+        files[name] = info
+    return {"versao": MANIFEST_VERSION, "arquivos": files}
+
+
+class AssetBundle:
+    """Recursos empacotados, carregados sob demanda a partir do manifesto."""
+    def __init__(self, package=PACKAGE, directory=ASSETS_DIR):
+        self.package = package
+        self.directory = directory
+        self._root = None
+        self._manifest = None
+        self._cache = {} # nome -> bytes já lidos
+        self._lock = threading.Lock()
+
+    @property
+    def root(self):
+        if self._root is None:
+            self._root = resources.files(self.package) / self.directory
+        return self._root
+
+    @property
+    def manifest(self):
+        """Manifesto do build, lido na primeira consulta."""
+        with self._lock:
+            if self._manifest is None:
+                manifest = json.loads((self.root / MANIFEST_NAME).read_text(encoding='utf-8'))
+                if manifest.get("versao") != MANIFEST_VERSION:
+                    raise ValueError(f"Versão do manifesto de recursos não suportada: {manifest.get('versao')}")
+                self._manifest = manifest
+            return self._manifest
+
+    def info(self, name):
+        """Metadados de `name` no manifesto (FileNotFoundError se não existir)."""
+        try:
+            return self.manifest["arquivos"][name]
+        except KeyError:
+            raise FileNotFoundError(f"Recurso não encontrado no manifesto: {name}") from None
+
+    def wordlists(self):
+        """Retorna {nome de exibição: nome do recurso} das listas de palavras, sem abri-las."""
+        return {
+            info["nome"]: name
+            for name, info in self.manifest["arquivos"].items() if "palavras" in info
+        }
+
+    def _resource(self, name):
+        self.info(name) # Só recursos do manifesto podem ser abertos
+        resource = self.root
+        for part in name.split("/"):
+            resource = resource / part
+        return resource
+
+    def open_binary(self, name):
+        """
+        Abre `name` para leitura em fluxo (ex: imagens passadas ao Pillow).
+        Dentro de um zip, lê direto do membro compactado, sem extraí-lo.
+        """
+        return self._resource(name).open('rb')
+
+    def read_bytes(self, name, verify=False):
+        """Conteúdo de `name`, lido uma única vez; com `verify`, confere o hash do manifesto."""
+        data = self._cache.get(name)
+        if data is None:
+            data = self._resource(name).read_bytes()
+            if verify and hashlib.sha256(data).hexdigest() != self.info(name)["sha256"]:
+                raise ValueError(f"Recurso alterado desde o build (regenere o manifesto): {name}")
+            self._cache[name] = data
+        return data
+
+    def read_text(self, name):
+        return self.read_bytes(name).decode('utf-8')
+
+
+# Recursos compartilhados por toda a aplicação
+assets = AssetBundle()
+
+
+def main(argv=None):
+    """Regenera `src/assets/manifest.json` a partir dos arquivos da árvore de código."""
+    root = resources.files(PACKAGE) / ASSETS_DIR
+    manifest = build_manifest(root)
+    path = os.fspath(root / MANIFEST_NAME)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"{len(manifest['arquivos'])} recursos registrados em {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Fontes de Aleatoriedade
+
+Este arquivo define as fontes de aleatoriedade usadas pelo PasswordGenerator.
+Todas oferecem a mesma interface (`randbelow`, `choice`, `shuffle`):
+
+- SystemRandomSource: CSPRNG do sistema operacional (padrão).
+- BufferedRandomSource: CSPRNG do sistema lido em blocos, com menos syscalls.
+- SeededRandomSource: determinística, APENAS para testes e benchmarks.
+
+`random_pool` é a instância compartilhada de BufferedRandomSource usada
+pela aplicação e pela linha de comando.
+"""
+
+import abc
+import os
+import random
+import secrets
+import threading
+import weakref
+
+# Pools ativos, reiniciados no processo filho após um fork
+_pools = weakref.WeakSet()
+
+
+class RandomSource(abc.ABC):
+    """Interface comum: as subclasses implementam `randbelow`."""
+
+    @abc.abstractmethod
+    def randbelow(self, n):
+        """Retorna um inteiro uniforme em [0, n)."""
+
+    def choice(self, seq):
+        """Escolhe um elemento uniforme de uma sequência não vazia."""
+        if not seq:
+            raise IndexError("Não é possível escolher de uma sequência vazia")
+        return seq[self.randbelow(len(seq))]
+
+    def shuffle(self, items):
+        """Embaralha a lista no lugar (Fisher-Yates)."""
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+
+class SystemRandomSource(RandomSource):
+    """Usa o módulo `secrets` diretamente (uma leitura do SO por sorteio)."""
+
+    def __init__(self):
+        self._system = secrets.SystemRandom()
+
+    def randbelow(self, n):
+        return secrets.randbelow(n)
+
+    def choice(self, seq):
+        return secrets.choice(seq)
+
+    def shuffle(self, items):
+        self._system.shuffle(items)
+
+
+class BufferedRandomSource(RandomSource):
+    """
+    Pool de bytes do CSPRNG do sistema, lido em blocos de `block_size` bytes.
+
+    Os inteiros são obtidos por amostragem com rejeição sobre os bytes do
+    bloco, sem viés de módulo. Os bytes consumidos são zerados no pool, e
+    após um `os.fork` o processo filho descarta o bloco herdado (senão pai
+    e filho sortariam os mesmos valores). Pode ser compartilhado entre threads.
+    """
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        self._buffer = bytearray()
+        self._pos = 0
+        self._lock = threading.Lock()
+        self.refills = 0 # Quantas vezes o SO foi consultado
+        _pools.add(self)
+
+    def _refill(self, count):
+        """Substitui o bloco (já zerado) por um novo lido do SO."""
+        self._wipe()
+        block = os.urandom(max(self.block_size, count))
+        self._buffer = bytearray(block)
+        del block
+        self._pos = 0
+        self.refills += 1
+
+    def _wipe(self):
+        """Zera os bytes ainda não consumidos e esvazia o pool."""
+        self._buffer[self._pos:] = bytes(len(self._buffer) - self._pos)
+        self._buffer = bytearray()
+        self._pos = 0
+
+    def _take(self, count):
+        """Consome `count` bytes do bloco como inteiro, zerando-os; lê um novo bloco do SO quando acaba."""
+        with self._lock:
+            start = self._pos
+            end = start + count
+            if end > len(self._buffer):
+                self._refill(count)
+                start, end = 0, count
+            self._pos = end
+            value = int.from_bytes(self._buffer[start:end], "big")
+            self._buffer[start:end] = bytes(count)
+            return value
+
+    def _reset_after_fork(self):
+        """No processo filho: novo lock (o do pai pode estar preso) e bloco descartado."""
+        self._lock = threading.Lock()
+        self._wipe()
+
+    def randbelow(self, n):
+        if n <= 0:
+            raise ValueError("n deve ser positivo")
+        # Um byte a mais que o necessário: o maior múltiplo de n abaixo de
+        # 256**k deixa a rejeição abaixo de 1/256, sem viés no resto da divisão
+        num_bytes = (n.bit_length() + 7) // 8 + 1
+        space = 1 << (8 * num_bytes)
+        limit = space - space % n
+        while True:
+            value = self._take(num_bytes)
+            if value < limit:
+                return value % n
+
+
+def _reset_pools_after_fork():
+    for pool in list(_pools):
+        pool._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+class SeededRandomSource(RandomSource):
+    """
+    Fonte determinística baseada em `random.Random(seed)`.
+
+    NÃO é criptograficamente segura: serve apenas para fixar saídas em
+    testes e para medir o custo do algoritmo sem o custo das syscalls.
+    """
+
+    def __init__(self, seed=0):
+        self._random = random.Random(seed)
+
+    def randbelow(self, n):
+        return self._random.randrange(n)
+
+    def choice(self, seq):
+        return self._random.choice(seq)
+
+    def shuffle(self, items):
+        self._random.shuffle(items)
+
+
+# Pool compartilhado pela aplicação
+random_pool = BufferedRandomSource()
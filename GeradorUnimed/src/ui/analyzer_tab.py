@@ -6,6 +6,7 @@ Módulo da Aba Analisador de Senha (UI)
 import customtkinter as ctk
 from src.logic import PasswordValidator
 from src.config import CONFIG
+from src.ui.styles import styles
 
 class AnalyzerTab(ctk.CTkFrame):
     """
@@ -35,7 +36,7 @@ class AnalyzerTab(ctk.CTkFrame):
             entry_frame,
             placeholder_text="Digite a senha para analisar...",
             show="*",
-            font=ctk.CTkFont(size=14)
+            font=styles.font("CORPO")
         )
         self.password_entry.grid(row=0, column=0, padx=(0, 10), pady=10, sticky="ew")
 
@@ -43,7 +44,7 @@ class AnalyzerTab(ctk.CTkFrame):
             entry_frame,
             text="Revelar Senha",
             command=self._toggle_password_visibility,
-            font=ctk.CTkFont(size=14)
+            font=styles.font("CORPO")
         )
         self.reveal_checkbox.grid(row=0, column=1, padx=10, pady=10)
 
@@ -62,7 +63,7 @@ class AnalyzerTab(ctk.CTkFrame):
         title_label = ctk.CTkLabel(
             criteria_frame,
             text="Critérios de Segurança",
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=styles.font("CORPO_NEGRITO")
         )
         title_label.grid(row=0, column=0, padx=5, pady=(0, 10), sticky="w")
 
@@ -84,7 +85,7 @@ class AnalyzerTab(ctk.CTkFrame):
             parent,
             text=f"❌ {text}",
             text_color="red",
-            font=ctk.CTkFont(size=14)
+            font=styles.font("CORPO")
         )
         return label
 
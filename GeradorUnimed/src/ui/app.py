@@ -8,20 +8,60 @@ orquestrando todos os componentes e a lógica do programa.
 """
 
 import os
-import secrets
-import string
 import threading
 import tkinter as tk
 import customtkinter
 
-import pyperclip
 from PIL import Image
 
+from src.bloom import PersistentBloomFilter
 from src.config import CONFIG
-from src.logic import PasswordGenerator, SettingsManager, check_pwned, PasswordValidator
+from src.logic import PasswordGenerator, PasswordHistory, SettingsManager, check_pwned, PasswordValidator, user_config_dir
+from src.metrics import metrics
+from src.resources import assets
+from src.rng import random_pool
 from src.ui.analyzer_tab import AnalyzerTab
+from src.ui.clipboard import ClipboardService
 from src.ui.components import PassphraseTab, PasswordTab, AdvancedPasswordOptionsWindow
-from src.ui.utils import Tooltip, UnimedWordAnimator
+from src.ui.diagnostics import DiagnosticsWindow
+from src.ui.styles import styles
+from src.ui.tasks import TaskExecutor
+from src.ui.utils import ScrambleEffect, Tooltip, UnimedWordAnimator
+from src.ui.watchdog import MainLoopWatchdog
+
+# Marca um resultado de verificação de vazamento que ainda não chegou
+_PENDING = object()
+
+# Variáveis da UI que não são configurações persistidas (o modo corporativo vale só para a sessão)
+TRANSIENT_VARS = ("senha_gerada", "frase_gerada", "modo_corporativo")
+
+
+def setting_key(var_key):
+    """Nome da configuração para uma variável da UI ("comprimento_var" -> "comprimento")."""
+    return var_key[:-len("_var")] if var_key.endswith("_var") else var_key
+
+
+# Do clique em "Gerar" até o resultado final aparecer (inclui a animação)
+CLICK_TO_DISPLAY_SECONDS = metrics.histogram("clique_ate_exibicao_segundos", "Tempo do clique em gerar até a exibição do resultado.")
+
+# Chaves das verificações de vazamento. Geração e histórico têm chaves próprias: escolher uma
+# senha do histórico durante a animação não pode descartar a verificação da senha sendo gerada
+# (update_pwned_status já ignora resultados de uma senha que não está mais exibida)
+PWNED_GENERATION_KEY = "verificacao_geracao"
+PWNED_HISTORY_KEY = "verificacao_historico"
+FINALIZE_POLL_MS = 20 # Intervalo para conferir se a senha gerada em segundo plano ficou pronta
+
+
+class _PasswordJob:
+    """Senha gerada em segundo plano durante a animação."""
+    def __init__(self):
+        self.ready = threading.Event()
+        self.password = None
+        self.entropy = 0
+        self.error = None # Mensagem, se a geração falhou
+        self.pwned = _PENDING
+        self.shown = False
+
 
 # 6. CLASSE PRINCIPAL DA APLICAÇÃO
 # Orquestra todos os componentes.
@@ -33,18 +73,36 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
 
         # --- Inicialização de Módulos ---
         self.settings_manager = SettingsManager()
-        self.password_generator = PasswordGenerator()
         self.settings = self.settings_manager.load_settings()
-        self.password_history = []
+        # Registro de todas as senhas já emitidas (só hashes com sal; criado no primeiro uso)
+        self.issued_registry = PersistentBloomFilter(
+            os.path.join(user_config_dir(), "emitidas.bloom"),
+            self.settings["registro_capacidade"], self.settings["registro_taxa_erro"]
+        )
+        self.password_generator = PasswordGenerator(random_pool, issued=self.issued_registry)
+        self.password_history = PasswordHistory(
+            os.path.join(user_config_dir(), "historico.bin"), capacity=self.settings["historico_capacidade"]
+        )
+        self.password_history.load()
+        self._history_window = None # Última lista enviada ao menu de histórico
         self.advanced_options_window = None
+        self.diagnostics_window = None
+        self.clipboard = ClipboardService(self)
         self.clipboard_timer = None
+        self.scramble_effect = ScrambleEffect()
+        self.password_job = None
+        # Pool fixo para as verificações de vazamento (resultados entregues por fila)
+        self.tasks = TaskExecutor(self, max_workers=2)
+        # Registra travamentos da UI em travamentos.log (começa com o loop do Tk)
+        self.watchdog = MainLoopWatchdog(self, self.settings["limite_travamento_ms"])
+        self.after(0, self.watchdog.start)
 
 
         # --- Configuração do Tema e Janela ---
         customtkinter.set_appearance_mode("dark")
         customtkinter.set_default_color_theme("blue")
         self.title("Gerador de Senhas - Unimed")
-        self.configure(bg="black") # FUNDAÇÃO: Fundo preto
+        styles.themed(self, bg="JANELA_FUNDO") # FUNDAÇÃO: Fundo preto
 
         # GARANTIA DE JANELA MAXIMIZADA
         self.geometry("1280x720")
@@ -56,6 +114,7 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         self._init_vars()
+        self._bind_settings_persistence()
         self.create_main_widgets()
 
         if self.vars["animacao_ativa"].get():
@@ -65,6 +124,8 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         # --- Eventos de Foco para Otimização ---
         self.bind("<FocusIn>", self.handle_focus_in)
         self.bind("<FocusOut>", self.handle_focus_out)
+        # Painel oculto de diagnóstico
+        self.bind("<Control-Shift-D>", self.open_diagnostics)
 
     def _init_vars(self):
         """Inicializa as variáveis do Tkinter com os valores das configurações."""
@@ -85,6 +146,20 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
             "modo_corporativo": tk.BooleanVar(value=False)
         }
 
+    def _bind_settings_persistence(self):
+        """Registra cada alteração de opção no SettingsManager assim que ela acontece."""
+        for key, var in self.vars.items():
+            if key not in TRANSIENT_VARS:
+                var.trace_add("write", lambda *_, key=key: self._on_setting_changed(key))
+
+    def _on_setting_changed(self, key):
+        """Repassa o novo valor; a gravação em disco é adiada e feita em segundo plano."""
+        try:
+            value = self.vars[key].get()
+        except tk.TclError:
+            return # Ex: campo numérico vazio durante a digitação
+        self.settings_manager.set(setting_key(key), value)
+
     def create_main_widgets(self):
         """Cria a estrutura principal da UI."""
         self.animation_canvas = customtkinter.CTkCanvas(self, bg="black", highlightthickness=0)
@@ -112,7 +187,7 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         self.header_label = customtkinter.CTkLabel(
             content_frame,
             text="Gerador de Senhas - Unimed",
-            font=customtkinter.CTkFont(size=24, weight="bold")
+            font=styles.font("CABECALHO")
         )
         self.header_label.grid(row=0, column=0, pady=(20, 10))
 
@@ -131,6 +206,7 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         analyzer_tab = notebook.add("  ANALISADOR  ")
 
         self.tab_senha = PasswordTab(senha_tab, self)
+        self._refresh_history_menu()
         self.tab_frase = PassphraseTab(frase_tab, self)
         self.tab_analyzer = AnalyzerTab(analyzer_tab)
 
@@ -150,15 +226,15 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         author_label = customtkinter.CTkLabel(
             inner_footer_frame,
             text="Desenvolvido por Victor Viana",
-            font=customtkinter.CTkFont(size=14, weight="bold"),
+            font=styles.font("CORPO_NEGRITO"),
             text_color="gray70"
         )
         author_label.grid(row=0, column=0, sticky="e", padx=(0, 8))
 
         try:
-            script_dir = os.path.dirname(__file__)
-            icon_path = os.path.abspath(os.path.join(script_dir, '..', 'assets', 'gear_icon.png'))
-            gear_image_pil = Image.open(icon_path)
+            with assets.open_binary("gear_icon.png") as f:
+                gear_image_pil = Image.open(f)
+                gear_image_pil.load() # Decodifica antes de fechar o fluxo
             self.gear_image = customtkinter.CTkImage(light_image=gear_image_pil, dark_image=gear_image_pil, size=(24, 24))
 
             settings_button = customtkinter.CTkButton(
@@ -177,7 +253,7 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
                 inner_footer_frame,
                 text="Opções",
                 command=self.open_advanced_options,
-                font=customtkinter.CTkFont(size=14)
+                font=styles.font("CORPO")
             )
             settings_button.grid(row=0, column=1, sticky="w")
             Tooltip(settings_button, "Configurações e Preferências")
@@ -188,30 +264,73 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
             self.advanced_options_window = AdvancedPasswordOptionsWindow(self, self)
         self.advanced_options_window.focus()
 
+    def open_diagnostics(self, event=None):
+        """Abre o painel de diagnóstico (liga a coleta de métricas)."""
+        if self.diagnostics_window is None or not self.diagnostics_window.winfo_exists():
+            self.diagnostics_window = DiagnosticsWindow(self)
+        self.diagnostics_window.focus()
+
     def animate_generation(self, button, target_var, length, final_callback):
         """Anima o campo de texto antes de mostrar o resultado final."""
+        clicked_at = metrics.clock()
         button.configure(state="disabled")
-        # Reset security seal before generating a new password
-        if "senha" in str(target_var):
+        steps = 10
+
+        if target_var is self.vars["senha_gerada"]:
+            # Reset security seal before generating a new password
             self.tab_senha.status_frame.configure(fg_color="transparent")
             self.tab_senha.status_label.configure(text="Verificando...")
+            # A senha real (e a verificação de vazamento) é gerada em paralelo à animação
+            self.password_job = self._start_password_generation()
+            frames = self.scramble_effect.scramble_frames(length, steps)
+        else:
+            frames = self.scramble_effect.loading_frames(steps)
 
-        char_pool = string.ascii_letters + string.digits + string.punctuation
-
-        def animate_step(steps_left):
-            if steps_left > 0:
-                if "frase" in str(target_var):
-                    dots = "." * (4 - (steps_left % 4))
-                    temp_text = f"Gerando{dots}"
-                else:
-                    temp_text = "".join(secrets.choice(char_pool) for _ in range(length))
-                target_var.set(temp_text)
-                self.after(50, lambda: animate_step(steps_left - 1))
+        def animate_step(index):
+            if index < len(frames):
+                target_var.set(frames[index])
+                self.after(50, lambda: animate_step(index + 1))
             else:
-                final_callback()
-                button.configure(state="normal")
-
-        animate_step(10)
+                try:
+                    final_callback()
+                finally:
+                    button.configure(state="normal") # Um erro no resultado não pode travar o botão
+                CLICK_TO_DISPLAY_SECONDS.observe_since(clicked_at)
+
+        animate_step(0)
+
+    def _start_password_generation(self):
+        """Gera a senha e verifica vazamentos em segundo plano."""
+        # As variáveis do Tk só podem ser lidas na thread principal
+        options = (
+            self.vars["comprimento_var"].get(), self.vars["incluir_maiusculas"].get(),
+            self.vars["incluir_minusculas"].get(), self.vars["incluir_numeros"].get(),
+            self.vars["incluir_especiais"].get(), self.vars["excluir_ambiguos"].get(),
+            self.vars["caracteres_especiais_var"].get()
+        )
+        job = _PasswordJob()
+
+        def run():
+            try:
+                job.password, job.entropy = self.password_generator.generate(*options)
+            except ValueError as e: # Ex: nenhuma senha inédita com estas opções
+                job.error = str(e)
+                return
+            finally:
+                job.ready.set() # Nunca deixa a finalização esperando
+            # Substitui a verificação de uma geração anterior ainda pendente
+            self.tasks.submit(PWNED_GENERATION_KEY, check_pwned, job.password,
+                              callback=lambda result: self._on_pwned_result(job, result))
+
+        # Sem chave: a geração nunca é cancelada (a finalização depende dela)
+        self.tasks.submit(None, run)
+        return job
+
+    def _on_pwned_result(self, job, result):
+        """Guarda o resultado da verificação; só atualiza a UI se a senha já foi exibida."""
+        job.pwned = result
+        if job.shown:
+            self.update_pwned_status(result, job.password)
 
     def update_pwned_status(self, is_pwned, checked_password=None):
         """Atualiza a UI com o resultado da verificação de senha vazada."""
@@ -229,25 +348,30 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
             self.tab_senha.status_frame.configure(fg_color="green")
             self.tab_senha.status_label.configure(text="SENHA SEGURA")
 
-    def finalize_password_generation(self):
-        """Chama o gerador e atualiza a UI com a nova senha."""
-        senha, entropia = self.password_generator.generate(
-            self.vars["comprimento_var"].get(), self.vars["incluir_maiusculas"].get(),
-            self.vars["incluir_minusculas"].get(), self.vars["incluir_numeros"].get(),
-            self.vars["incluir_especiais"].get(), self.vars["excluir_ambiguos"].get(),
-            self.vars["caracteres_especiais_var"].get()
-        )
+    def finalize_password_generation(self, job=None):
+        """Exibe a senha gerada em paralelo à animação e atualiza a UI."""
+        if job is None:
+            job = self.password_job or self._start_password_generation()
+            self.password_job = None
+        if not job.ready.is_set():
+            # Geração ainda em andamento (ex: disco lento): confere de novo sem bloquear o loop do Tk
+            self.after(FINALIZE_POLL_MS, lambda: self.finalize_password_generation(job))
+            return
+        if job.error is not None:
+            self.vars["senha_gerada"].set(job.error)
+            self.tab_senha.status_frame.configure(fg_color="orange")
+            self.tab_senha.status_label.configure(text="ERRO NA GERAÇÃO")
+            return
+        senha = job.password
         self.vars["senha_gerada"].set(senha)
+        job.shown = True
 
         # --- Verificação de Vazamento (Assíncrona) ---
-        self.tab_senha.status_frame.configure(fg_color="orange")
-        self.tab_senha.status_label.configure(text="Verificando...")
-
-        def run_check():
-            result = check_pwned(senha)
-            self.after(0, lambda: self.update_pwned_status(result, senha))
-
-        threading.Thread(target=run_check, daemon=True).start()
+        if job.pwned is _PENDING:
+            self.tab_senha.status_frame.configure(fg_color="orange")
+            self.tab_senha.status_label.configure(text="Verificando...")
+        else:
+            self.update_pwned_status(job.pwned, senha)
 
         # A lógica da barra de entropia foi removida do novo design.
         self.update_history(senha)
@@ -260,16 +384,21 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         else:
             user_wordlist = self.tab_frase.wordlist_text.get("1.0", "end-1c").split()
 
-        frase, entropia = self.password_generator.generate_passphrase(
-            self.vars["num_palavras_var"].get(), self.vars["separador_var"].get(), user_wordlist
-        )
+        try:
+            frase, entropia = self.password_generator.generate_passphrase(
+                self.vars["num_palavras_var"].get(), self.vars["separador_var"].get(), user_wordlist
+            )
+        except ValueError as e: # Ex: a lista é pequena e todas as combinações já foram emitidas
+            self.vars["frase_gerada"].set(str(e))
+            self.tab_frase.entropy_label.configure(text="Entropia: -")
+            return
         self.vars["frase_gerada"].set(frase)
         self.tab_frase.entropy_label.configure(text=f"Entropia: {entropia:.2f} bits")
 
     def copy_to_clipboard(self, text, button):
         """Copia o texto para a área de transferência e dá feedback visual."""
-        if text and "Sua" not in text and "Gerando" not in text and "Selecione" not in text:
-            pyperclip.copy(text)
+        if text and not any(marker in text for marker in ("Sua", "Gerando", "Selecione", "Não foi possível")):
+            token = self.clipboard.copy(text)
             original_text = button.cget("text")
             button.configure(text="Copiado!", state="disabled")
             self.after(1500, lambda: button.configure(text=original_text, state="normal"))
@@ -277,26 +406,29 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
             # Security: Clear clipboard after 60 seconds
             if self.clipboard_timer:
                 self.after_cancel(self.clipboard_timer)
-            self.clipboard_timer = self.after(60000, lambda: self.clear_clipboard(text))
+            # O temporizador guarda só o hash do texto, não a senha
+            self.clipboard_timer = self.after(60000, lambda: self.clear_clipboard(token))
 
-    def clear_clipboard(self, text):
-        """Limpa o clipboard se ele ainda contiver o texto sensível."""
-        try:
-            if pyperclip.paste() == text:
-                pyperclip.copy("")
-            self.clipboard_timer = None
-        except Exception:
-            pass
+    def clear_clipboard(self, token):
+        """Limpa o clipboard se ele ainda contiver o texto sensível copiado pela aplicação."""
+        self.clipboard_timer = None
+        self.clipboard.clear_if_owned(token)
 
     def update_history(self, password):
         """Atualiza o histórico de senhas geradas."""
         if "Selecione" in password: return
-        if password in self.password_history:
-            self.password_history.remove(password)
-        self.password_history.insert(0, password)
-        self.password_history = self.password_history[:10]
-        self.tab_senha.history_menu.configure(values=self.password_history)
+        self.password_history.add(password)
+        self._refresh_history_menu()
         self.tab_senha.history_menu.set("Histórico")
+        # Grava em segundo plano; gravações seguidas substituem as anteriores
+        self.tasks.submit("historico", self.password_history.save)
+
+    def _refresh_history_menu(self):
+        """Envia ao menu apenas as senhas visíveis, e só quando elas mudaram."""
+        window = self.password_history.window()
+        if window != self._history_window:
+            self.tab_senha.history_menu.configure(values=window)
+            self._history_window = window
 
     def on_history_select(self, choice):
         """Lida com a seleção de uma senha do histórico."""
@@ -308,11 +440,9 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         self.tab_senha.status_frame.configure(fg_color="orange")
         self.tab_senha.status_label.configure(text="Verificando...")
 
-        def run_check():
-            result = check_pwned(choice)
-            self.after(0, lambda: self.update_pwned_status(result, choice))
-
-        threading.Thread(target=run_check, daemon=True).start()
+        # Rolar pelo histórico descarta as verificações anteriores ainda pendentes
+        self.tasks.submit(PWNED_HISTORY_KEY, check_pwned, choice,
+                          callback=lambda result: self.update_pwned_status(result, choice))
 
     def toggle_animation(self):
         """Ativa ou desativa a animação de fundo."""
@@ -331,11 +461,11 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
         if self.vars["modo_corporativo"].get():
             # Ativar modo corporativo
             self.animator.stop()
-            self.configure(bg="#1a1a1a") # Cinza escuro
+            styles.apply_theme("corporativo")
             self.animation_canvas.place_forget() # Esconde o canvas
         else:
             # Desativar modo corporativo (voltar ao normal)
-            self.configure(bg="black")
+            styles.apply_theme("normal")
             self.animation_canvas.place(relwidth=1, relheight=1)
             if self.vars["animacao_ativa"].get():
                 self.animator.start()
@@ -343,9 +473,15 @@ class UnimedPasswordGeneratorApp(customtkinter.CTk):
     def on_closing(self):
         """Salva as configurações ao fechar a aplicação."""
         current_settings = {
-            key: var.get() for key, var in self.vars.items() if key != "senha_gerada" and key != "frase_gerada"
+            setting_key(key): var.get() for key, var in self.vars.items() if key not in TRANSIENT_VARS
         }
+        # Grava imediatamente o que ainda estiver pendente
         self.settings_manager.save_settings(current_settings)
+        self.tasks.shutdown()
+        self.clipboard.shutdown()
+        self.watchdog.stop()
+        self.password_history.save()
+        self.issued_registry.close()
         self.destroy()
 
     def handle_focus_in(self, event):
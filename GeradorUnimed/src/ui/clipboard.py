@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo da Área de Transferência (UI)
+
+Este arquivo define o serviço de área de transferência da aplicação.
+Com uma janela Tk, usa o clipboard nativo do Tk (sem subprocessos, ao
+contrário do pyperclip, que no Linux executa xclip/xsel a cada cópia).
+Sem janela (modo headless), recorre ao pyperclip em uma thread de fundo.
+
+O serviço guarda apenas o hash do texto copiado. A limpeza automática
+usa esse hash para saber se o conteúdo ainda é o que a aplicação copiou,
+sem precisar ler o clipboard de volta no X11.
+"""
+
+import hashlib
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+import pyperclip
+
+
+def content_hash(text):
+    """Identifica um conteúdo copiado sem guardar o texto."""
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class ClipboardService:
+    """Copia textos sensíveis e os limpa depois, apenas se ainda forem da aplicação."""
+
+    def __init__(self, root=None):
+        self.root = root
+        self._owned = None # Hash do último texto copiado por nós
+        self._worker = None if root is not None else ThreadPoolExecutor(max_workers=1, thread_name_prefix="unimed-clipboard")
+
+    def copy(self, text):
+        """Copia `text` e retorna o token (hash) usado para limpá-lo depois."""
+        token = content_hash(text)
+        self._owned = token
+        if self.root is not None:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(text)
+        else:
+            self._worker.submit(pyperclip.copy, text)
+        return token
+
+    def clear_if_owned(self, token):
+        """
+        Limpa o clipboard se ele ainda contiver o texto do `token`.
+
+        Retorna False quando outra cópia (nossa ou de outro programa)
+        tomou o lugar do texto; nesse caso nada é alterado.
+        """
+        if token != self._owned:
+            return False # Copiamos outra coisa depois; o temporário antigo não vale mais
+        self._owned = None
+        if self.root is None:
+            self._worker.submit(self._clear_headless, token)
+            return True
+        if not self._still_holds(token):
+            return False
+        self.root.clipboard_clear()
+        return True
+
+    def _still_holds(self, token):
+        """Confere se o clipboard ainda tem o nosso texto."""
+        try:
+            if self.root.tk.call("tk", "windowingsystem") == "x11":
+                # No X11 o Tk é o dono da seleção CLIPBOARD até outro programa copiar algo
+                return self.root.selection_own_get(selection="CLIPBOARD") is not None
+            # No Windows/macOS não há aviso de perda de posse; a leitura é nativa (sem subprocesso)
+            return content_hash(self.root.clipboard_get()) == token
+        except (tk.TclError, KeyError):
+            return False
+
+    def _clear_headless(self, token):
+        try:
+            if content_hash(pyperclip.paste()) == token:
+                pyperclip.copy("")
+        except pyperclip.PyperclipException:
+            pass
+
+    def shutdown(self):
+        if self._worker is not None:
+            self._worker.shutdown(wait=False)
@@ -9,11 +9,15 @@ como as abas de geração de senha e frase-senha.
 import tkinter as tk
 import customtkinter
 from tkinter import scrolledtext
-import os
 
 from src.config import CONFIG
+from src.metrics import metrics
+from src.resources import assets
+from src.ui.styles import styles
 from src.ui.utils import Tooltip
 
+WORDLIST_LOAD_SECONDS = metrics.histogram("carregamento_wordlist_segundos", "Tempo para carregar e exibir uma lista de palavras.")
+
 # 5. CLASSES DE INTERFACE (COMPONENTES DA UI)
 # Cada classe representa uma parte da UI, tornando o código mais limpo.
 
@@ -39,35 +43,35 @@ class AdvancedPasswordOptionsWindow(customtkinter.CTkToplevel):
         opcoes_frame = customtkinter.CTkFrame(main_frame)
         opcoes_frame.pack(fill="x", pady=8, expand=True)
 
-        self.comprimento_label = customtkinter.CTkLabel(opcoes_frame, text=f"Comprimento: {self.app.vars['comprimento_var'].get()}", font=customtkinter.CTkFont(size=14))
+        self.comprimento_label = customtkinter.CTkLabel(opcoes_frame, text=f"Comprimento: {self.app.vars['comprimento_var'].get()}", font=styles.font("CORPO"))
         self.comprimento_label.pack(anchor="w", padx=8, pady=(8,0))
 
         customtkinter.CTkSlider(opcoes_frame, from_=8, to=64, variable=self.app.vars['comprimento_var'], command=lambda v: self.comprimento_label.configure(text=f"Comprimento: {int(v)}")).pack(fill="x", pady=(0, 8), padx=8)
 
-        customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Letras Maiúsculas (A-Z)", variable=self.app.vars['incluir_maiusculas'], font=customtkinter.CTkFont(size=14)).pack(anchor="w", pady=4, padx=8)
-        customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Letras Minúsculas (a-z)", variable=self.app.vars['incluir_minusculas'], font=customtkinter.CTkFont(size=14)).pack(anchor="w", pady=4, padx=8)
-        customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Números (0-9)", variable=self.app.vars['incluir_numeros'], font=customtkinter.CTkFont(size=14)).pack(anchor="w", pady=4, padx=8)
+        customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Letras Maiúsculas (A-Z)", variable=self.app.vars['incluir_maiusculas'], font=styles.font("CORPO")).pack(anchor="w", pady=4, padx=8)
+        customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Letras Minúsculas (a-z)", variable=self.app.vars['incluir_minusculas'], font=styles.font("CORPO")).pack(anchor="w", pady=4, padx=8)
+        customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Números (0-9)", variable=self.app.vars['incluir_numeros'], font=styles.font("CORPO")).pack(anchor="w", pady=4, padx=8)
 
-        especiais_check = customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Caracteres Especiais", variable=self.app.vars['incluir_especiais'], font=customtkinter.CTkFont(size=14))
+        especiais_check = customtkinter.CTkCheckBox(opcoes_frame, text="Incluir Caracteres Especiais", variable=self.app.vars['incluir_especiais'], font=styles.font("CORPO"))
         especiais_check.pack(anchor="w", pady=4, padx=8)
 
         especiais_frame = customtkinter.CTkFrame(opcoes_frame, fg_color="transparent")
         especiais_frame.pack(fill="x", padx=(24,8))
-        customtkinter.CTkEntry(especiais_frame, textvariable=self.app.vars['caracteres_especiais_var'], font=customtkinter.CTkFont(size=14)).pack(fill="x")
+        customtkinter.CTkEntry(especiais_frame, textvariable=self.app.vars['caracteres_especiais_var'], font=styles.font("CORPO")).pack(fill="x")
 
-        cb_ambiguos = customtkinter.CTkCheckBox(opcoes_frame, text="Excluir Caracteres Ambíguos", variable=self.app.vars['excluir_ambiguos'], font=customtkinter.CTkFont(size=14))
+        cb_ambiguos = customtkinter.CTkCheckBox(opcoes_frame, text="Excluir Caracteres Ambíguos", variable=self.app.vars['excluir_ambiguos'], font=styles.font("CORPO"))
         cb_ambiguos.pack(anchor="w", pady=(8,4), padx=8)
         Tooltip(cb_ambiguos, "Exclui caracteres que podem ser confundidos visualmente:\n'I', 'l', '1', 'O', '0', 'o'")
 
         # --- Checkbox de Animação ---
-        customtkinter.CTkCheckBox(opcoes_frame, text="Ativar animação de fundo", variable=self.app.vars["animacao_ativa"], command=self.app.toggle_animation, font=customtkinter.CTkFont(size=14)).pack(anchor="w", pady=4, padx=8)
+        customtkinter.CTkCheckBox(opcoes_frame, text="Ativar animação de fundo", variable=self.app.vars["animacao_ativa"], command=self.app.toggle_animation, font=styles.font("CORPO")).pack(anchor="w", pady=4, padx=8)
 
         # --- Checkbox de Modo Corporativo ---
-        customtkinter.CTkCheckBox(opcoes_frame, text="Modo Corporativo (Limpo)", variable=self.app.vars["modo_corporativo"], command=self.app.toggle_corporate_mode, font=customtkinter.CTkFont(size=14)).pack(anchor="w", pady=4, padx=8)
+        customtkinter.CTkCheckBox(opcoes_frame, text="Modo Corporativo (Limpo)", variable=self.app.vars["modo_corporativo"], command=self.app.toggle_corporate_mode, font=styles.font("CORPO")).pack(anchor="w", pady=4, padx=8)
 
         # --- Botão de Fechar ---
         unimed_color = CONFIG["CORES"]["VERDE_UNIMED"]
-        close_button = customtkinter.CTkButton(main_frame, text="Fechar", command=self.destroy, fg_color=unimed_color, hover_color=unimed_color, font=customtkinter.CTkFont(size=14))
+        close_button = customtkinter.CTkButton(main_frame, text="Fechar", command=self.destroy, fg_color=unimed_color, hover_color=unimed_color, font=styles.font("CORPO"))
         close_button.pack(pady=(8,0), side="bottom")
 
 
@@ -91,7 +95,7 @@ class PasswordTab(customtkinter.CTkFrame):
         self.senha_entry = customtkinter.CTkEntry(
             self,
             textvariable=self.app.vars["senha_gerada"],
-            font=customtkinter.CTkFont(size=16), # Fonte maior para destaque
+            font=styles.font("SENHA"), # Fonte maior para destaque
             justify="center",
             height=45
         )
@@ -111,7 +115,7 @@ class PasswordTab(customtkinter.CTkFrame):
             text="🔄 Gerar Senha",
             command=self.generate_password,
             height=40,
-            font=customtkinter.CTkFont(size=14, weight="bold"),
+            font=styles.font("CORPO_NEGRITO"),
             fg_color=unimed_green
         )
         self.gerar_senha_btn.grid(row=0, column=0, sticky="ew", padx=(0, 5))
@@ -122,7 +126,7 @@ class PasswordTab(customtkinter.CTkFrame):
             text="📋 Copiar",
             command=lambda: self.app.copy_to_clipboard(self.app.vars["senha_gerada"].get(), self.copiar_btn),
             height=40,
-            font=customtkinter.CTkFont(size=14)
+            font=styles.font("CORPO")
         )
         self.copiar_btn.grid(row=0, column=1, sticky="ew", padx=5)
 
@@ -132,7 +136,7 @@ class PasswordTab(customtkinter.CTkFrame):
             text="Opções",
             command=self.app.open_advanced_options,
             height=40,
-            font=customtkinter.CTkFont(size=14)
+            font=styles.font("CORPO")
         )
         self.options_btn.grid(row=0, column=2, sticky="ew", padx=(5, 0))
 
@@ -141,7 +145,7 @@ class PasswordTab(customtkinter.CTkFrame):
         self.status_frame = customtkinter.CTkFrame(self, fg_color="transparent", corner_radius=6, height=30)
         self.status_frame.grid(row=2, column=0, sticky="ew", pady=10)
         self.status_frame.pack_propagate(False)
-        self.status_label = customtkinter.CTkLabel(self.status_frame, text="", font=customtkinter.CTkFont(weight="bold", size=14))
+        self.status_label = customtkinter.CTkLabel(self.status_frame, text="", font=styles.font("CORPO_NEGRITO"))
         self.status_label.pack(expand=True, fill="both")
 
         # Combobox de Histórico
@@ -151,7 +155,7 @@ class PasswordTab(customtkinter.CTkFrame):
             state="readonly",
             command=self.app.on_history_select,
             height=40,
-            font=customtkinter.CTkFont(size=14)
+            font=styles.font("CORPO")
         )
         self.history_menu.set("Histórico de Senhas")
         self.history_menu.grid(row=3, column=0, sticky="ew", pady=(5, 10))
@@ -170,7 +174,7 @@ class PassphraseTab(customtkinter.CTkFrame):
     def __init__(self, parent, app_controller):
         super().__init__(parent, fg_color="transparent")
         self.app = app_controller
-        self.wordlists = {} # Mapeia nome amigável para caminho do arquivo
+        self.wordlists = {} # Mapeia nome amigável para o recurso da lista
         self.full_wordlist_content = []
         self.pack(fill="both", expand=True)
 
@@ -179,24 +183,11 @@ class PassphraseTab(customtkinter.CTkFrame):
         self.on_wordlist_select() # Garante estado inicial correto
 
     def _load_wordlist_options(self):
-        """Carrega as opções de wordlist do diretório de assets."""
+        """Carrega as opções de wordlist do manifesto de recursos (sem abrir os arquivos)."""
         self.wordlists.clear()
-        # Mapeamento de nome de arquivo para nome de exibição amigável
-        friendly_names = {
-            "portugues_basico.txt": "Português (Básico)",
-            "ingles_basico.txt": "Inglês (Básico)",
-            "animais_pt_br.txt": "Animais (PT-BR)"
-        }
         try:
-            script_dir = os.path.dirname(__file__)
-            wordlists_path = os.path.abspath(os.path.join(script_dir, '..', 'assets', 'wordlists'))
-
-            if os.path.exists(wordlists_path):
-                for filename in os.listdir(wordlists_path):
-                    if filename.endswith(".txt"):
-                        display_name = friendly_names.get(filename, filename)
-                        self.wordlists[display_name] = os.path.join(wordlists_path, filename)
-        except Exception as e:
+            self.wordlists.update(assets.wordlists())
+        except (OSError, ValueError) as e:
             # Em caso de erro, não quebra a aplicação
             print(f"Erro ao carregar as wordlists: {e}")
 
@@ -208,14 +199,14 @@ class PassphraseTab(customtkinter.CTkFrame):
         resultado_frame = customtkinter.CTkFrame(self, fg_color="transparent")
         resultado_frame.pack(fill="x", pady=(0, 16))
 
-        self.frase_entry = customtkinter.CTkEntry(resultado_frame, textvariable=self.app.vars["frase_gerada"], font=customtkinter.CTkFont(size=14), justify="center")
+        self.frase_entry = customtkinter.CTkEntry(resultado_frame, textvariable=self.app.vars["frase_gerada"], font=styles.font("CORPO"), justify="center")
         self.frase_entry.pack(side="left", fill="x", expand=True, ipady=5)
 
         unimed_color = CONFIG["CORES"]["VERDE_UNIMED"]
-        self.copiar_btn = customtkinter.CTkButton(resultado_frame, text="Copiar", command=lambda: self.app.copy_to_clipboard(self.app.vars["frase_gerada"].get(), self.copiar_btn), cursor="hand2", fg_color=unimed_color, hover_color=unimed_color, font=customtkinter.CTkFont(size=14))
+        self.copiar_btn = customtkinter.CTkButton(resultado_frame, text="Copiar", command=lambda: self.app.copy_to_clipboard(self.app.vars["frase_gerada"].get(), self.copiar_btn), cursor="hand2", fg_color=unimed_color, hover_color=unimed_color, font=styles.font("CORPO"))
         self.copiar_btn.pack(side="right", padx=(8, 0))
 
-        self.entropy_label = customtkinter.CTkLabel(self, text="Entropia: 0 bits", anchor="center", font=customtkinter.CTkFont(size=14))
+        self.entropy_label = customtkinter.CTkLabel(self, text="Entropia: 0 bits", anchor="center", font=styles.font("CORPO"))
         self.entropy_label.pack(fill="x", pady=(0, 16))
 
         # --- Frame de Opções ---
@@ -225,19 +216,19 @@ class PassphraseTab(customtkinter.CTkFrame):
         # --- Linha 1: Fonte das Palavras ---
         selecao_lista_frame = customtkinter.CTkFrame(opcoes_frame, fg_color="transparent")
         selecao_lista_frame.pack(fill="x", pady=8, padx=8)
-        customtkinter.CTkLabel(selecao_lista_frame, text="Fonte das Palavras:", font=customtkinter.CTkFont(size=14)).pack(side="left")
-        self.wordlist_combo = customtkinter.CTkComboBox(selecao_lista_frame, variable=self.app.vars['lista_palavras_selecionada_var'], values=list(self.wordlists.keys()), state="readonly", command=self.on_wordlist_select, font=customtkinter.CTkFont(size=14))
+        customtkinter.CTkLabel(selecao_lista_frame, text="Fonte das Palavras:", font=styles.font("CORPO")).pack(side="left")
+        self.wordlist_combo = customtkinter.CTkComboBox(selecao_lista_frame, variable=self.app.vars['lista_palavras_selecionada_var'], values=list(self.wordlists.keys()), state="readonly", command=self.on_wordlist_select, font=styles.font("CORPO"))
         self.wordlist_combo.pack(side="right", fill="x", expand=True, padx=(8,0))
 
         # --- Linha 2: Número de Palavras e Separador ---
         config_line_frame = customtkinter.CTkFrame(opcoes_frame, fg_color="transparent")
         config_line_frame.pack(fill="x", pady=8, padx=8)
 
-        customtkinter.CTkLabel(config_line_frame, text="Nº de Palavras:", font=customtkinter.CTkFont(size=14)).pack(side="left")
-        customtkinter.CTkOptionMenu(config_line_frame, variable=self.app.vars['num_palavras_var'], values=[str(i) for i in range(3,11)], width=70, font=customtkinter.CTkFont(size=14)).pack(side="left", padx=(8,16))
+        customtkinter.CTkLabel(config_line_frame, text="Nº de Palavras:", font=styles.font("CORPO")).pack(side="left")
+        customtkinter.CTkOptionMenu(config_line_frame, variable=self.app.vars['num_palavras_var'], values=[str(i) for i in range(3,11)], width=70, font=styles.font("CORPO")).pack(side="left", padx=(8,16))
 
-        customtkinter.CTkLabel(config_line_frame, text="Separador:", font=customtkinter.CTkFont(size=14)).pack(side="left")
-        customtkinter.CTkEntry(config_line_frame, textvariable=self.app.vars['separador_var'], width=70, font=customtkinter.CTkFont(size=14)).pack(side="left", padx=(8,0))
+        customtkinter.CTkLabel(config_line_frame, text="Separador:", font=styles.font("CORPO")).pack(side="left")
+        customtkinter.CTkEntry(config_line_frame, textvariable=self.app.vars['separador_var'], width=70, font=styles.font("CORPO")).pack(side="left", padx=(8,0))
 
         # --- Área de Texto para Lista de Palavras ---
         self.wordlist_text = scrolledtext.ScrolledText(opcoes_frame, height=8, wrap=tk.WORD, font=("", 14), relief="solid", borderwidth=1)
@@ -245,7 +236,7 @@ class PassphraseTab(customtkinter.CTkFrame):
 
         # --- Botão de Gerar ---
         unimed_color = CONFIG["CORES"]["VERDE_UNIMED"]
-        self.gerar_frase_btn = customtkinter.CTkButton(self, text="GERAR NOVA FRASE", command=self.generate_passphrase, cursor="hand2", height=40, font=customtkinter.CTkFont(size=14, weight="bold"), fg_color=unimed_color, hover_color=unimed_color)
+        self.gerar_frase_btn = customtkinter.CTkButton(self, text="GERAR NOVA FRASE", command=self.generate_passphrase, cursor="hand2", height=40, font=styles.font("CORPO_NEGRITO"), fg_color=unimed_color, hover_color=unimed_color)
         self.gerar_frase_btn.pack(fill="x", ipady=5, pady=(16, 0))
 
     def generate_passphrase(self):
@@ -256,29 +247,29 @@ class PassphraseTab(customtkinter.CTkFrame):
             final_callback=self.app.finalize_passphrase_generation
         )
 
+    @WORDLIST_LOAD_SECONDS.timed
     def on_wordlist_select(self, event=None):
         """Lida com a seleção de uma nova wordlist, carregando-a do arquivo."""
         selection = self.app.vars['lista_palavras_selecionada_var'].get()
-        filepath = self.wordlists.get(selection)
+        resource = self.wordlists.get(selection)
 
         self.wordlist_text.config(state="normal")
         self.wordlist_text.delete("1.0", tk.END)
         self.full_wordlist_content = []
 
-        if filepath:
+        if resource:
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.full_wordlist_content = content.split()
-
-                    # Exibe apenas as primeiras 100 linhas para performance
-                    preview_lines = content.splitlines()[:100]
-                    preview_text = "\n".join(preview_lines)
-                    if len(content.splitlines()) > 100:
-                        preview_text += "\n\n... (lista completa carregada na memória)"
-
-                    self.wordlist_text.insert("1.0", preview_text)
-            except Exception as e:
+                content = assets.read_text(resource)
+                self.full_wordlist_content = content.split()
+
+                # Exibe apenas as primeiras 100 linhas para performance
+                lines = content.splitlines()
+                preview_text = "\n".join(lines[:100])
+                if len(lines) > 100:
+                    preview_text += f"\n\n... ({assets.info(resource)['palavras']} palavras carregadas na memória)"
+
+                self.wordlist_text.insert("1.0", preview_text)
+            except (OSError, ValueError) as e:
                 self.wordlist_text.insert("1.0", f"Erro ao ler o arquivo:\n{e}")
         else:
             pass
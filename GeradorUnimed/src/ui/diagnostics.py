@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo do Painel de Diagnóstico (UI)
+
+Este arquivo define a janela oculta de diagnóstico, aberta com
+Ctrl+Shift+D. Ela liga a coleta de métricas (veja `src.metrics`), mostra
+contadores e tempos atualizados a cada segundo e exporta os dados em JSON
+ou no formato de texto do Prometheus para o diretório do usuário.
+"""
+
+import os
+
+import customtkinter
+
+from src.config import CONFIG
+from src.logic import user_config_dir
+from src.metrics import metrics
+from src.ui.styles import styles
+
+REFRESH_MS = 1000
+
+
+def report_lines(registry):
+    """Resumo legível das métricas: contadores, taxa de acerto do cache e tempos (ms)."""
+    lines = []
+    histograms = [m for m in registry if m.kind == "histogram"]
+    counters = {m.name: m.value for m in registry if m.kind == "counter"}
+
+    lines.append(f"{'TEMPOS (ms)':<32} {'amostras':>8} {'média':>8} {'p50':>8} {'p95':>8}")
+    for h in histograms:
+        if not h.count:
+            lines.append(f"{h.name:<32} {0:>8}")
+            continue
+        p50, p95 = (h.quantile(q) * 1000 for q in (0.5, 0.95))
+        lines.append(f"{h.name:<32} {h.count:>8} {h.sum / h.count * 1000:>8.2f} {p50:>8.1f} {p95:>8.1f}")
+
+    lines.append("")
+    lines.append("CONTADORES")
+    for name, value in counters.items():
+        lines.append(f"{name:<32} {value:>8}")
+    lookups = counters.get("pwned_cache_consultas_total", 0)
+    if lookups:
+        hits = lookups - counters.get("pwned_cache_falhas_total", 0)
+        lines.append(f"{'acertos do cache Pwned':<32} {hits / lookups:>8.0%}")
+    return lines
+
+
+class DiagnosticsWindow(customtkinter.CTkToplevel):
+    """Janela com as métricas da aplicação, atualizada periodicamente."""
+    def __init__(self, parent, registry=metrics):
+        super().__init__(parent)
+        self.registry = registry
+        self.registry.enable() # A coleta começa ao abrir o painel
+        self.refresh_id = None
+
+        self.title("Diagnóstico")
+        self.geometry("620x420")
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        self.report_text = customtkinter.CTkTextbox(self, font=styles.font("EDITOR"), wrap="none")
+        self.report_text.pack(fill="both", expand=True, padx=8, pady=(8, 4))
+
+        buttons_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        buttons_frame.pack(fill="x", padx=8, pady=(4, 8))
+        unimed_color = CONFIG["CORES"]["VERDE_UNIMED"]
+        for text, command in (("Exportar JSON", lambda: self.export("metricas.json")),
+                              ("Exportar Prometheus", lambda: self.export("metricas.prom")),
+                              ("Zerar", self.registry.reset)):
+            customtkinter.CTkButton(buttons_frame, text=text, command=command, fg_color=unimed_color,
+                                    hover_color=unimed_color, font=styles.font("CORPO")).pack(side="left", padx=(0, 8))
+
+        self.status_label = customtkinter.CTkLabel(self, text="", anchor="w", font=styles.font("EDITOR"))
+        self.status_label.pack(fill="x", padx=8, pady=(0, 8))
+
+    def refresh(self):
+        """Atualiza o relatório enquanto a janela existir."""
+        self.report_text.configure(state="normal")
+        self.report_text.delete("1.0", "end")
+        self.report_text.insert("1.0", "\n".join(report_lines(self.registry)))
+        self.report_text.configure(state="disabled")
+        self.refresh_id = self.after(REFRESH_MS, self.refresh)
+
+    def export(self, filename):
+        path = os.path.join(user_config_dir(), filename)
+        try:
+            self.registry.export(path)
+            self.status_label.configure(text=f"Exportado para {path}")
+        except OSError as e:
+            self.status_label.configure(text=f"Erro ao exportar: {e}")
+
+    def destroy(self):
+        if self.refresh_id is not None:
+            self.after_cancel(self.refresh_id)
+            self.refresh_id = None
+        super().destroy()
@@ -6,13 +6,15 @@ Este módulo fornece uma interface para edição rápida de imagens/capturas de
 permitindo anotações, destaques e ofuscação antes do compartilhamento.
 """
 
-import math
 import tkinter as tk
 import customtkinter as ctk
-from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageColor, ImageEnhance
-import textwrap
+from PIL import Image, ImageTk, ImageDraw
 
 from src.config import CONFIG
+from src.fonts import font_manager
+from src.imaging import Viewport
+from src.ui.styles import styles
+from src.ui.utils import DragPreview
 
 class ScreenshotEditor(ctk.CTkToplevel):
     """
@@ -34,19 +36,26 @@ class ScreenshotEditor(ctk.CTkToplevel):
 
         # Callbacks e Estado
         self.on_save_callback = on_save_callback
-        self.original_image = image.convert("RGBA") # Mantém original para reset se necessário
-        self.current_image = self.original_image.copy()
-        self.display_image = None # Imagem redimensionada para o canvas (se implementado zoom/fit)
+        self.original_image = image # Nunca é modificada; as edições viram operações
+        # Zoom/pan sobre a original: a exibição usa uma prévia do tamanho da janela
+        self.viewport = Viewport(image, 1100, 600)
+        self.display_image = None # Prévia exibida no canvas
+        self.canvas_image_id = None
+        self.pan_start = None
+        self.refresh_job = None
 
         self.current_tool = self.TOOL_NONE
         self.start_x = None
         self.start_y = None
-        self.current_rect_id = None
 
         # Opções de Texto
         self.text_contrast_bg = tk.BooleanVar(value=True) # Checkbox "Fundo de Contraste"
         self.active_text_widget = None # Widget de texto flutuante atual
         self.active_text_frame = None
+        self.active_text_item = None
+
+        # Indexa e pré-carrega as fontes em segundo plano (primeiro texto sem pausa)
+        font_manager.start_discovery()
 
         self._setup_ui()
         self._refresh_canvas()
@@ -65,6 +74,18 @@ class ScreenshotEditor(ctk.CTkToplevel):
         self.canvas.bind("<ButtonPress-1>", self.on_canvas_click)
         self.canvas.bind("<B1-Motion>", self.on_canvas_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_canvas_release)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+
+        # Zoom (roda do mouse) e pan (arrastar com o botão do meio/direito)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+        for button in (2, 3):
+            self.canvas.bind(f"<ButtonPress-{button}>", self.on_pan_start)
+            self.canvas.bind(f"<B{button}-Motion>", self.on_pan_drag)
+
+        # Pré-visualização das ferramentas de arraste
+        self.preview = DragPreview(self.canvas)
 
         # 2. Barra Superior (Opções da Ferramenta)
         self.top_bar = ctk.CTkFrame(self, height=40, fg_color="#1a1a1a")
@@ -75,7 +96,7 @@ class ScreenshotEditor(ctk.CTkToplevel):
             self.top_bar,
             text="Fundo de Contraste",
             variable=self.text_contrast_bg,
-            font=ctk.CTkFont(size=12)
+            font=styles.font("EDITOR")
         )
         self.chk_contrast.pack(side="right", padx=20, pady=10)
 
@@ -116,7 +137,7 @@ class ScreenshotEditor(ctk.CTkToplevel):
                 fg_color="transparent",
                 border_width=1,
                 border_color="#444444",
-                font=ctk.CTkFont(size=12, weight="bold")
+                font=styles.font("EDITOR_NEGRITO")
             )
             btn.pack(side="left", padx=5)
             self.buttons[tool_id] = btn
@@ -129,7 +150,7 @@ class ScreenshotEditor(ctk.CTkToplevel):
             width=110,
             height=40,
             fg_color=CONFIG["CORES"].get("VERDE_UNIMED", "#00995D"),
-            font=ctk.CTkFont(size=12, weight="bold")
+            font=styles.font("EDITOR_NEGRITO")
         )
         save_btn.pack(side="left", padx=20)
 
@@ -145,12 +166,41 @@ class ScreenshotEditor(ctk.CTkToplevel):
                 btn.configure(fg_color="transparent", border_color="#444444")
 
     def _refresh_canvas(self):
-        """Atualiza a imagem exibida no Canvas."""
-        self.tk_image = ImageTk.PhotoImage(self.current_image)
-        # Ajusta tamanho do canvas se necessário
-        self.canvas.config(width=self.current_image.width, height=self.current_image.height)
-        self.canvas.delete("all")
-        self.canvas.create_image(0, 0, image=self.tk_image, anchor="nw")
+        """Atualiza a prévia exibida no Canvas (tamanho da janela, não da imagem)."""
+        self.refresh_job = None
+        self.display_image = self.viewport.render()
+        self.tk_image = ImageTk.PhotoImage(self.display_image)
+        x, y = self.viewport.origin
+        if self.canvas_image_id is None:
+            self.canvas_image_id = self.canvas.create_image(x, y, image=self.tk_image, anchor="nw")
+        else:
+            self.canvas.itemconfig(self.canvas_image_id, image=self.tk_image)
+            self.canvas.coords(self.canvas_image_id, x, y)
+
+    def _schedule_refresh(self):
+        """Agrupa redesenhos de zoom/pan/redimensionamento em um por quadro."""
+        if self.refresh_job is None:
+            self.refresh_job = self.after(16, self._refresh_canvas)
+
+    # --- Zoom e Pan ---
+
+    def on_canvas_resize(self, event):
+        self.viewport.resize(event.width, event.height)
+        self._schedule_refresh()
+
+    def on_mouse_wheel(self, event):
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.viewport.zoom_at(1.25 if zoom_in else 0.8, event.x, event.y)
+        self._schedule_refresh()
+
+    def on_pan_start(self, event):
+        self.pan_start = (event.x, event.y)
+
+    def on_pan_drag(self, event):
+        if self.pan_start is None: return
+        self.viewport.pan(event.x - self.pan_start[0], event.y - self.pan_start[1])
+        self.pan_start = (event.x, event.y)
+        self._schedule_refresh()
 
     # --- Eventos do Canvas ---
 
@@ -166,138 +216,70 @@ class ScreenshotEditor(ctk.CTkToplevel):
         if self.current_tool == self.TOOL_TEXT:
             self.create_floating_text_input(event.x, event.y)
 
-    def on_canvas_drag(self, event):
-        cur_x = self.canvas.canvasx(event.x)
-        cur_y = self.canvas.canvasy(event.y)
-
-        if self.current_tool in [self.TOOL_RECTANGLE, self.TOOL_CROP, self.TOOL_SPOTLIGHT]:
-            if self.current_rect_id:
-                self.canvas.delete(self.current_rect_id)
-
+        elif self.current_tool in [self.TOOL_RECTANGLE, self.TOOL_CROP, self.TOOL_SPOTLIGHT]:
             outline = "red" if self.current_tool == self.TOOL_RECTANGLE else "yellow"
             if self.current_tool == self.TOOL_SPOTLIGHT: outline = "white"
-
-            self.current_rect_id = self.canvas.create_rectangle(
-                self.start_x, self.start_y, cur_x, cur_y,
-                outline=outline, width=2, dash=(4, 4) if self.current_tool == self.TOOL_CROP else None
-            )
+            options = {"outline": outline, "width": 2}
+            if self.current_tool == self.TOOL_CROP:
+                options["dash"] = (4, 4)
+            self.preview.begin("rectangle", self.start_x, self.start_y, **options)
 
         elif self.current_tool == self.TOOL_ARROW:
-            if self.current_rect_id:
-                self.canvas.delete(self.current_rect_id)
-            self.current_rect_id = self.canvas.create_line(
-                self.start_x, self.start_y, cur_x, cur_y,
-                arrow=tk.LAST, fill="red", width=3
-            )
+            self.preview.begin("line", self.start_x, self.start_y, arrow=tk.LAST, fill="red", width=3)
+
+    def on_canvas_drag(self, event):
+        # O preview agrupa os eventos e move um único item por quadro
+        self.preview.update(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
 
     def on_canvas_release(self, event):
-        if not self.start_x or not self.start_y: return
+        # Limpa o preview do canvas
+        self.preview.end()
+
+        if self.start_x is None or self.start_y is None: return
 
         end_x = self.canvas.canvasx(event.x)
         end_y = self.canvas.canvasy(event.y)
 
+        # Converte a seleção do canvas para coordenadas da imagem original
+        x1, y1 = self.viewport.to_image(self.start_x, self.start_y)
+        x2, y2 = self.viewport.to_image(end_x, end_y)
+
         if self.current_tool == self.TOOL_SPOTLIGHT:
-            self.apply_spotlight(self.start_x, self.start_y, end_x, end_y)
+            self.apply_spotlight(x1, y1, x2, y2)
 
         elif self.current_tool == self.TOOL_RECTANGLE:
-            self.apply_rectangle(self.start_x, self.start_y, end_x, end_y)
+            self.apply_rectangle(x1, y1, x2, y2)
 
         elif self.current_tool == self.TOOL_ARROW:
-            self.apply_arrow(self.start_x, self.start_y, end_x, end_y)
+            self.apply_arrow(x1, y1, x2, y2)
 
         elif self.current_tool == self.TOOL_CROP:
-            self.apply_crop(self.start_x, self.start_y, end_x, end_y)
-
-        # Limpa o preview do canvas
-        if self.current_rect_id:
-            self.canvas.delete(self.current_rect_id)
-            self.current_rect_id = None
+            self.apply_crop(x1, y1, x2, y2)
 
         self.start_x = None
         self.start_y = None
 
     # --- Lógica das Ferramentas ---
+    # As coordenadas estão no espaço da imagem original. Cada ferramenta só
+    # registra a operação; a resolução total é processada na exportação.
 
     def apply_spotlight(self, x1, y1, x2, y2):
         """Aplica o efeito de Holofote: escurece tudo menos a seleção."""
-        # Normaliza coordenadas
-        x1, x2 = sorted([x1, x2])
-        y1, y2 = sorted([y1, y2])
-
-        # Cria layer preta semi-transparente
-        overlay = Image.new('RGBA', self.current_image.size, (0, 0, 0, 150))
-
-        # "Recorta" a área selecionada (torna transparente no overlay)
-        draw = ImageDraw.Draw(overlay)
-        # Desenha retângulo transparente com modo 'clear' (Pillow não tem Clear mode direto em draw.rectangle facilmente sem mask)
-        # Melhor abordagem: Criar mascara.
-
-        mask = Image.new('L', self.current_image.size, 150) # 150 de opacidade
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.rectangle([x1, y1, x2, y2], fill=0) # 0 = totalmente transparente
-
-        # Cria a imagem preta sólida
-        black_layer = Image.new('RGBA', self.current_image.size, (0, 0, 0, 0))
-        black_draw = ImageDraw.Draw(black_layer)
-        black_draw.rectangle([0, 0, self.current_image.width, self.current_image.height], fill=(0,0,0))
-
-        # Aplica o alpha da máscara na layer preta
-        black_layer.putalpha(mask)
-
-        # Compoe sobre a imagem atual
-        self.current_image = Image.alpha_composite(self.current_image.convert("RGBA"), black_layer)
+        self.viewport.add_operation({"op": "spotlight", "coords": [x1, y1, x2, y2]})
         self._refresh_canvas()
 
     def apply_rectangle(self, x1, y1, x2, y2):
-        draw = ImageDraw.Draw(self.current_image)
-        draw.rectangle([x1, y1, x2, y2], outline="red", width=4)
+        self.viewport.add_operation({"op": "rectangle", "coords": [x1, y1, x2, y2]})
         self._refresh_canvas()
 
     def apply_crop(self, x1, y1, x2, y2):
         """Recorta a imagem para a área selecionada."""
-        # Ordena coordenadas
-        left = min(x1, x2)
-        top = min(y1, y2)
-        right = max(x1, x2)
-        bottom = max(y1, y2)
-
-        # Evita cortes de tamanho 0
-        if right - left < 5 or bottom - top < 5:
-            return
-
-        self.current_image = self.current_image.crop((left, top, right, bottom))
-        self._refresh_canvas()
+        if self.viewport.add_operation({"op": "crop", "coords": [x1, y1, x2, y2]}):
+            self._refresh_canvas()
 
     def apply_arrow(self, x1, y1, x2, y2):
         """Desenha uma seta com cabeça calculada geometricamente."""
-        draw = ImageDraw.Draw(self.current_image)
-
-        # Linha principal
-        draw.line([x1, y1, x2, y2], fill="red", width=4)
-
-        # Cálculo da cabeça da seta
-        angle = math.atan2(y2 - y1, x2 - x1)
-        arrow_length = 20
-        arrow_angle = math.pi / 6  # 30 graus
-
-        # Pontos da cabeça
-        # Ponto 1: (x2, y2) - já temos
-        # Ponto 2: (x2 - len*cos(angle - arrow_angle), y2 - len*sin(angle - arrow_angle))
-        # Ponto 3: (x2 - len*cos(angle + arrow_angle), y2 - len*sin(angle + arrow_angle))
-
-        p1 = (x2, y2)
-        p2 = (
-            x2 - arrow_length * math.cos(angle - arrow_angle),
-            y2 - arrow_length * math.sin(angle - arrow_angle)
-        )
-        p3 = (
-            x2 - arrow_length * math.cos(angle + arrow_angle),
-            y2 - arrow_length * math.sin(angle + arrow_angle)
-        )
-
-        # Desenha triângulo preenchido para a cabeça
-        draw.polygon([p1, p2, p3], fill="red")
-
+        self.viewport.add_operation({"op": "arrow", "coords": [x1, y1, x2, y2]})
         self._refresh_canvas()
 
     # --- Ferramenta de Texto (Refatorada) ---
@@ -305,7 +287,7 @@ class ScreenshotEditor(ctk.CTkToplevel):
     def create_floating_text_input(self, x, y):
         """Cria widget de texto flutuante sobre o canvas."""
         if self.active_text_frame:
-            self.active_text_frame.destroy()
+            self._close_text_input()
 
         # Container para o Text + Botão OK
         self.active_text_frame = ctk.CTkFrame(self.canvas, fg_color="transparent")
@@ -333,7 +315,15 @@ class ScreenshotEditor(ctk.CTkToplevel):
         btn_ok.pack(side="top", pady=2)
 
         # Posiciona no Canvas
-        self.canvas.create_window(x, y, window=self.active_text_frame, anchor="nw")
+        self.active_text_item = self.canvas.create_window(x, y, window=self.active_text_frame, anchor="nw")
+
+    def _close_text_input(self):
+        """Remove o widget de texto flutuante e seu item no canvas."""
+        self.canvas.delete(self.active_text_item)
+        self.active_text_frame.destroy()
+        self.active_text_frame = None
+        self.active_text_widget = None
+        self.active_text_item = None
 
     def finalize_text(self, x, y):
         """Desenha o texto na imagem e remove o widget."""
@@ -343,77 +333,24 @@ class ScreenshotEditor(ctk.CTkToplevel):
         if text_content:
             self.draw_text_on_image(x, y, text_content)
 
-        self.active_text_frame.destroy()
-        self.active_text_frame = None
-        self.active_text_widget = None
+        self._close_text_input()
         self._refresh_canvas()
 
     def draw_text_on_image(self, x, y, text):
-        draw = ImageDraw.Draw(self.current_image)
-
-        # Tenta carregar fonte, fallback para default
-        font_size = 24
-        font = None
-        try:
-            # Tenta fontes comuns no Linux/Windows
-            possible_fonts = ["arial.ttf", "LiberationSans-Regular.ttf", "DejaVuSans.ttf", "segoeui.ttf"]
-            for font_name in possible_fonts:
-                try:
-                    font = ImageFont.truetype(font_name, font_size)
-                    break
-                except IOError:
-                    continue
-
-            if not font:
-                 font = ImageFont.load_default()
-        except:
-            font = ImageFont.load_default()
-
-        # Calcular tamanho do texto (multiline)
-        lines = text.splitlines()
-
-        # Necessário calcular bbox manualmente para background
-        max_width = 0
-        total_height = 0
-        line_heights = []
-
-        # Simulação simples de bbox
-        dummy_draw = ImageDraw.Draw(Image.new("RGB", (1,1)))
-
-        for line in lines:
-            bbox = dummy_draw.textbbox((0, 0), line, font=font)
-            w = bbox[2] - bbox[0]
-            h = bbox[3] - bbox[1] + 5 # +5 padding
-            max_width = max(max_width, w)
-            line_heights.append(h)
-            total_height += h
-
-        # Padding
-        pad = 10
-
-        if self.text_contrast_bg.get():
-            # Desenha retângulo de fundo
-            bg_x1 = x
-            bg_y1 = y
-            bg_x2 = x + max_width + (pad * 2)
-            bg_y2 = y + total_height + (pad * 2)
-
-            draw.rectangle([bg_x1, bg_y1, bg_x2, bg_y2], fill="white", outline="black")
-            text_color = "black"
-        else:
-            # Sem fundo, usa cor de destaque
-            text_color = "red"
-            pad = 0
-
-        current_y = y + pad
-        for i, line in enumerate(lines):
-            draw.text((x + pad, current_y), line, fill=text_color, font=font)
-            current_y += line_heights[i]
+        """Registra o texto na posição do canvas (convertida para a imagem original)."""
+        image_x, image_y = self.viewport.to_image(x, y)
+        self.viewport.add_operation({
+            "op": "text",
+            "coords": [image_x, image_y],
+            "text": text,
+            "contrast_bg": bool(self.text_contrast_bg.get()),
+        })
 
     def save_and_close(self):
         """Salva a imagem e fecha."""
         if self.on_save_callback:
-            self.on_save_callback(self.current_image)
+            # Só aqui as edições são aplicadas em resolução total
+            self.on_save_callback(self.viewport.render_full())
         self.destroy()
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Estilos (UI)
+
+Este arquivo define o registro de estilos compartilhado pelos componentes.
+Cada CTkFont cria uma fonte nomeada no Tk e se registra para acompanhar o
+escalonamento da janela; criar uma por widget (e de novo a cada abertura
+da janela de opções) multiplica esse custo. O registro cria cada fonte uma
+única vez, na primeira vez em que é pedida, e a entrega a todos os widgets.
+
+As cores dependentes do tema também ficam aqui: os widgets registrados são
+recoloridos em uma única passada quando o tema muda (ex: modo corporativo).
+"""
+
+import weakref
+
+import customtkinter
+
+from src.config import CONFIG
+
+
+class StyleRegistry:
+    """Fontes e cores compartilhadas, criadas sob demanda e reaproveitadas."""
+
+    def __init__(self, font_specs=None, themes=None, theme="normal"):
+        self.font_specs = font_specs or CONFIG["FONTES_CTK"]
+        self.themes = themes or CONFIG["TEMAS"]
+        if theme not in self.themes:
+            raise ValueError(f"Tema desconhecido: {theme}")
+        self.theme = theme
+        self._fonts = {}
+        # widget -> {opção do configure: nome da cor no tema}; some com o widget
+        self._themed = weakref.WeakKeyDictionary()
+
+    def font(self, name):
+        """Retorna a fonte `name` (chave de FONTES_CTK), criando-a só na primeira vez."""
+        font = self._fonts.get(name)
+        if font is None:
+            font = self._fonts[name] = customtkinter.CTkFont(**self.font_specs[name])
+        return font
+
+    def color(self, name):
+        """Cor `name` no tema atual."""
+        return self.themes[self.theme][name]
+
+    def themed(self, widget, **options):
+        """
+        Aplica as cores do tema atual a `widget` e o registra para as trocas
+        de tema. `options` mapeia opções do configure para nomes de cores
+        (ex: themed(root, bg="JANELA_FUNDO")). Retorna o próprio widget.
+        """
+        self._themed[widget] = options
+        widget.configure(**{option: self.color(name) for option, name in options.items()})
+        return widget
+
+    def apply_theme(self, theme):
+        """Troca o tema e recolore todos os widgets registrados de uma vez."""
+        if theme not in self.themes:
+            raise ValueError(f"Tema desconhecido: {theme}")
+        if theme == self.theme:
+            return
+        self.theme = theme
+        for widget, options in list(self._themed.items()):
+            if not widget.winfo_exists():
+                del self._themed[widget] # Destruído no Tk, mas ainda referenciado no Python
+                continue
+            widget.configure(**{option: self.color(name) for option, name in options.items()})
+
+
+# Registro compartilhado por toda a aplicação
+styles = StyleRegistry()
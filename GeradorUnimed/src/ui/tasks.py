@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Tarefas em Segundo Plano (UI)
+
+Este arquivo define o executor de tarefas da aplicação: um pool pequeno
+e fixo de threads, com supersessão por chave (uma nova tarefa para o mesmo
+widget descarta a anterior) e entrega dos resultados à thread do Tk por
+uma única fila consultada com `after`.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Quantas latências recentes são mantidas para as métricas
+LATENCY_WINDOW = 256
+
+
+class TaskExecutor:
+    """Executa tarefas em um pool fixo e devolve os resultados na thread do Tk."""
+    POLL_INTERVAL_MS = 25
+
+    def __init__(self, root, max_workers=2, poll_interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="unimed-tarefa")
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._latest = {}   # chave -> token da tarefa mais recente
+        self._futures = {}  # chave -> future da tarefa mais recente
+        self._in_flight = 0
+        self._polling = False # Há um _drain agendado
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {"submitted": 0, "completed": 0, "superseded": 0, "cancelled": 0, "errors": 0}
+
+    def submit(self, key, func, *args, callback=None):
+        """
+        Agenda `func(*args)` no pool; `callback(resultado)` roda na thread do Tk.
+
+        Se `key` não for None, uma tarefa anterior com a mesma chave é
+        cancelada (se ainda não começou) ou tem seu resultado descartado.
+        Pode ser chamado de qualquer thread.
+        """
+        token = object()
+        with self._lock:
+            self._counters["submitted"] += 1
+            if key is not None:
+                previous = self._futures.pop(key, None)
+                if previous is not None and previous.cancel():
+                    self._counters["cancelled"] += 1
+                    self._in_flight -= 1
+                self._latest[key] = token
+            self._in_flight += 1
+            future = self._pool.submit(self._run, key, token, time.perf_counter(), func, args, callback)
+            if key is not None:
+                self._futures[key] = future
+        self._ensure_polling()
+        return future
+
+    def _is_current(self, key, token):
+        return key is None or self._latest.get(key) is token
+
+    def _run(self, key, token, submitted_at, func, args, callback):
+        """Executa a tarefa no pool e enfileira o resultado."""
+        if not self._is_current(key, token):
+            # Substituída antes de começar: nem executa
+            self._results.put((key, token, submitted_at, None, None, None))
+            return
+        try:
+            result, error = func(*args), None
+        except Exception as e:
+            result, error = None, e
+        self._results.put((key, token, submitted_at, callback, result, error))
+
+    def _ensure_polling(self):
+        """Agenda a leitura da fila (apenas enquanto houver tarefas em andamento)."""
+        with self._lock:
+            if self._polling:
+                return
+            self._polling = True
+        # `after` é chamado fora do lock; o Tk aceita agendamentos de outras threads. Nada é
+        # atribuído depois dele: o _drain agendado pode rodar antes de `after` retornar
+        self.root.after(self.poll_interval_ms, self._drain)
+
+    def _drain(self):
+        """Entrega na thread do Tk todos os resultados prontos."""
+        while True:
+            try:
+                key, token, submitted_at, callback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                self._in_flight -= 1
+                current = self._is_current(key, token)
+                if key is not None and current:
+                    self._futures.pop(key, None)
+                if not current:
+                    self._counters["superseded"] += 1
+                    continue
+                if error is not None:
+                    self._counters["errors"] += 1
+                    continue
+                self._counters["completed"] += 1
+                self._latencies.append(time.perf_counter() - submitted_at)
+
+            if callback:
+                callback(result)
+
+        with self._lock:
+            self._polling = False
+            pending = self._in_flight > 0
+        if pending:
+            self._ensure_polling()
+
+    def metrics(self):
+        """Retorna contadores, profundidade da fila e latência (envio -> callback) em ms."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            snapshot = dict(self._counters)
+            snapshot["in_flight"] = self._in_flight
+        snapshot["queue_depth"] = self._results.qsize()
+        if latencies:
+            snapshot["latency_ms"] = {
+                "avg": sum(latencies) / len(latencies) * 1000,
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+                "max": latencies[-1] * 1000,
+            }
+        else:
+            snapshot["latency_ms"] = {"avg": 0.0, "p95": 0.0, "max": 0.0}
+        return snapshot
+
+    def shutdown(self):
+        """Encerra o pool sem esperar tarefas pendentes (ex: ao fechar a janela)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -3,43 +3,194 @@
 Módulo de Utilitários da UI
 
 Este arquivo contém classes auxiliares que fornecem funcionalidades
-específicas para a interface, como tooltips e as animações de fundo.
+específicas para a interface, como tooltips, pré-visualização de arraste
+e as animações de fundo.
 """
 
 import math
 import random
+import string
 import tkinter as tk
 import customtkinter
 
 from src.config import CONFIG
+from src.metrics import metrics
+
+FRAME_SECONDS = metrics.histogram("quadro_animacao_segundos", "Tempo de um quadro da animação de fundo.")
 
 # 4. CLASSES DE UTILITÁRIOS (HELPERS)
 # Classes auxiliares para funcionalidades específicas da UI.
 
+class TooltipManager:
+    """
+    Janela de dica única, compartilhada por todos os Tooltips da aplicação.
+
+    A janela é criada no primeiro uso e depois apenas recebe o novo texto,
+    é reposicionada e mostrada/escondida. A dica só aparece após um atraso,
+    então passar o mouse rapidamente sobre um widget não mapeia janela alguma.
+    """
+    SHOW_DELAY_MS = 500
+    OFFSET = 25 # Distância da dica ao canto do widget
+
+    def __init__(self, delay_ms=SHOW_DELAY_MS):
+        self.delay_ms = delay_ms
+        self.window = None
+        self.label = None
+        self.current = None # Tooltip sob o mouse
+        self.after_id = None
+        self.windows_created = 0
+
+    def schedule(self, tooltip):
+        """Agenda a exibição da dica de `tooltip` (substituindo qualquer outra)."""
+        self._cancel_pending()
+        self.hide()
+        self.current = tooltip
+        self.after_id = tooltip.widget.after(self.delay_ms, self._show)
+
+    def cancel(self, tooltip):
+        """Esconde (ou desiste de mostrar) a dica de `tooltip`."""
+        if self.current is tooltip:
+            self._cancel_pending()
+            self.hide()
+            self.current = None
+
+    def _cancel_pending(self):
+        if self.after_id is not None and self.current is not None:
+            self.current.widget.after_cancel(self.after_id)
+        self.after_id = None
+
+    def _ensure_window(self, widget):
+        """Cria a janela na primeira exibição (ou se ela foi destruída com a raiz)."""
+        if self.window is None or not self.window.winfo_exists():
+            self.window = tk.Toplevel(widget.nametowidget("."))
+            self.window.wm_overrideredirect(True)
+            self.window.withdraw()
+            self.label = customtkinter.CTkLabel(self.window, text="", justify='left',
+                                                fg_color=CONFIG["CORES"]["TOOLTIP_FUNDO"], corner_radius=5)
+            self.label.pack(ipadx=1)
+            self.windows_created += 1
+        return self.window
+
+    def _show(self):
+        self.after_id = None
+        tooltip = self.current
+        if tooltip is None or not tooltip.widget.winfo_exists():
+            return
+        x = tooltip.widget.winfo_rootx() + self.OFFSET
+        y = tooltip.widget.winfo_rooty() + self.OFFSET
+        window = self._ensure_window(tooltip.widget)
+        self.label.configure(text=tooltip.text)
+        window.wm_geometry(f"+{x}+{y}")
+        window.deiconify()
+        window.lift()
+
+    def hide(self):
+        if self.window is not None:
+            self.window.withdraw()
+
+
+# Gerenciador compartilhado por toda a aplicação
+tooltip_manager = TooltipManager()
+
+
 class Tooltip:
     """Cria uma dica de ajuda (tooltip) para um widget."""
-    def __init__(self, widget, text):
+    def __init__(self, widget, text, manager=None):
         self.widget = widget
         self.text = text
-        self.tooltip_window = None
+        self.manager = manager or tooltip_manager
         widget.bind("<Enter>", self.show_tooltip)
         widget.bind("<Leave>", self.hide_tooltip)
+        widget.bind("<ButtonPress>", self.hide_tooltip)
+
+    def show_tooltip(self, event=None):
+        self.manager.schedule(self)
+
+    def hide_tooltip(self, event=None):
+        self.manager.cancel(self)
 
-    def show_tooltip(self, event):
-        x, y, _, _ = self.widget.bbox("insert")
-        x += self.widget.winfo_rootx() + 25
-        y += self.widget.winfo_rooty() + 25
-        self.tooltip_window = tk.Toplevel(self.widget)
-        self.tooltip_window.wm_overrideredirect(True)
-        self.tooltip_window.wm_geometry(f"+{x}+{y}")
-        label = customtkinter.CTkLabel(self.tooltip_window, text=self.text, justify='left',
-                         fg_color=CONFIG["CORES"]["TOOLTIP_FUNDO"], corner_radius=5)
-        label.pack(ipadx=1)
-
-    def hide_tooltip(self, event):
-        if self.tooltip_window:
-            self.tooltip_window.destroy()
-        self.tooltip_window = None
+class DragPreview:
+    """
+    Pré-visualização de arraste no canvas (retângulo ou linha).
+
+    Cria um único item por gesto e o move com `canvas.coords`, agrupando os
+    eventos de movimento do mouse em no máximo um redesenho por quadro.
+    """
+    FRAME_INTERVAL_MS = 16  # ~60 Hz
+
+    def __init__(self, canvas, interval_ms=FRAME_INTERVAL_MS):
+        self.canvas = canvas
+        self.interval_ms = interval_ms
+        self.item_id = None
+        self.kind = None
+        self.options = {}
+        self.origin = None
+        self.pending = None
+        self.after_id = None
+        self.canvas_ops = 0 # Operações no canvas no gesto atual (para testes)
+
+    def begin(self, kind, x, y, **options):
+        """Inicia um gesto. `kind` é "rectangle" ou "line"."""
+        self.end()
+        self.kind = kind
+        self.options = options
+        self.origin = (x, y)
+        self.canvas_ops = 0
+
+    def update(self, x, y):
+        """Registra a posição atual; o canvas só é tocado no próximo quadro."""
+        if self.origin is None: return
+        self.pending = (x, y)
+        if self.after_id is None:
+            self.after_id = self.canvas.after(self.interval_ms, self._flush)
+
+    def _flush(self):
+        self.after_id = None
+        if self.pending is None or self.origin is None: return
+
+        coords = (*self.origin, *self.pending)
+        self.pending = None
+        if self.item_id is None:
+            create = self.canvas.create_line if self.kind == "line" else self.canvas.create_rectangle
+            self.item_id = create(*coords, **self.options)
+        else:
+            self.canvas.coords(self.item_id, *coords)
+        self.canvas_ops += 1
+
+    def end(self):
+        """Encerra o gesto e remove o item de pré-visualização."""
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        if self.item_id is not None:
+            self.canvas.delete(self.item_id)
+            self.canvas_ops += 1
+            self.item_id = None
+        self.origin = None
+        self.pending = None
+
+class ScrambleEffect:
+    """
+    Gera de uma só vez os quadros decorativos da animação de geração.
+
+    Os caracteres embaralhados são apenas decoração: vêm de um PRNG rápido
+    (não criptográfico), em um único lote. O CSPRNG fica reservado para a
+    senha real.
+    """
+    CHAR_POOL = string.ascii_letters + string.digits + string.punctuation
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def scramble_frames(self, length, steps):
+        """Retorna `steps` textos embaralhados de `length` caracteres."""
+        chars = "".join(self.rng.choices(self.CHAR_POOL, k=length * steps))
+        return [chars[i * length:(i + 1) * length] for i in range(steps)]
+
+    @staticmethod
+    def loading_frames(steps):
+        """Retorna os quadros "Gerando." ... "Gerando...." usados na frase-senha."""
+        return [f"Gerando{'.' * (4 - (steps_left % 4))}" for steps_left in range(steps, 0, -1)]
 
 class AnimatedWord:
     """Representa a palavra 'UNIMED' que aparece e se anima na tela."""
@@ -144,7 +295,12 @@ class UnimedWordAnimator:
 
     def animate(self):
         if not self.is_running: return
+        with FRAME_SECONDS.time():
+            self._draw_frame()
+        # Taxa de atualização mais lenta para baixo consumo de CPU
+        self.canvas.after(100, self.animate)
 
+    def _draw_frame(self):
         # Animação do título principal
         self.title_animation_step += 0.05
         pulse = (math.sin(self.title_animation_step) + 1) / 2
@@ -155,9 +311,6 @@ class UnimedWordAnimator:
         for word in self.words:
             word.animate()
 
-        # Taxa de atualização mais lenta para baixo consumo de CPU
-        self.canvas.after(100, self.animate)
-
     def fade_color(self, start_hex, end_hex, fraction):
         start_rgb = tuple(int(start_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
         end_rgb = tuple(int(end_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo do Vigia do Loop do Tk (UI)
+
+Este arquivo define o vigia (watchdog) que detecta travamentos da
+interface. Um batimento agendado com `after` marca o horário em que o loop
+do Tk rodou pela última vez; uma thread de monitoramento confere esse
+horário periodicamente. Se o loop ficar sem responder por mais que o
+limite, a pilha da thread principal é capturada (`sys._current_frames`)
+e gravada em um log rotativo, junto com a duração total do travamento
+quando o loop volta a responder.
+"""
+
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+
+from src.logic import user_config_dir
+from src.metrics import metrics
+
+LOG_FILENAME = "travamentos.log"
+LOG_MAX_BYTES = 512 * 1024
+LOG_BACKUPS = 3
+
+STALL_SECONDS = metrics.histogram("travamento_segundos", "Duração dos travamentos do loop do Tk.",
+                                  buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+
+
+def rotating_logger(path, name="gerador.travamentos"):
+    """Logger que grava em `path`, com rotação por tamanho."""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+    if not any(getattr(h, "baseFilename", None) == os.path.abspath(path) for h in logger.handlers):
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                                       encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+class MainLoopWatchdog:
+    """Detecta e registra os períodos em que o loop do Tk não responde."""
+    HEARTBEAT_MS = 100
+
+    def __init__(self, root, threshold_ms=500, heartbeat_ms=HEARTBEAT_MS, logger=None, clock=time.monotonic):
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.logger = logger
+        self.clock = clock
+        self.stalls = 0
+        self._main_thread_id = None
+        self._last_beat = None
+        self._stall_start = None # Último batimento antes do travamento em curso
+        self._after_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Começa a vigiar; deve ser chamado na thread do Tk, com o loop já rodando."""
+        if self._thread is not None:
+            return
+        if self.logger is None:
+            self.logger = rotating_logger(os.path.join(user_config_dir(), LOG_FILENAME))
+        self._main_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(target=self._monitor, name="unimed-vigia", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _beat(self):
+        """Batimento na thread do Tk; encerra o registro de um travamento em curso."""
+        now = self.clock()
+        stall_start = self._stall_start
+        if stall_start is not None:
+            self._stall_start = None
+            duration = now - stall_start
+            STALL_SECONDS.observe(duration)
+            self.logger.warning("Loop do Tk voltou a responder após %.0f ms", duration * 1000)
+        self._last_beat = now
+        self._after_id = self.root.after(self.heartbeat_ms, self._beat)
+
+    def _monitor(self):
+        interval = self.heartbeat_ms / 1000
+        while not self._stop.wait(interval):
+            self.check()
+
+    def check(self):
+        """
+        Confere o último batimento (chamado pela thread de monitoramento).
+        Retorna True quando um novo travamento é registrado.
+        """
+        last_beat = self._last_beat
+        if last_beat is None or self._stall_start is not None:
+            return False # Ainda não começou, ou este travamento já foi registrado
+        elapsed = self.clock() - last_beat
+        if elapsed * 1000 < self.threshold_ms:
+            return False
+        self._stall_start = last_beat
+        self.stalls += 1
+        self.logger.warning("Loop do Tk sem responder há %.0f ms. Pilha da thread principal:\n%s",
+                            elapsed * 1000, self.main_thread_stack())
+        return True
+
+    def main_thread_stack(self):
+        """Pilha atual da thread do Tk, formatada como em um traceback."""
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return "(thread principal não encontrada)"
+        return "".join(traceback.format_stack(frame))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para a Anotação em Lote
+
+Garante que o motor sem interface aplica as mesmas operações do editor
+a uma pasta de imagens e que operações inválidas são rejeitadas.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from PIL import Image, ImageChops
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.annotate import annotate_batch, annotate_file, iter_images, load_operations, main
+from src.imaging import render
+
+OPERATIONS = [
+    {"op": "spotlight", "coords": [10, 10, 40, 30]},
+    {"op": "rectangle", "coords": [10, 10, 40, 30]},
+    {"op": "crop", "coords": [0, 0, 60, 50]},
+]
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    """Pasta com algumas capturas e um arquivo que não é imagem."""
+    folder = tmp_path / "entrada"
+    folder.mkdir()
+    for i in range(5):
+        Image.new("RGB", (80, 60), (255, 255, 255)).save(folder / f"captura_{i}.png")
+    (folder / "leia-me.txt").write_text("não é imagem")
+    return folder
+
+
+def test_batch_matches_editor_render(input_dir, tmp_path):
+    """Cada imagem deve sair igual ao render usado pelo editor."""
+    output_dir = tmp_path / "saida"
+    output_dir.mkdir()
+
+    results = list(annotate_batch(iter_images(str(input_dir), str(output_dir)), OPERATIONS, workers=2, max_pending=2))
+
+    assert len(results) == 5
+    assert all(result.error is None for result in results)
+    expected = render(Image.new("RGB", (80, 60), (255, 255, 255)), OPERATIONS)
+    with Image.open(output_dir / "captura_3.png") as annotated:
+        assert annotated.size == (60, 50)
+        assert ImageChops.difference(annotated.convert("RGB"), expected).getbbox() is None
+
+
+def test_batch_reports_unreadable_files(tmp_path):
+    """Arquivos corrompidos viram resultados com erro, sem interromper o lote."""
+    broken = tmp_path / "quebrada.png"
+    broken.write_bytes(b"nao e png")
+    results = list(annotate_batch([(str(broken), str(tmp_path / "saida.png"))], OPERATIONS, workers=1))
+    assert results[0].error
+
+
+def test_load_operations_rejects_invalid_entries(tmp_path):
+    """Operações desconhecidas ou incompletas devem ser recusadas."""
+    path = tmp_path / "ops.json"
+    path.write_text(json.dumps([{"op": "blur", "coords": [0, 0, 1, 1]}]))
+    with pytest.raises(ValueError):
+        load_operations(path)
+
+    path.write_text(json.dumps([{"op": "text", "coords": [0, 0]}]))
+    with pytest.raises(ValueError):
+        load_operations(path)
+
+
+def test_cli_converts_format(input_dir, tmp_path):
+    """A linha de comando processa a pasta e pode trocar a extensão de saída."""
+    ops_path = tmp_path / "ops.json"
+    ops_path.write_text(json.dumps(OPERATIONS))
+    output_dir = tmp_path / "saida"
+
+    assert main([str(ops_path), str(input_dir), str(output_dir), "--processos", "1", "--formato", "jpg"]) == 0
+    assert sorted(os.listdir(output_dir)) == [f"captura_{i}.jpg" for i in range(5)]
+
+
+def test_decompression_bomb_only_fails_its_file(tmp_path, monkeypatch):
+    """Erros do Pillow que não são OSError contam como falha do arquivo, sem abortar o lote."""
+    source = str(tmp_path / "grande.png")
+    Image.new("RGB", (300, 300)).save(source)
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000) # 300x300 passa do dobro: DecompressionBombError
+    result = annotate_file(source, str(tmp_path / "saida.png"), [])
+    assert result.error and "DecompressionBomb" in result.error
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para a Geração em Lote
+
+Garante que os fragmentos são gravados por vários processos nos formatos
+suportados e que a verificação de unicidade substitui as repetições.
+"""
+
+import os
+import sys
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.batch import WRITERS, BatchPolicy, _find_duplicates, generate_batch
+from src.bloom import BloomFilter
+from src.cli import main
+
+
+def _read_all(paths, fmt):
+    return [row for path in paths for row in WRITERS[fmt].read(path)]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_batch_writes_shards(tmp_path, fmt):
+    """O lote é dividido em fragmentos que, juntos, têm a quantidade pedida."""
+    result = generate_batch(250, str(tmp_path), BatchPolicy(length=12), fmt, workers=2, shard_size=100)
+
+    assert [os.path.basename(path) for path in result.paths] == [f"lote_0000{i}.{fmt}" for i in range(3)]
+    rows = _read_all(result.paths, fmt)
+    assert len(rows) == result.count == 250
+    assert all(len(password) == 12 and entropy > 0 for password, entropy in rows)
+
+
+def test_unique_batch_replaces_repeated_passwords(tmp_path):
+    """Em um espaço pequeno as repetições são certas; o lote final não tem nenhuma."""
+    policy = BatchPolicy(length=4, use_upper=False, use_lower=False, use_special=False)
+    result = generate_batch(2000, str(tmp_path), policy, workers=2, shard_size=500, unique=True)
+
+    passwords = [password for password, _ in _read_all(result.paths, "csv")]
+    assert len(passwords) == 2000
+    assert len(set(passwords)) == 2000
+    assert result.duplicates_replaced > 0
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_only_shards_with_repeated_passwords_are_rewritten(tmp_path):
+    """Fragmentos sem repetições nem senhas já emitidas não entram na reescrita."""
+    shards = {"a.csv": ["um", "dois"], "b.csv": ["tres", "dois"], "c.csv": ["quatro", "cinco"]}
+    paths = []
+    for name, passwords in shards.items():
+        paths.append(str(tmp_path / name))
+        with WRITERS["csv"](paths[-1]) as writer:
+            for password in passwords:
+                writer.write(password, 10.0)
+
+    repeated, reissued, _, affected = _find_duplicates(paths, "csv", 6, 0.001, {})
+    assert repeated == {"dois"} and not reissued
+    assert affected == set(paths[:2])
+
+    _, _, _, affected = _find_duplicates(paths, "csv", 6, 0.001, {}, issued={"cinco"})
+    assert affected == set(paths)
+
+
+def test_batch_rejects_impossible_requests(tmp_path):
+    """Formato desconhecido, espaço pequeno demais ou alvo inatingível geram erro."""
+    with pytest.raises(ValueError):
+        generate_batch(10, str(tmp_path), fmt="xml")
+    with pytest.raises(ValueError):
+        generate_batch(50, str(tmp_path), BatchPolicy(length=1, use_upper=False, use_lower=False, use_special=False),
+                       workers=1, unique=True)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]  # Falha não deixa temporários
+    assert main(["--quantidade", "10", "--saida", str(tmp_path), "--entropia", "5000"]) == 2
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Tudo o que foi adicionado é encontrado; itens novos raramente colidem."""
+    bloom = BloomFilter(1000, error_rate=0.01)
+    possibly_repeated = sum(bloom.add(f"senha{i}") for i in range(1000))
+    assert all(f"senha{i}" in bloom for i in range(1000))
+    assert sum(f"outra{i}" in bloom for i in range(1000)) < 40
+    assert len(bloom) == 1000 - possibly_repeated
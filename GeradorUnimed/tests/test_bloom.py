@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Registro de Senhas Emitidas
+
+Garante que o filtro de Bloom em disco persiste entre aberturas, não
+guarda texto puro e faz o gerador e os lotes sortearem de novo as
+senhas já emitidas.
+"""
+
+import base64
+import os
+import stat
+import sys
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.batch import WRITERS, BatchPolicy, generate_batch
+from src.bloom import BloomFilter, PersistentBloomFilter
+from src.logic import PasswordGenerator
+from src.rng import SeededRandomSource
+
+DIGITS = dict(use_upper=False, use_lower=False, use_digits=True, use_special=False,
+              exclude_ambiguous=False, special_chars="")
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    return str(tmp_path / "emitidas.bloom")
+
+
+def test_registry_persists_salted_hashes_only(registry_path):
+    """O registro reabre com o mesmo conteúdo e o arquivo não contém as senhas."""
+    registry = PersistentBloomFilter(registry_path, capacity=1000, error_rate=1e-4)
+    assert not os.path.exists(registry_path)  # Criado apenas no primeiro uso
+    for i in range(200):
+        registry.add(f"SenhaEmitida-{i}")
+    registry.close()
+
+    assert stat.S_IMODE(os.stat(registry_path).st_mode) & 0o077 == 0
+    with open(registry_path, "rb") as f:
+        assert b"SenhaEmitida" not in f.read()
+
+    reopened = PersistentBloomFilter(registry_path, capacity=5)
+    assert len(reopened) == 200
+    assert reopened.capacity == 1000  # Parâmetros vêm do cabeçalho
+    assert all(f"SenhaEmitida-{i}" in reopened for i in range(200))
+    assert "NuncaEmitida" not in reopened
+    reopened.close()
+
+
+def test_same_password_gets_different_hashes_per_registry(tmp_path):
+    """Cada registro usa um sal próprio: os bits de uma mesma senha mudam entre arquivos."""
+    first = PersistentBloomFilter(str(tmp_path / "a.bloom"), capacity=100)
+    second = PersistentBloomFilter(str(tmp_path / "b.bloom"), capacity=100)
+    first.add("mesma-senha")
+    second.add("mesma-senha")
+    assert first._positions("mesma-senha") != second._positions("mesma-senha")
+    first.close()
+    second.close()
+
+
+def test_hash_key_is_kept_outside_the_registry(registry_path):
+    """Só com o arquivo não dá para testar senhas candidatas: a chave do blake2b está no cofre."""
+    registry = PersistentBloomFilter(registry_path, capacity=100)
+    registry.add("gato-sol-mesa-rio")
+    salt = registry.salt
+    registry.close()
+
+    with open(registry_path, "rb") as f:
+        assert salt not in f.read()
+    key_file, = [name for name in os.listdir(os.path.dirname(registry_path)) if name.endswith(".key")]
+    assert stat.S_IMODE(os.stat(os.path.join(os.path.dirname(registry_path), key_file)).st_mode) & 0o077 == 0
+
+    os.remove(os.path.join(os.path.dirname(registry_path), key_file))
+    with pytest.raises(ValueError, match="cofre"):
+        "gato-sol-mesa-rio" in PersistentBloomFilter(registry_path)
+
+
+def test_version_1_registry_moves_its_salt_out(registry_path):
+    """Um registro antigo, com o sal no cabeçalho, continua valendo e deixa de conter o sal."""
+    salt = os.urandom(32)
+    legacy = BloomFilter(100, 1e-4, salt=salt)
+    legacy.add("senha-antiga")
+    header = PersistentBloomFilter.HEADER.pack(PersistentBloomFilter.MAGIC, 1, legacy.num_bits, legacy.num_hashes,
+                                               legacy.capacity, legacy.count, salt)
+    with open(registry_path, "wb") as f:
+        f.write(header + bytes(legacy._bits))
+
+    registry = PersistentBloomFilter(registry_path)
+    assert "senha-antiga" in registry
+    assert "senha-nova" not in registry
+    registry.close()
+    with open(registry_path, "rb") as f:
+        data = f.read()
+    assert salt not in data
+    _, version, *_, key_id = PersistentBloomFilter.HEADER.unpack_from(data)
+    assert version == PersistentBloomFilter.VERSION
+    assert base64.b64decode(registry.key_store.get(PersistentBloomFilter._key_name(key_id))) == salt
+
+
+def test_full_registry_rolls_over_to_a_new_file(registry_path):
+    """Ao encher, o arquivo é lacrado e um novo recebe as senhas; nada emitido é esquecido."""
+    registry = PersistentBloomFilter(registry_path, capacity=50, error_rate=1e-6)
+    for i in range(200):
+        registry.add(f"senha-{i}")
+    assert registry.generations == 4
+    assert all(registry.add(f"senha-{i}") for i in range(200))  # Já emitidas, em qualquer arquivo
+    registry.close()
+    assert all(os.path.exists(f"{registry_path}.{n}") for n in (1, 2, 3))
+
+    reopened = PersistentBloomFilter(registry_path)
+    assert len(reopened) >= 200 - 5  # Falsos positivos na inserção não contam como novos
+    assert all(f"senha-{i}" in reopened for i in range(200))
+    assert sum(f"nova-{i}" in reopened for i in range(1000)) < 10  # Um único arquivo lotado daria ~28%
+    reopened.close()
+
+
+def test_count_reaches_the_file_without_close(registry_path):
+    """O contador vai para o cabeçalho a cada senha nova: um encerramento abrupto não o perde."""
+    registry = PersistentBloomFilter(registry_path, capacity=100)
+    for i in range(30):
+        registry.add(f"senha-{i}")
+    with open(registry_path, "rb") as f:
+        count = PersistentBloomFilter.HEADER.unpack(f.read(PersistentBloomFilter.HEADER.size))[5]
+    assert count == registry.count == 30
+    registry.close()
+
+
+def test_registry_is_locked_while_open(registry_path):
+    """Dois usuários do mesmo arquivo (ex: a interface e a linha de comando) não o mapeiam ao mesmo tempo."""
+    first = PersistentBloomFilter(registry_path, capacity=100)
+    first.add("senha")
+    second = PersistentBloomFilter(registry_path)
+    with pytest.raises(ValueError, match="em uso"):
+        "senha" in second
+    first.close()
+    assert "senha" in second
+    second.close()
+
+
+def test_generator_redraws_issued_passwords(registry_path):
+    """Com a mesma semente, a segunda rodada não pode repetir senhas da primeira."""
+    registry = PersistentBloomFilter(registry_path, capacity=1000)
+    first, _ = PasswordGenerator(SeededRandomSource(1), issued=registry).generate(3, **DIGITS)
+    again, _ = PasswordGenerator(SeededRandomSource(1), issued=registry).generate(3, **DIGITS)
+    assert again != first
+    assert len(registry) == 2
+
+    with pytest.raises(ValueError):
+        generator = PasswordGenerator(issued=registry)
+        for _ in range(20):
+            generator.generate(1, **DIGITS)  # Só existem 10 senhas de um dígito
+    registry.close()
+
+
+def test_batches_never_reissue_passwords(tmp_path, registry_path):
+    """Dois lotes com o mesmo registro não compartilham nenhuma senha."""
+    registry = PersistentBloomFilter(registry_path, capacity=5000)
+    policy = BatchPolicy(length=4, use_upper=False, use_lower=False, use_special=False)
+    batches = []
+    for name in ("lote1", "lote2"):
+        result = generate_batch(1500, str(tmp_path / name), policy, workers=2, shard_size=500, issued=registry)
+        batches.append({password for path in result.paths for password, _ in WRITERS["csv"].read(path)})
+
+    assert len(batches[0]) == len(batches[1]) == 1500
+    assert not batches[0] & batches[1]
+    assert len(registry) >= 3000 - 10  # Alguns falsos positivos na inserção não contam como novos
+    registry.close()
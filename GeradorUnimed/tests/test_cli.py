@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para a Linha de Comando
+
+Garante que o modo de entropia-alvo e as validações de argumentos
+funcionam sem a interface gráfica.
+"""
+
+import os
+import sys
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.cli import main
+
+
+def test_target_entropy_prints_minimal_passwords(capsys):
+    """Cada senha tem o comprimento mínimo para a entropia pedida."""
+    assert main(["--entropia", "64", "--quantidade", "5", "--sem-especiais"]) == 0
+    out, err = capsys.readouterr()
+    passwords = out.split()
+    assert len(passwords) == 5
+    assert all(len(password) == 11 and password.isalnum() for password in passwords)
+    assert "11 caracteres" in err
+
+
+def test_invalid_arguments_return_error(capsys):
+    """Alvo inatingível ou nenhuma classe selecionada retornam código 2."""
+    assert main(["--entropia", "10000"]) == 2
+    assert main(["--sem-maiusculas", "--sem-minusculas", "--sem-numeros", "--sem-especiais"]) == 2
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("argv", [["--comprimento", "0"], ["--comprimento", "-3"], ["--comprimento", "65"],
+                                  ["--entropia", "nan"], ["--entropia", "-5"], ["--entropia", "inf"]])
+def test_out_of_range_arguments_are_rejected(argv, capsys):
+    """Valores fora da política não viram o padrão nem senhas curtas: o argparse recusa com código 2."""
+    with pytest.raises(SystemExit) as exit_info:
+        main(argv)
+    assert exit_info.value.code == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_target_below_the_minimum_length_is_rejected(capsys):
+    """Um alvo que caberia em menos de 8 caracteres é recusado, com o mínimo para as classes."""
+    assert main(["--entropia", "20"]) == 2
+    out, err = capsys.readouterr()
+    assert out == "" and "mínimo é 8" in err
+    assert main(["--comprimento", "8"]) == 0
+    assert len(capsys.readouterr().out.strip()) == 8
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Serviço de Área de Transferência
+
+Usa uma raiz falsa no lugar do Tk para verificar que a cópia não passa
+pelo pyperclip e que a limpeza automática só apaga o texto da aplicação.
+"""
+
+import os
+import sys
+import threading
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.ui import clipboard
+from src.ui.clipboard import ClipboardService
+
+
+class FakeClipboardRoot:
+    """Imita o clipboard do Tk e a posse da seleção CLIPBOARD."""
+    def __init__(self, windowing_system="x11"):
+        self.content = ""
+        self.owner = None
+        self.reads = 0
+
+        class _Tk:
+            def call(self, *args):
+                return windowing_system
+        self.tk = _Tk()
+
+    def clipboard_clear(self):
+        self.content = ""
+        self.owner = self
+
+    def clipboard_append(self, text):
+        self.content += text
+
+    def clipboard_get(self):
+        self.reads += 1
+        return self.content
+
+    def selection_own_get(self, selection):
+        return self.owner
+
+    def other_program_copies(self, text):
+        self.content = text
+        self.owner = None
+
+
+def test_copy_uses_tk_clipboard_without_pyperclip(mocker):
+    """Com uma janela, a cópia usa o clipboard do Tk e nunca o pyperclip."""
+    pyperclip_copy = mocker.patch.object(clipboard.pyperclip, "copy")
+    root = FakeClipboardRoot()
+    ClipboardService(root).copy("Segredo#1")
+    assert root.content == "Segredo#1"
+    pyperclip_copy.assert_not_called()
+
+
+def test_clear_only_while_still_owner_on_x11():
+    """No X11 a posse da seleção decide, sem ler o conteúdo de volta."""
+    root = FakeClipboardRoot("x11")
+    service = ClipboardService(root)
+
+    token = service.copy("Segredo#1")
+    assert service.clear_if_owned(token) is True
+    assert root.content == ""
+
+    token = service.copy("Segredo#2")
+    root.other_program_copies("texto do usuário")
+    assert service.clear_if_owned(token) is False
+    assert root.content == "texto do usuário"
+    assert root.reads == 0
+
+
+def test_stale_timer_does_not_clear_newer_copy():
+    """O temporizador de uma cópia antiga não apaga a cópia mais recente."""
+    root = FakeClipboardRoot("win32")
+    service = ClipboardService(root)
+    old = service.copy("Antiga")
+    new = service.copy("Nova")
+
+    assert service.clear_if_owned(old) is False
+    assert root.content == "Nova"
+    assert service.clear_if_owned(new) is True
+    assert root.content == ""
+
+
+def test_headless_fallback_runs_in_background(mocker):
+    """Sem janela, o pyperclip roda fora da thread que chamou."""
+    threads = []
+    mocker.patch.object(clipboard.pyperclip, "copy", side_effect=lambda text: threads.append(threading.current_thread()))
+    mocker.patch.object(clipboard.pyperclip, "paste", return_value="Segredo")
+    service = ClipboardService()
+
+    token = service.copy("Segredo")
+    assert service.clear_if_owned(token) is True
+    service._worker.shutdown(wait=True)
+
+    assert len(threads) == 2  # Cópia e limpeza
+    assert all(thread is not threading.current_thread() for thread in threads)
@@ -6,52 +6,28 @@ from unittest.mock import MagicMock, patch, ANY
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Define a dummy CTk class to allow inheritance without side effects
-class DummyCTk:
-    def __init__(self, *args, **kwargs):
-        pass
-
-    def after(self, ms, func=None, *args):
-        pass
-
-    def geometry(self, *args):
-        pass
-
-    def wm_state(self, *args):
-        pass
-
-    def protocol(self, *args):
-        pass
-
-    def configure(self, *args, **kwargs):
-        pass
-
-    def title(self, *args):
-        pass
-
-    def bind(self, *args):
-        pass
-
-    def grid_rowconfigure(self, *args, **kwargs):
-        pass
-
-    def grid_columnconfigure(self, *args, **kwargs):
-        pass
+# Fake Tk root (virtual-clock event loop) shared with the UI responsiveness harness
+from tests.ui_harness import FakeTk
 
 # Mock customtkinter before importing app
 mock_ctk = MagicMock()
-mock_ctk.CTk = DummyCTk
-sys.modules['customtkinter'] = mock_ctk
-sys.modules['tkinter'] = MagicMock()
-sys.modules['PIL'] = MagicMock()
-sys.modules['PIL.Image'] = MagicMock()
-
-# Mock submodules in src.ui that might use customtkinter
-sys.modules['src.ui.analyzer_tab'] = MagicMock()
-sys.modules['src.ui.components'] = MagicMock()
-sys.modules['src.ui.utils'] = MagicMock()
-
-from src.ui.app import UnimedPasswordGeneratorApp
+mock_ctk.CTk = FakeTk
+_mocked_modules = {
+    'customtkinter': mock_ctk,
+    'tkinter': MagicMock(),
+    'PIL': MagicMock(),
+    'PIL.Image': MagicMock(),
+    # Mock submodules in src.ui that might use customtkinter
+    'src.ui.analyzer_tab': MagicMock(),
+    'src.ui.components': MagicMock(),
+    'src.ui.utils': MagicMock(),
+}
+
+with patch.dict(sys.modules, _mocked_modules):
+    from src.ui.app import UnimedPasswordGeneratorApp
+    # Keep the mock-built app module importable for patch('src.ui.app...')
+    _app_module = sys.modules['src.ui.app']
+sys.modules['src.ui.app'] = _app_module
 
 def setup_app_mock(mock_init_vars):
     """Helper to set up side effects for _init_vars."""
@@ -65,7 +41,7 @@ def setup_app_mock(mock_init_vars):
 def test_clipboard_clearing_scheduled():
     """Test that clipboard clearing is scheduled after copying."""
 
-    with patch('src.ui.app.pyperclip') as mock_pyperclip:
+    with patch('src.ui.app.ClipboardService') as mock_service_cls:
         # Patch methods called in __init__ to avoid side effects
         # We use autospec=True to ensure arguments match, but here simple patch is enough
         with patch.object(UnimedPasswordGeneratorApp, '_init_vars', autospec=True) as mock_init_vars, \
@@ -87,28 +63,30 @@ def test_clipboard_clearing_scheduled():
             # Call the method
             app.copy_to_clipboard(secret_text, mock_button)
 
-            # Verify copy was called
-            mock_pyperclip.copy.assert_called_with(secret_text)
+            # Verify copy went through the in-process clipboard service
+            mock_service_cls.assert_called_once_with(app)
+            mock_service_cls.return_value.copy.assert_called_with(secret_text)
 
             # Verify UI feedback (1500ms)
             app.after.assert_any_call(1500, ANY)
 
-            # Verify security clear (60000ms) - This should fail currently
-            calls = app.after.call_args_list
-            clear_scheduled = False
-            for call in calls:
-                args, _ = call
-                if args and args[0] == 60000:
-                    clear_scheduled = True
-                    break
-
-            if not clear_scheduled:
+            # Verify security clear (60000ms)
+            clear_callbacks = [args[1] for args, _ in app.after.call_args_list if args and args[0] == 60000]
+            if not clear_callbacks:
                 pytest.fail("Security enhancement missing: Clipboard clear not scheduled for 60s")
 
+            # The timer only keeps the ownership token, never the password itself
+            closure = [cell.cell_contents for cell in clear_callbacks[0].__closure__ or ()]
+            assert secret_text not in closure
+            clear_callbacks[0]()
+            mock_service_cls.return_value.clear_if_owned.assert_called_once_with(
+                mock_service_cls.return_value.copy.return_value
+            )
+
 def test_clear_clipboard_logic():
     """Test the logic that actually clears the clipboard."""
 
-    with patch('src.ui.app.pyperclip') as mock_pyperclip:
+    with patch('src.ui.app.ClipboardService') as mock_service_cls:
         with patch.object(UnimedPasswordGeneratorApp, '_init_vars', autospec=True) as mock_init_vars, \
              patch.object(UnimedPasswordGeneratorApp, 'create_main_widgets'), \
              patch('src.ui.app.SettingsManager'), \
@@ -117,36 +95,14 @@ def test_clear_clipboard_logic():
             setup_app_mock(mock_init_vars)
 
             app = UnimedPasswordGeneratorApp()
-
-            # Setup mock to return the secret text (simulating it's still there)
-            secret_text = "MySecretPass123"
-            mock_pyperclip.paste.return_value = secret_text
+            app.clipboard_timer = "after#1"
 
             # We expect the method to exist
             if not hasattr(app, 'clear_clipboard'):
                 pytest.skip("clear_clipboard method not implemented yet")
 
-            app.clear_clipboard(secret_text)
-
-            # It should have cleared it
-            mock_pyperclip.copy.assert_called_with("")
-
-    # Test case where clipboard changed
-    with patch('src.ui.app.pyperclip') as mock_pyperclip:
-        with patch.object(UnimedPasswordGeneratorApp, '_init_vars', autospec=True) as mock_init_vars, \
-             patch.object(UnimedPasswordGeneratorApp, 'create_main_widgets'), \
-             patch('src.ui.app.SettingsManager'), \
-             patch('src.ui.app.PasswordGenerator'):
-
-            setup_app_mock(mock_init_vars)
-
-            app = UnimedPasswordGeneratorApp()
-
-            # Setup mock to return DIFFERENT text
-            mock_pyperclip.paste.return_value = "DifferentText"
-
-            if hasattr(app, 'clear_clipboard'):
-                app.clear_clipboard("MySecretPass123")
+            app.clear_clipboard(b"token")
 
-                # It should NOT have cleared it (copy not called with empty string)
-                mock_pyperclip.copy.assert_not_called()
+            # It should delegate the ownership check (no read-back in the app) and reset the timer
+            mock_service_cls.return_value.clear_if_owned.assert_called_once_with(b"token")
+            assert app.clipboard_timer is None
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do Daemon de Senhas
+
+Garantem que o serviço atende os comandos com as listas e caches já
+carregados, que erros de uso voltam como resposta (sem derrubar a
+conexão) e que o socket é criado só para o usuário e limpo ao encerrar.
+"""
+
+import os
+import socket
+import stat
+import sys
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.bloom import PersistentBloomFilter
+from src.client import DaemonClient, DaemonError
+from src.daemon import PasswordDaemon, PasswordService
+from src.logic import PasswordGenerator, _fetch_pwned_hashes
+from src.rng import SeededRandomSource
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Sistema sem sockets Unix")
+
+
+@pytest.fixture
+def service():
+    return PasswordService(PasswordGenerator(SeededRandomSource(7)))
+
+
+@pytest.fixture
+def daemon(tmp_path, service):
+    daemon = PasswordDaemon(str(tmp_path / "gerador.sock"), service).bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=5)
+
+
+def test_service_generates_and_reports_usage_errors(service):
+    response = service.handle({"comando": "gerar", "comprimento": 20, "quantidade": 3, "especiais": False})
+    assert response["ok"] and len(response["senhas"]) == 3
+    assert all(len(password) == 20 and password.isalnum() for password in response["senhas"])
+
+    phrase = service.handle({"comando": "frase", "palavras": 5, "separador": ".", "lista": "Animais (PT-BR)"})
+    assert phrase["ok"] and phrase["senhas"][0].count(".") == 4
+
+    for request in ({"comando": "apagar"}, {"comando": "gerar", "comprimento": 12, "entropia": 80},
+                    {"comando": "gerar", "quantidade": 0}, {"comando": "frase", "lista": "Klingon"},
+                    {"comando": "gerar", "desconhecido": 1}, ["gerar"],
+                    {"comando": "gerar", "comprimento": 0}, {"comando": "gerar", "comprimento": -5},
+                    {"comando": "gerar", "comprimento": 1_000_000}, {"comando": "frase", "palavras": 0},
+                    {"comando": "frase", "palavras": 50}, {"comando": "gerar", "entropia": "nan"},
+                    {"comando": "gerar", "entropia": float("inf")}, {"comando": "gerar", "entropia": 1},
+                    {"comando": "gerar", "entropia": -5}):
+        response = service.handle(request)
+        assert response["ok"] is False and response["erro"]
+
+    for length in (8, 64):
+        assert len(service.handle({"comando": "gerar", "comprimento": length})["senhas"][0]) == length
+    low = service.handle({"comando": "gerar", "entropia": 1})
+    assert "mínimo é 8" in low["erro"]
+    assert len(service.handle({"comando": "gerar", "entropia": 60})["senhas"][0]) >= 8
+
+
+def test_service_records_passwords_in_the_registry(tmp_path):
+    """Com um registro, o que o daemon entrega conta como emitido (e não repete a interface ou a CLI)."""
+    registry = PersistentBloomFilter(str(tmp_path / "emitidas.bloom"), capacity=1000)
+    service = PasswordService(issued=registry)
+    passwords = service.handle({"comando": "gerar", "quantidade": 5})["senhas"]
+    phrase = service.handle({"comando": "frase", "palavras": 4})["senhas"][0]
+    assert len(registry) == 6
+    assert all(password in registry for password in passwords + [phrase])
+    registry.close()
+
+
+def test_client_calls_share_one_connection(daemon, mocker):
+    _fetch_pwned_hashes.cache_clear()
+    get = mocker.patch('requests.get', return_value=Mock(text="1E4C9B93F3F0682250B6CF8331B7EE68FD8:3"))
+
+    with DaemonClient(daemon.path) as client:
+        assert client.call("ping")["versao"] == 1
+        assert len(client.generate(entropia=64, quantidade=2)["senhas"]) == 2
+        assert client.analyze("Senha!Forte123")["regras"]["case_ok"] is True
+        assert client.check("password") is True
+        assert client.check("password") is True # Segunda consulta vem do cache do daemon
+        with pytest.raises(DaemonError, match="Comando desconhecido"):
+            client.call("apagar")
+        assert client.call("ping")["ok"] # A conexão continua utilizável após um erro
+    assert get.call_count == 1
+
+
+def test_socket_is_private_and_removed_on_shutdown(tmp_path, service):
+    path = str(tmp_path / "gerador.sock")
+    daemon = PasswordDaemon(path, service).bind()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    with pytest.raises(OSError, match="Já existe um daemon"):
+        PasswordDaemon(path, service).bind()
+    daemon.close()
+    assert not os.path.exists(path)
+
+
+def test_stale_socket_is_replaced(tmp_path, service):
+    path = str(tmp_path / "gerador.sock")
+    PasswordDaemon(path, service).bind().server.server_close() # Encerrado sem remover o socket
+    assert os.path.exists(path)
+    daemon = PasswordDaemon(path, service).bind()
+    daemon.close()
+
+
+def test_client_reports_missing_daemon(tmp_path):
+    with pytest.raises(DaemonError, match="indisponível"):
+        DaemonClient(str(tmp_path / "ausente.sock")).call("ping")
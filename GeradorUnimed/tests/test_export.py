@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para a Exportação Criptografada
+
+Garante que o formato .enc é lido de volta em streaming, que a memória
+do escritor não cresce com o lote e que alterações são detectadas.
+"""
+
+import os
+import sys
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import export
+from src.batch import BatchPolicy, generate_batch
+from src.export import CHUNK_LENGTH, HEADER, EncryptedShardWriter, iter_chunks, verify
+
+# Parâmetros baratos do scrypt para manter os testes rápidos
+FAST = {"passphrase": "senha-de-teste", "scrypt_log2_n": 10}
+
+
+@pytest.fixture
+def exported(tmp_path):
+    """Arquivo com 500 senhas em vários blocos pequenos."""
+    path = tmp_path / "lote.enc"
+    with EncryptedShardWriter(str(path), chunk_size=1024, **FAST) as writer:
+        for i in range(500):
+            writer.write(f"senha-{i:04d}", 42.0)
+            assert len(writer._buffer) < writer.chunk_size
+    return path
+
+
+def test_roundtrip_streams_across_chunks(exported):
+    """Linhas que cruzam blocos são remontadas; nada aparece em texto puro."""
+    rows = list(EncryptedShardWriter.read(str(exported), **FAST))
+    assert rows == [(f"senha-{i:04d}", 42.0) for i in range(500)]
+    assert len(list(iter_chunks(str(exported), FAST["passphrase"]))) > 10
+    assert b"senha-0001" not in exported.read_bytes()
+
+
+def test_wrong_passphrase_and_tampering_are_detected(exported):
+    """Senha errada, byte alterado ou último bloco removido invalidam o arquivo."""
+    with pytest.raises(ValueError):
+        verify(str(exported), "outra-senha")
+
+    data = bytearray(exported.read_bytes())
+    data[HEADER.size + CHUNK_LENGTH.size + 5] ^= 1
+    exported.with_name("alterado.enc").write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        verify(str(exported.with_name("alterado.enc")), FAST["passphrase"])
+
+    # Remove o último bloco: o penúltimo não foi cifrado como final
+    data = exported.read_bytes()
+    offset, last_start = HEADER.size, None
+    while offset < len(data):
+        last_start = offset
+        offset += CHUNK_LENGTH.size + CHUNK_LENGTH.unpack(data[offset:offset + CHUNK_LENGTH.size])[0]
+    exported.with_name("truncado.enc").write_bytes(data[:last_start])
+    with pytest.raises(ValueError):
+        verify(str(exported.with_name("truncado.enc")), FAST["passphrase"])
+
+
+@pytest.mark.parametrize("field, value", [("log2_n", 40), ("log2_n", 0), ("r", 255), ("p", 200)])
+def test_scrypt_parameters_out_of_bounds_are_rejected(exported, field, value):
+    """Um cabeçalho forjado não consegue pedir uma derivação gigante (ou fraca demais)."""
+    fields = dict(zip(["magic", "version", "log2_n", "r", "p", "salt", "prefix", "chunk_size"],
+                      HEADER.unpack(exported.read_bytes()[:HEADER.size])))
+    fields[field] = value
+    exported.write_bytes(HEADER.pack(*fields.values()) + exported.read_bytes()[HEADER.size:])
+    with pytest.raises(ValueError, match="scrypt"):
+        verify(str(exported), FAST["passphrase"])
+
+
+def test_oversized_chunk_length_is_rejected(exported):
+    """Um tamanho de bloco forjado é recusado antes de ler (e alocar) o bloco."""
+    data = bytearray(exported.read_bytes())
+    data[HEADER.size:HEADER.size + CHUNK_LENGTH.size] = CHUNK_LENGTH.pack(0xFFFFFFFF)
+    exported.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="Bloco maior"):
+        list(iter_chunks(str(exported), FAST["passphrase"]))
+
+
+def test_failed_export_is_not_readable(tmp_path):
+    """Um erro durante a geração deixa o arquivo sem o bloco final."""
+    path = tmp_path / "incompleto.enc"
+    with pytest.raises(RuntimeError):
+        with EncryptedShardWriter(str(path), **FAST) as writer:
+            writer.write("senha", 1.0)
+            raise RuntimeError("falha na geração")
+    with pytest.raises(ValueError):
+        verify(str(path), FAST["passphrase"])
+
+
+def test_batch_exports_encrypted_shards(tmp_path, monkeypatch, capsys):
+    """O lote em vários processos grava fragmentos cifrados verificáveis pela linha de comando."""
+    result = generate_batch(300, str(tmp_path), BatchPolicy(length=10), "enc", workers=2, shard_size=100,
+                            unique=True, writer_options=FAST)
+    assert all(path.endswith(".enc") for path in result.paths)
+
+    monkeypatch.setenv(export.PASSPHRASE_ENV, FAST["passphrase"])
+    assert export.main(["verificar", *result.paths]) == 0
+    assert capsys.readouterr().out.count("100 senhas, íntegro.") == 3
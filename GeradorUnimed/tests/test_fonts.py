@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Gerenciador de Fontes
+
+Garante que fontes e métricas são resolvidas uma única vez e que a
+descoberta de fontes do sistema funciona sem o fontconfig.
+"""
+
+import os
+import sys
+
+import pytest
+from PIL import ImageFont
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import fonts
+from src.fonts import FontManager
+
+
+@pytest.fixture
+def manager():
+    """Gerenciador com candidatos inexistentes (força o fallback)."""
+    return FontManager(candidates={"sans": ["fonte_inexistente_1.ttf", "fonte_inexistente_2.ttf"]})
+
+
+def test_font_is_resolved_once(manager, mocker):
+    """Os candidatos ausentes só devem ser procurados no disco uma vez."""
+    spy = mocker.spy(ImageFont, "truetype")
+    first = manager.get_font("sans", 24)
+    second = manager.get_font("sans", 24)
+    manager.get_font("sans", 32)
+
+    searched = [call.args[0] for call in spy.call_args_list if "inexistente" in str(call.args[0])]
+    assert first is second
+    # Um por candidato, sem novas buscas para outro tamanho
+    assert searched == ["fonte_inexistente_1.ttf", "fonte_inexistente_2.ttf"]
+
+
+def test_line_metrics_are_cached(manager, mocker):
+    """As métricas de uma linha devem ser calculadas uma única vez."""
+    font = manager.get_font("sans", 24)
+    spy = mocker.spy(font, "getbbox")
+    width, height = manager.line_metrics("Senha vazada", "sans", 24)
+    assert manager.line_metrics("Senha vazada", "sans", 24) == (width, height)
+    assert width > 0 and height > 0
+    assert spy.call_count == 1
+
+
+def test_discovery_uses_system_index(tmp_path, monkeypatch):
+    """A descoberta deve indexar os diretórios de fontes e resolver pelo índice."""
+    font_file = tmp_path / "sub" / "MinhaFonte.TTF"
+    font_file.parent.mkdir()
+    font_file.write_bytes(b"")
+    monkeypatch.setattr(fonts.shutil, "which", lambda name: None)
+    monkeypatch.setattr(fonts, "FONT_DIRS", [str(tmp_path)])
+
+    manager = FontManager(candidates={"custom": ["minhafonte.ttf"]})
+    manager.start_discovery(preload=()).join(timeout=5)
+
+    assert manager.resolve("custom") == str(font_file)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o PasswordHistory
+
+Garante a deduplicação, o limite de capacidade, a busca e a
+persistência cifrada do histórico de senhas.
+"""
+
+import os
+import stat
+import sys
+import threading
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from cryptography.fernet import Fernet
+
+from src import keystore
+from src.keystore import KeyStore
+from src.logic import PasswordHistory
+
+
+def test_add_deduplicates_and_promotes():
+    """Uma senha repetida sobe para o topo em vez de aparecer duas vezes."""
+    history = PasswordHistory()
+    for password in ["a1", "b2", "c3", "a1"]:
+        history.add(password)
+    assert list(history) == ["a1", "c3", "b2"]
+    assert len(history) == 3
+    assert "b2" in history
+
+
+def test_capacity_discards_oldest():
+    """Ao passar da capacidade, as senhas mais antigas são descartadas."""
+    history = PasswordHistory(capacity=3)
+    for i in range(10):
+        history.add(f"senha{i}")
+    assert list(history) == ["senha9", "senha8", "senha7"]
+
+
+def test_window_and_search():
+    """A janela visível e a busca retornam as mais recentes primeiro."""
+    history = PasswordHistory()
+    for password in ["Casa-Azul", "gato-verde", "CASA-verde", "sol"]:
+        history.add(password)
+    assert history.window(2) == ["sol", "CASA-verde"]
+    assert history.search("casa") == ["CASA-verde", "Casa-Azul"]
+    assert history.search("verde", limit=1) == ["CASA-verde"]
+
+
+def test_persists_encrypted(tmp_path, monkeypatch):
+    """O arquivo gravado não contém as senhas em texto puro e é relido corretamente."""
+    monkeypatch.setattr(keystore, "system_keyring", lambda scope: None) # Sem cofre: chave em arquivo
+    path = tmp_path / "historico.bin"
+    history = PasswordHistory(str(path))
+    history.add("SenhaMuitoSecreta!1")
+    history.add("OutraSenha#2")
+    assert history.save() is True
+
+    assert b"SenhaMuitoSecreta" not in path.read_bytes()
+    key_mode = stat.S_IMODE(os.stat(tmp_path / "historico.key").st_mode)
+    assert key_mode & 0o077 == 0
+
+    restored = PasswordHistory(str(path), capacity=1)
+    assert restored.load() is True
+    assert list(restored) == ["OutraSenha#2"]
+
+
+def test_load_rejects_tampered_file(tmp_path):
+    """Um arquivo corrompido ou cifrado com outra chave é ignorado."""
+    path = tmp_path / "historico.bin"
+    history = PasswordHistory(str(path))
+    history.add("abc")
+    history.save()
+    path.write_bytes(path.read_bytes()[:-4] + b"xxxx")
+
+    restored = PasswordHistory(str(path))
+    assert restored.load() is False
+    assert len(restored) == 0
+
+
+class FakeKeyring:
+    """Cofre do sistema em memória, com a interface do pacote `keyring`."""
+    def __init__(self):
+        self.passwords = {}
+
+    def get_password(self, service, user):
+        return self.passwords.get((service, user))
+
+    def set_password(self, service, user, password):
+        self.passwords[(service, user)] = password
+
+
+def test_key_goes_to_the_system_keyring(tmp_path):
+    """Com um cofre disponível, a chave não fica no diretório do histórico."""
+    fake = FakeKeyring()
+    store = KeyStore(str(tmp_path), backend=keystore.KeyringBackend(fake, str(tmp_path)))
+    history = PasswordHistory(str(tmp_path / "historico.bin"), key_store=store)
+    history.add("abc")
+    assert history.save() is True
+
+    assert not (tmp_path / "historico.key").exists()
+    assert len(fake.passwords) == 1
+    restored = PasswordHistory(str(tmp_path / "historico.bin"), key_store=store)
+    assert restored.load() is True
+    assert list(restored) == ["abc"]
+
+
+def test_legacy_key_file_moves_to_the_keyring(tmp_path):
+    """A chave em arquivo de versões anteriores é levada ao cofre e apagada do disco."""
+    path = str(tmp_path / "historico.bin")
+    files_only = KeyStore(str(tmp_path), backend=keystore.FileBackend(str(tmp_path), protect=False))
+    history = PasswordHistory(path, key_store=files_only)
+    history.add("antiga")
+    history.save()
+
+    store = KeyStore(str(tmp_path), backend=keystore.KeyringBackend(FakeKeyring(), str(tmp_path)))
+    store.files.protect = False
+    restored = PasswordHistory(path, key_store=store)
+    assert restored.load() is True
+    assert list(restored) == ["antiga"]
+    assert not (tmp_path / "historico.key").exists()
+
+
+def test_concurrent_saves_share_one_key(tmp_path):
+    """Duas instâncias salvando ao mesmo tempo não criam chaves diferentes."""
+    store = KeyStore(str(tmp_path), backend=keystore.FileBackend(str(tmp_path), protect=False))
+    generated = []
+
+    def slow_key():
+        generated.append(None)
+        threading.Event().wait(0.05) # Alarga a janela entre ler e criar a chave
+        return Fernet.generate_key()
+
+    keys = []
+    def save():
+        keys.append(store.get_or_create(PasswordHistory.KEY_NAME, slow_key))
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(keys)) == 1
+    assert len(generated) == 1
+    assert (tmp_path / "historico.key").read_bytes() == keys[0]
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do Serviço HTTP
+
+Sobem o serviço em uma porta livre de localhost e conversam com ele por
+HTTP/1.1 cru, cobrindo lotes, keep-alive, limites de tamanho, o pool de
+processos e a recusa com 503 quando há requisições demais em andamento.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import http_service
+from src.bloom import PersistentBloomFilter
+from src.daemon import PasswordService
+from src.http_service import PasswordHttpService
+from src.logic import PasswordGenerator, _fetch_pwned_hashes
+from src.rng import SeededRandomSource
+
+
+def run_with_service(scenario, **options):
+    """Executa `scenario(porta, serviço)` com o serviço atendendo em localhost."""
+    async def main():
+        options.setdefault("workers", 0)
+        service = PasswordHttpService(PasswordService(PasswordGenerator(SeededRandomSource(3))), **options)
+        await service.start("127.0.0.1", 0)
+        try:
+            return await scenario(service.port, service)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+async def send(reader, writer, method, path, body=None, raw=None):
+    """Envia uma requisição e lê a resposta: (status, cabeçalhos, JSON)."""
+    data = raw if raw is not None else json.dumps(body).encode('utf-8') if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in head[1:] if line)
+    payload = json.loads(await reader.readexactly(int(headers["Content-Length"])))
+    return int(head[0].split()[1]), headers, payload
+
+
+def test_endpoints_and_batches_over_one_connection():
+    async def scenario(port, service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        status, _, single = await send(reader, writer, "POST", "/gerar", {"comprimento": 24, "quantidade": 3})
+        assert status == 200 and [len(p) for p in single["senhas"]] == [24, 24, 24]
+
+        status, _, batch = await send(reader, writer, "POST", "/analisar",
+                                      [{"senha": "curta"}, {"senha": "Senha!Forte123"}, "inválido"])
+        assert status == 200
+        first, second, third = batch["resultados"]
+        assert first["regras"]["length_ok"] is False and second["regras"]["length_ok"] is True
+        assert third["ok"] is False
+
+        status, _, error = await send(reader, writer, "POST", "/frase", {"lista": "Klingon"})
+        assert status == 400 and "Klingon" in error["erro"]
+        assert (await send(reader, writer, "GET", "/gerar"))[0] == 405
+        assert (await send(reader, writer, "POST", "/apagar", {}))[0] == 404
+        assert (await send(reader, writer, "POST", "/gerar", raw=b"{nao e json"))[0] == 400
+        assert (await send(reader, writer, "GET", "/saude"))[2]["ok"] is True
+        writer.close()
+    run_with_service(scenario)
+
+
+def test_oversized_body_is_rejected_without_reading_it():
+    async def scenario(port, service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /gerar HTTP/1.1\r\nContent-Length: {http_service.MAX_BODY_BYTES + 1}\r\n\r\n".encode())
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 413") and b"Connection: close" in head
+        writer.close()
+    run_with_service(scenario)
+
+
+def test_large_batches_run_in_the_process_pool():
+    async def scenario(port, service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        status, _, response = await send(reader, writer, "POST", "/gerar",
+                                         [{"comprimento": 12, "quantidade": 50}, {"entropia": 64, "quantidade": 50}])
+        writer.close()
+        return status, response
+    status, response = run_with_service(scenario, workers=1, pool_threshold=100)
+    assert status == 200
+    passwords = [p for result in response["resultados"] for p in result["senhas"]]
+    assert len(set(passwords)) == 100
+
+
+def test_overload_is_answered_with_503(mocker):
+    """Com o limite de requisições em andamento atingido, as novas são recusadas na hora."""
+    _fetch_pwned_hashes.cache_clear()
+    release = threading.Event()
+    def slow_get(*args, **kwargs):
+        release.wait(5)
+        return Mock(text="")
+    mocker.patch('requests.get', side_effect=slow_get)
+
+    async def scenario(port, service):
+        slow = await asyncio.open_connection("127.0.0.1", port)
+        pending = asyncio.ensure_future(send(*slow, "POST", "/verificar", {"senha": "lenta"}))
+        while service.pending == 0:
+            await asyncio.sleep(0.01)
+        status, headers, _ = await send(*await asyncio.open_connection("127.0.0.1", port), "POST", "/gerar", {})
+        release.set()
+        first_status, _, first = await pending
+        return status, headers, first_status, first
+    status, headers, first_status, first = run_with_service(scenario, max_pending=1)
+    assert status == 503 and headers["Retry-After"] == "1"
+    assert first_status == 200 and first["vazada"] is False
+
+
+def test_generation_never_runs_on_the_event_loop():
+    """Uma geração lenta (e abaixo do limiar do pool) não atrasa /saude em outra conexão."""
+    async def scenario(port, service):
+        slow_generate = service.service.generate
+        def generate(**params):
+            time.sleep(0.5)
+            return slow_generate(**params)
+        service.service.commands["gerar"] = generate
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        pending = asyncio.ensure_future(send(reader, writer, "POST", "/gerar", {"comprimento": 12}))
+        while service.pending == 0:
+            await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        status, _, health = await send(*await asyncio.open_connection("127.0.0.1", port), "GET", "/saude")
+        elapsed = time.perf_counter() - started
+        generated = await pending
+
+        huge = await send(reader, writer, "POST", "/gerar", {"comprimento": 1_000_000})
+        writer.close()
+        return status, health, elapsed, generated, huge
+    status, health, elapsed, generated, huge = run_with_service(scenario)
+    assert status == 200 and health["pendentes"] == 1
+    assert elapsed < 0.25
+    assert generated[0] == 200
+    assert huge[0] == 400 and "comprimento" in huge[2]["erro"]
+
+
+def test_breach_checks_have_a_smaller_batch_limit():
+    async def scenario(port, service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        items = [{"senha": f"senha-{i}"} for i in range(http_service.MAX_CHECK_ITEMS + 1)]
+        status, _, response = await send(reader, writer, "POST", "/verificar", items)
+        writer.close()
+        return status, response
+    status, response = run_with_service(scenario)
+    assert status == 413 and str(http_service.MAX_CHECK_ITEMS) in response["erro"]
+
+
+def test_idle_keep_alive_connections_are_closed(monkeypatch):
+    monkeypatch.setattr(http_service, "IDLE_TIMEOUT", 0.1)
+
+    async def scenario(port, service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        status, _, _ = await send(reader, writer, "GET", "/saude")
+        closed = await asyncio.wait_for(reader.read(), 2) # EOF: o servidor fechou a conexão parada
+        writer.close()
+        return status, closed
+    assert run_with_service(scenario) == (200, b"")
+
+
+def test_invalid_entropy_targets_are_rejected():
+    async def scenario(port, service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        nan = await send(reader, writer, "POST", "/gerar", {"entropia": "nan"})
+        low = await send(reader, writer, "POST", "/gerar", {"entropia": 1})
+        batch = await send(reader, writer, "POST", "/gerar", [{"entropia": "nan"}, {"entropia": 60}])
+        writer.close()
+        return nan, low, batch
+    nan, low, batch = run_with_service(scenario)
+    assert nan[0] == 400 and low[0] == 400
+    first, second = batch[2]["resultados"]
+    assert first["ok"] is False and second["ok"] is True and len(second["senhas"][0]) >= 8
+
+
+def test_registry_keeps_large_batches_in_this_process(tmp_path):
+    """Com registro, até os lotes grandes são registrados: não vão para processos que não o enxergam."""
+    registry = PersistentBloomFilter(str(tmp_path / "emitidas.bloom"), capacity=1000)
+
+    async def main():
+        service = PasswordHttpService(PasswordService(issued=registry), workers=1, pool_threshold=1)
+        await service.start("127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            status, _, response = await send(reader, writer, "POST", "/gerar", {"quantidade": 50})
+            writer.close()
+            return status, response
+        finally:
+            await service.close()
+    status, response = asyncio.run(main())
+    assert status == 200 and len(response["senhas"]) == 50
+    assert len(registry) == 50
+    registry.close()
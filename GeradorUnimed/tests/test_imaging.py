@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Módulo de Processamento de Imagem
+
+Garante que as operações do editor de capturas produzem o mesmo
+resultado visual sem depender da interface gráfica.
+"""
+
+import os
+import sys
+
+import pytest
+from PIL import Image, ImageChops
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.imaging import Viewport, apply_spotlight, render
+
+
+def _reference_spotlight(image, x1, y1, x2, y2):
+    """Implementação original (camada preta do tamanho da imagem)."""
+    from PIL import ImageDraw
+    mask = Image.new('L', image.size, 150)
+    ImageDraw.Draw(mask).rectangle([x1, y1, x2, y2], fill=0)
+    black_layer = Image.new('RGBA', image.size, (0, 0, 0, 255))
+    black_layer.putalpha(mask)
+    return Image.alpha_composite(image.convert("RGBA"), black_layer)
+
+
+def test_spotlight_matches_alpha_composite():
+    """O resultado deve ser equivalente ao da composição alfa original."""
+    image = Image.new("RGBA", (120, 80), (200, 100, 50, 255))
+    expected = _reference_spotlight(image, 20, 10, 60, 40)
+
+    result = apply_spotlight(image.copy(), 20, 10, 60, 40)
+
+    extrema = ImageChops.difference(result, expected).getextrema()
+    assert max(high for _, high in extrema) <= 1
+    # A área selecionada inclui a borda direita/inferior, como no ImageDraw
+    assert result.getpixel((30, 20)) == (200, 100, 50, 255)
+    assert result.getpixel((0, 0)) != (200, 100, 50, 255)
+
+
+def test_spotlight_keeps_mode_and_works_in_place():
+    """A imagem não deve ser convertida nem copiada."""
+    image = Image.new("RGB", (50, 50), (255, 255, 255))
+    result = apply_spotlight(image, 40, 40, 10, 10)  # Coordenadas invertidas
+    assert result is image
+    assert image.mode == "RGB"
+    assert image.getpixel((25, 25)) == (255, 255, 255)
+    assert image.getpixel((5, 5))[0] < 255
+
+
+def test_spotlight_clamps_out_of_bounds_selection():
+    """Seleções que ultrapassam a imagem não devem gerar erro."""
+    image = Image.new("L", (30, 30), 255)
+    apply_spotlight(image, -10, -10, 100, 100)
+    assert image.getpixel((0, 0)) == 255
+
+
+def test_render_applies_operations_at_full_resolution():
+    """A exportação aplica as operações na original sem modificá-la."""
+    source = Image.new("RGB", (200, 100), (255, 255, 255))
+    operations = [
+        {"op": "rectangle", "coords": [150, 80, 10, 10]},  # Coordenadas invertidas
+        {"op": "crop", "coords": [5, 5, 105, 55]},
+        {"op": "arrow", "coords": [20, 20, 60, 40]},
+    ]
+    result = render(source, operations)
+
+    assert result.size == (100, 50)
+    assert result.getpixel((5, 5)) == (255, 0, 0)  # Canto do retângulo (10, 10) na original
+    assert source.getpixel((10, 10)) == (255, 255, 255)
+
+
+def test_viewport_proxy_follows_window_size():
+    """A prévia tem o tamanho da janela, não o da imagem."""
+    source = Image.new("RGB", (7680, 2160), (120, 120, 120))
+    viewport = Viewport(source, 960, 540)
+    proxy = viewport.render()
+
+    assert proxy.size == (960, 270)
+    assert viewport.origin == (0, 135)
+    # A pirâmide usa uma redução da original em vez de reamostrá-la inteira
+    assert max(viewport._levels) == 8
+
+
+def test_viewport_maps_canvas_to_image_coordinates():
+    """Coordenadas do canvas devem voltar ao espaço da original, com zoom e pan."""
+    source = Image.new("RGB", (4000, 2000))
+    viewport = Viewport(source, 1000, 500)
+    viewport.render()
+    assert viewport.to_image(0, 0) == (0, 0)
+    assert viewport.to_image(500, 250) == (2000, 1000)
+
+    viewport.zoom_at(2.0, 250, 125)
+    viewport.render()
+    assert viewport.to_image(250, 125) == pytest.approx((1000, 500))
+    x, y = viewport.to_canvas(*viewport.to_image(10, 20))
+    assert (x, y) == pytest.approx((10, 20))
+
+    viewport.pan(-100000, 0)  # Não pode sair da imagem
+    viewport.render()
+    assert viewport.region[2] == pytest.approx(4000)
+
+
+def test_viewport_crop_redefines_visible_area():
+    """O corte restringe a área exibida e a exportação."""
+    source = Image.new("RGB", (1000, 1000), (255, 255, 255))
+    viewport = Viewport(source, 500, 500)
+    assert viewport.add_operation({"op": "crop", "coords": [100, 100, 102, 102]}) is False
+    assert viewport.add_operation({"op": "crop", "coords": [600, 700, 100, 200]}) is True
+    viewport.add_operation({"op": "spotlight", "coords": [200, 300, 300, 400]})
+
+    viewport.render()
+    assert viewport.region == (100, 200, 600, 700)
+    assert viewport.to_image(0, 0) == (100, 200)
+
+    exported = viewport.render_full()
+    assert exported.size == (500, 500)
+    assert exported.getpixel((150, 150)) == (255, 255, 255)
+    assert exported.getpixel((0, 0))[0] < 255
+
+
+@pytest.mark.parametrize("mode", ["P", "1", "I;16"])
+def test_viewport_reduces_images_in_any_mode(mode):
+    """Imagens grandes em modos que reduce() não aceita ainda geram a prévia."""
+    viewport = Viewport(Image.new(mode, (4000, 3000)), 400, 300)
+    proxy = viewport.render()
+    assert proxy.size == (400, 300) and proxy.mode in ("RGB", "RGBA")
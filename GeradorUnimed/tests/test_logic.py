@@ -9,6 +9,7 @@ garantindo que a lógica de geração de senhas e frases-senha está correta.
 import os
 import sys
 import pytest
+import math
 import string
 
 # Adiciona o diretório raiz do projeto ao sys.path
@@ -97,3 +98,34 @@ def test_analyze_password_entropy(generator):
     entropy = generator.analyze_password(password, "")
     # Entropia = 12 * log2(36) ~= 62.1
     assert 62.0 < entropy < 62.2
+
+def test_generate_for_entropy_uses_minimum_length(generator):
+    """O modo de entropia-alvo usa o menor comprimento que atinge os bits pedidos."""
+    password, entropy = generator.generate_for_entropy(100, True, True, True, True, False, "!@#$%^&*")
+    assert entropy >= 100
+    classes = generator.character_classes(True, True, True, True, False, "!@#$%^&*")
+    shorter, _ = generator.minimum_length(0, classes)
+    assert len(password) == 17  # 16 caracteres de um alfabeto de 70 dão ~98 bits
+    assert shorter == PasswordGenerator.MIN_LENGTH  # Nunca menor que o mínimo da política
+    assert generator.minimum_length(0, classes, min_length=1)[0] == 4  # Nem que o número de classes
+    assert any(c in string.ascii_uppercase for c in password)
+    assert any(c in "!@#$%^&*" for c in password)
+
+def test_entropy_table_accounts_for_required_classes(generator):
+    """A entropia desconta as senhas que não contêm todas as classes."""
+    classes = generator.character_classes(False, True, True, False, False, "")
+    length, entropy = generator.minimum_length(50, classes)
+    # Alfabeto de 36: 10 caracteres dão 51,7 bits sem a política, menos com ela
+    assert length == 10
+    assert 50 <= entropy < 10 * math.log2(36)
+
+def test_generate_for_entropy_rejects_non_finite_targets(generator):
+    """NaN ou infinito não viram uma senha curta: geram erro."""
+    for target in (float("nan"), float("inf"), float("-inf")):
+        with pytest.raises(ValueError):
+            generator.generate_for_entropy(target, True, True, True, True, False, "!@#")
+
+def test_generate_for_entropy_rejects_unreachable_target(generator):
+    """Um alvo impossível dentro do comprimento máximo gera erro."""
+    with pytest.raises(ValueError):
+        generator.generate_for_entropy(500, False, False, True, False, False, "", max_length=64)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Módulo de Métricas
+
+Garante que a coleta desligada não registra nada, que os histogramas e
+contadores são exportados corretamente (JSON e Prometheus) e que o cache
+da verificação de vazamento é contabilizado.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import logic
+from src.metrics import MetricsRegistry, metrics
+from src.ui.diagnostics import report_lines
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(enabled=True)
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    counter = registry.counter("chamadas_total")
+    histogram = registry.histogram("tempo_segundos")
+    timed = histogram.timed(lambda x: x * 2)
+
+    counter.inc()
+    histogram.observe(0.1)
+    with histogram.time() as span:
+        pass
+
+    assert timed(21) == 42
+    assert counter.value == 0 and histogram.count == 0
+    assert span is histogram.time() # Contexto compartilhado, sem alocação
+    assert registry.clock() is None
+
+
+def test_histogram_and_exports(registry, tmp_path):
+    counter = registry.counter("chamadas_total", "Chamadas.")
+    histogram = registry.histogram("tempo_segundos", "Tempo.", buckets=(0.01, 0.1, 1.0))
+    assert registry.counter("chamadas_total") is counter
+    with pytest.raises(ValueError):
+        registry.histogram("chamadas_total")
+
+    counter.inc(3)
+    for value in (0.005, 0.05, 0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(1.0) == float("inf")
+    text = registry.to_prometheus()
+    assert "# TYPE gerador_chamadas_total counter\ngerador_chamadas_total 3\n" in text
+    assert 'gerador_tempo_segundos_bucket{le="0.1"} 3\n' in text
+    assert 'gerador_tempo_segundos_bucket{le="+Inf"} 5\n' in text
+    assert "gerador_tempo_segundos_count 5\n" in text
+
+    registry.export(str(tmp_path / "metricas.json"))
+    registry.export(str(tmp_path / "metricas.prom"))
+    snapshot = json.loads((tmp_path / "metricas.json").read_text(encoding='utf-8'))
+    assert snapshot["contadores"] == {"chamadas_total": 3}
+    assert snapshot["histogramas"]["tempo_segundos"]["faixas"][-1] == ["+Inf", 5]
+    assert (tmp_path / "metricas.prom").read_text(encoding='utf-8') == text
+
+    registry.reset()
+    assert counter.value == 0 and histogram.count == 0
+
+
+def test_pwned_cache_hits_are_counted(mocker):
+    """Duas verificações com o mesmo prefixo: uma requisição, um acerto de cache."""
+    mocker.patch.object(metrics, "enabled", True)
+    metrics.reset()
+    logic._fetch_pwned_hashes.cache_clear()
+    mocker.patch('requests.get', return_value=Mock(text="SOMEOTHERHASH:10"))
+
+    logic.check_pwned("password")
+    logic.check_pwned("password")
+
+    assert logic.PWNED_LOOKUPS.value == 2
+    assert logic.PWNED_MISSES.value == 1
+    assert logic.PWNED_CHECK_SECONDS.count == 2
+    assert any("acertos do cache Pwned" in line and "50%" in line for line in report_lines(metrics))
+    metrics.reset()
+    logic._fetch_pwned_hashes.cache_clear()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Módulo de Recursos
+
+Garante que o manifesto versionado corresponde aos arquivos, que os
+metadados vêm só do manifesto e que os recursos são lidos de dentro de
+um zip (como em um executável congelado).
+"""
+
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.resources import MANIFEST_NAME, AssetBundle, assets, build_manifest
+
+
+def test_manifest_is_up_to_date():
+    """O manifesto versionado deve ser regenerado (python -m src.resources) ao mudar os recursos."""
+    assert assets.manifest == build_manifest()
+
+
+def test_wordlists_come_from_manifest_only(mocker):
+    """Listar as wordlists e seus metadados não abre nenhum recurso."""
+    bundle = AssetBundle()
+    resource = mocker.spy(bundle, "_resource")
+
+    wordlists = bundle.wordlists()
+
+    assert wordlists["Português (Básico)"] == "wordlists/portugues_basico.txt"
+    assert bundle.info(wordlists["Animais (PT-BR)"])["palavras"] > 0
+    resource.assert_not_called()
+
+
+@pytest.fixture
+def zipped_bundle(tmp_path):
+    """Pacote `pacote_zip` com recursos, importado de um arquivo zip."""
+    files = {"wordlists/cores.txt": b"azul verde\nvermelho\n", "icone.bin": bytes(range(256))}
+    archive = tmp_path / "app.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("pacote_zip/__init__.py", "")
+        for name, data in files.items():
+            zf.writestr(f"pacote_zip/assets/{name}", data)
+    with zipfile.ZipFile(archive, "a") as zf:
+        manifest = build_manifest(zipfile.Path(zf, "pacote_zip/assets/"))
+        zf.writestr(f"pacote_zip/assets/{MANIFEST_NAME}", json.dumps(manifest))
+
+    sys.path.insert(0, str(archive))
+    yield AssetBundle("pacote_zip"), files
+    sys.path.remove(str(archive))
+    sys.modules.pop("pacote_zip", None)
+
+
+def test_reads_resources_from_zip(zipped_bundle):
+    bundle, files = zipped_bundle
+
+    assert bundle.wordlists() == {"cores.txt": "wordlists/cores.txt"}
+    assert bundle.info("wordlists/cores.txt")["palavras"] == 3
+    assert bundle.read_text("wordlists/cores.txt") == "azul verde\nvermelho\n"
+    with bundle.open_binary("icone.bin") as f:
+        assert f.read() == files["icone.bin"]
+    # Lido uma única vez
+    assert bundle.read_bytes("wordlists/cores.txt", verify=True) is bundle.read_bytes("wordlists/cores.txt")
+
+
+def test_rejects_unknown_and_altered_resources(zipped_bundle):
+    bundle, _ = zipped_bundle
+    with pytest.raises(FileNotFoundError):
+        bundle.read_bytes("../../segredo.txt")
+
+    bundle.manifest["arquivos"]["icone.bin"]["sha256"] = "0" * 64
+    with pytest.raises(ValueError):
+        bundle.read_bytes("icone.bin", verify=True)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para as Fontes de Aleatoriedade
+
+Garante que as fontes são intercambiáveis no PasswordGenerator, que a
+fonte com semente é reprodutível e que a fonte em blocos não tem viés.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import rng
+from src.logic import PasswordGenerator
+from src.rng import BufferedRandomSource, RandomSource, SeededRandomSource, SystemRandomSource
+
+
+def test_seeded_source_pins_every_generation_path():
+    """A mesma semente reproduz senhas, frases e o modo de entropia-alvo."""
+    def outputs(seed):
+        generator = PasswordGenerator(SeededRandomSource(seed))
+        return (
+            generator.generate(16, True, True, True, True, False, "!@#"),
+            generator.generate_passphrase(4, "-", ["casa", "gato", "sol", "mar", "rio"]),
+            generator.generate_for_entropy(80, True, True, True, False, False, ""),
+        )
+
+    assert outputs(7) == outputs(7)
+    assert outputs(7) != outputs(8)
+
+
+@pytest.mark.parametrize("source", [SystemRandomSource(), BufferedRandomSource(), SeededRandomSource(1)])
+def test_sources_share_interface(source):
+    """Todas as fontes respeitam os limites e embaralham sem perder itens."""
+    assert all(0 <= source.randbelow(10) < 10 for _ in range(200))
+    assert source.choice("abc") in "abc"
+    items = list(range(20))
+    source.shuffle(items)
+    assert sorted(items) == list(range(20))
+
+
+def test_buffered_source_reads_in_blocks(mocker):
+    """A fonte em blocos consulta o SO uma vez para muitos sorteios."""
+    urandom = mocker.spy(rng.os, "urandom")
+    source = BufferedRandomSource(block_size=4096)
+    for _ in range(1000):
+        source.randbelow(62)
+    assert urandom.call_count == source.refills == 1
+
+
+def test_buffered_source_is_unbiased():
+    """Com n que não é potência de 2, a rejeição mantém a distribuição uniforme."""
+    source = BufferedRandomSource()
+    counts = Counter(source.randbelow(3) for _ in range(30000))
+    assert set(counts) == {0, 1, 2}
+    assert all(abs(count - 10000) < 600 for count in counts.values())
+    with pytest.raises(ValueError):
+        source.randbelow(0)
+
+
+def test_pool_wipes_consumed_bytes():
+    """Os bytes entregues são zerados no pool."""
+    source = BufferedRandomSource(block_size=64)
+    for _ in range(10):
+        source.randbelow(2 ** 32)
+    assert 0 < source._pos < len(source._buffer)
+    assert not any(source._buffer[:source._pos])
+    assert any(source._buffer[source._pos:])
+
+
+def test_pool_is_thread_safe():
+    """Threads concorrentes nunca recebem os mesmos bytes do pool."""
+    source = BufferedRandomSource(block_size=256)
+    results = []
+
+    def draw():
+        values = [source.randbelow(2 ** 64) for _ in range(500)]
+        results.extend(values)
+
+    threads = [threading.Thread(target=draw) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == len(results) == 4000
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork indisponível")
+def test_pool_reseeds_after_fork():
+    """Pai e filho não podem sortear os mesmos valores do bloco herdado."""
+    source = BufferedRandomSource()
+    source.randbelow(256)  # Garante um bloco já carregado antes do fork
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, bytes(source.randbelow(256) for _ in range(32)))
+        os._exit(0)
+
+    os.close(write_fd)
+    parent = bytes(source.randbelow(256) for _ in range(32))
+    with os.fdopen(read_fd, "rb") as pipe:
+        child = pipe.read()
+    os.waitpid(pid, 0)
+    assert len(child) == 32
+    assert child != parent
+
+
+def test_random_source_requires_randbelow():
+    """Uma fonte sem `randbelow` falha ao ser criada, não no primeiro sorteio."""
+    class Incomplete(RandomSource):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o SettingsManager
+
+Garante que as configurações são gravadas de forma atômica e adiada,
+no diretório do usuário, sem expor o dicionário de padrões.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import logic
+from src.config import CONFIG
+from src.logic import SettingsManager, user_config_dir
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    return str(tmp_path / "cfg" / "config.json")
+
+
+def test_default_location_is_per_user(monkeypatch, tmp_path):
+    """Sem caminho explícito, o arquivo fica no diretório do usuário (não no atual)."""
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    assert user_config_dir() == os.path.join(str(tmp_path), "GeradorUnimed")
+    assert SettingsManager().filename == os.path.join(str(tmp_path), "GeradorUnimed", "config.json")
+
+
+def test_load_returns_copy_of_defaults(config_path, monkeypatch):
+    """Alterar o resultado não pode alterar CONFIG["DEFAULTS"]."""
+    monkeypatch.setattr(SettingsManager, "LEGACY_FILENAME", config_path + ".inexistente")
+    settings = SettingsManager(config_path).load_settings()
+    settings["comprimento"] = 99
+    assert CONFIG["DEFAULTS"]["comprimento"] != 99
+
+
+def test_changes_are_flushed_in_background(config_path):
+    """Uma rajada de alterações gera uma única gravação após o atraso."""
+    manager = SettingsManager(config_path, flush_delay=0.05)
+    for length in range(20, 30):
+        manager.set("comprimento", length)
+    assert not os.path.exists(config_path)
+
+    deadline = time.monotonic() + 5
+    while not os.path.exists(config_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with open(config_path, encoding='utf-8') as f:
+        assert json.load(f)["comprimento"] == 29
+
+
+def test_flush_is_atomic_and_skips_unchanged(config_path, mocker):
+    """A gravação usa rename atômico e não acontece se nada mudou."""
+    manager = SettingsManager(config_path)
+    replace = mocker.spy(logic.os, "replace")
+    manager.set("separador", "_")
+    assert manager.flush() is True
+    assert replace.call_count == 1
+    assert [name for name in os.listdir(os.path.dirname(config_path))] == ["config.json"]
+
+    manager.set("separador", "_")  # Mesmo valor: nada a gravar
+    assert manager.flush() is False
+    assert replace.call_count == 1
+
+    with open(config_path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved["separador"] == "_"
+    assert SettingsManager(config_path).load_settings()["separador"] == "_"
+
+
+def test_only_changed_keys_are_serialized(config_path, mocker):
+    """As demais chaves reaproveitam o JSON já serializado."""
+    manager = SettingsManager(config_path)
+    manager.load_settings()
+    dumps = mocker.spy(logic.json, "dumps")
+    manager.set("num_palavras", 6)
+    manager.flush()
+    serialized = [call.args[0] for call in dumps.call_args_list]
+    assert 6 in serialized
+    assert CONFIG["DEFAULTS"]["caracteres_especiais"] not in serialized
+
+
+def test_slow_disk_does_not_block_set(config_path, mocker):
+    """Durante uma gravação lenta, `set` (thread do Tk) continua livre e a alteração não se perde."""
+    manager = SettingsManager(config_path, flush_delay=60)
+    writing, release = threading.Event(), threading.Event()
+    original = manager._write_atomic
+    def slow_write(document):
+        writing.set()
+        release.wait(5)
+        original(document)
+    mocker.patch.object(manager, "_write_atomic", side_effect=slow_write)
+
+    manager.set("separador", "_")
+    flusher = threading.Thread(target=manager.flush)
+    flusher.start()
+    assert writing.wait(5)
+    started = time.monotonic()
+    manager.set("separador", ".")
+    assert time.monotonic() - started < 0.5
+    release.set()
+    flusher.join(5)
+    assert manager.flush() is True
+    with open(config_path, encoding='utf-8') as f:
+        assert json.load(f)["separador"] == "."
+
+
+def test_changes_reuse_one_writer_thread(config_path, mocker):
+    """Cada alteração reagenda a gravação sem criar uma thread nova."""
+    start = mocker.spy(threading.Thread, "start")
+    manager = SettingsManager(config_path, flush_delay=60)
+    for length in range(20, 40):
+        manager.set("comprimento", length)
+    assert start.call_count == 1
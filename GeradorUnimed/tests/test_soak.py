@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Teste de longa duração (soak) da interface, com `tracemalloc`.
+
+Repete milhares de ciclos de uso (gerar e copiar, passar o mouse sobre as
+dicas, abrir e fechar as opções avançadas, editar capturas) sobre a
+aplicação real com o Tk falso de `tests.ui_harness`, e mede o crescimento
+da memória de cada subsistema. Cada ciclo roda primeiro um aquecimento, que
+enche os caches limitados (histórico de 100 senhas, cache Pwned de 128
+prefixos, últimas 256 latências do executor); depois disso a memória
+retida precisa ficar dentro do orçamento do subsistema.
+
+Para uma sessão mais longa, multiplique os ciclos medidos:
+    GERADOR_SOAK_FATOR=20 python -m pytest tests/test_soak.py -s
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+import pytest
+from PIL import Image
+
+# Adiciona o diretório raiz do projeto ao path para encontrar os módulos
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tests.ui_harness import UiHarness
+
+SCALE = max(1, int(os.environ.get("GERADOR_SOAK_FATOR", "1")))
+
+# Memória que cada subsistema pode reter depois do aquecimento (bytes)
+BUDGETS = {
+    "geracao": 16 * 1024,
+    "dicas": 8 * 1024,
+    "opcoes": 32 * 1024,
+    "editor": 64 * 1024,
+}
+
+
+@pytest.fixture(scope="module")
+def harness(tmp_path_factory):
+    # O rastreamento começa antes da aplicação, para que o que o aquecimento
+    # libera também tenha sido contado quando alocado
+    tracemalloc.start()
+    h = UiHarness(tmp_path_factory.mktemp("soak"))
+    yield h
+    h.close()
+    tracemalloc.stop()
+
+
+def generate_and_copy(h):
+    h.click(h.app.tab_senha.gerar_senha_btn)
+    h.settle()
+    h.click(h.app.tab_senha.copiar_btn)
+    h.settle()
+
+
+def hover_tooltips(h):
+    for widget in h.hoverable_widgets():
+        h.hover(widget)
+
+
+def open_and_close_options(h):
+    h.app.dispatch("abrir_opcoes", h.app.open_advanced_options)
+    h.settle()
+    h.app.dispatch("fechar_opcoes", h.app.advanced_options_window.destroy)
+
+
+SCREENSHOT = Image.new("RGB", (1600, 900), (200, 200, 200))
+
+
+def edit_screenshot(h):
+    editor = h.open_editor(SCREENSHOT)
+    h.run_for(20)
+    h.wheel(editor.canvas, 100, 100)
+    h.run_for(20) # Cada refresh cria uma PhotoImage nova
+    h.drag(editor.canvas, 3, (10, 10), (50, 40))
+    h.run_for(20)
+    editor.select_tool(editor.TOOL_RECTANGLE)
+    h.drag(editor.canvas, 1, (10, 10), (200, 150))
+    h.run_for(20)
+    h.app.dispatch("salvar_edicao", editor.save_and_close)
+
+
+# subsistema -> (ciclo, ciclos de aquecimento, ciclos medidos)
+CYCLES = {
+    "geracao": (generate_and_copy, 260, 150),
+    "dicas": (hover_tooltips, 50, 500),
+    "opcoes": (open_and_close_options, 50, 300),
+    "editor": (edit_screenshot, 5, 30),
+}
+
+
+def retained_growth(h, cycle, warmup, measured):
+    """Memória retida (bytes) pelos ciclos medidos e as linhas que mais cresceram."""
+    for _ in range(warmup):
+        cycle(h)
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    for _ in range(measured):
+        cycle(h)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    return sum(stat.size_diff for stat in diff), diff[:8]
+
+
+@pytest.mark.parametrize("subsystem", list(CYCLES))
+def test_memory_stays_bounded(harness, subsystem):
+    cycle, warmup, measured = CYCLES[subsystem]
+    growth, top = retained_growth(harness, cycle, warmup, measured * SCALE)
+    print(f"\n{subsystem}: {measured * SCALE} ciclos, {growth / 1024:+.1f} KiB "
+          f"(orçamento {BUDGETS[subsystem] / 1024:.0f} KiB)")
+    assert growth <= BUDGETS[subsystem], (
+        f"{subsystem} reteve {growth} bytes em {measured * SCALE} ciclos:\n"
+        + "\n".join(str(stat) for stat in top))
+
+
+def test_ui_objects_are_released(harness):
+    """Ao fim dos ciclos, nenhuma janela ou imagem fica viva além das da aplicação."""
+    gc.collect()
+    app = harness.app
+    assert app.advanced_options_window is None or not app.advanced_options_window.winfo_exists()
+    editor_class = harness.ui["src.ui.screenshot_editor"].ScreenshotEditor
+    assert not [obj for obj in gc.get_objects() if isinstance(obj, editor_class)]
+    # Uma única janela de dica, reaproveitada por todos os widgets
+    assert harness.ui["src.ui.utils"].tooltip_manager.windows_created <= 1
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Registro de Estilos da UI
+
+Garante que cada fonte é criada uma única vez e que a troca de tema
+recolore os widgets registrados em uma só passada, sem display.
+"""
+
+import os
+import sys
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.ui.styles import StyleRegistry
+
+
+class FakeWidget:
+    """Widget mínimo que guarda as opções recebidas pelo configure."""
+    def __init__(self):
+        self.options = {}
+        self.configure_calls = 0
+        self.exists = True
+
+    def configure(self, **options):
+        self.options.update(options)
+        self.configure_calls += 1
+
+    def winfo_exists(self):
+        return self.exists
+
+
+@pytest.fixture
+def ctk_font(mocker):
+    return mocker.patch("src.ui.styles.customtkinter.CTkFont", side_effect=lambda **kw: dict(kw))
+
+
+@pytest.fixture
+def registry(ctk_font):
+    return StyleRegistry(
+        font_specs={"CORPO": {"size": 14}, "TITULO": {"size": 24, "weight": "bold"}},
+        themes={"normal": {"FUNDO": "black"}, "corporativo": {"FUNDO": "#1a1a1a"}},
+    )
+
+
+def test_fonts_are_created_once(registry, ctk_font):
+    """Pedir a mesma fonte várias vezes (ex: reabrir a janela de opções) não cria fontes novas."""
+    fonts = [registry.font("CORPO") for _ in range(50)]
+    registry.font("TITULO")
+
+    assert all(font is fonts[0] for font in fonts)
+    assert fonts[0] == {"size": 14}
+    assert ctk_font.call_count == 2
+
+
+def test_theme_change_recolors_registered_widgets(registry):
+    """A troca de tema aplica as novas cores a todos os widgets registrados."""
+    widgets = [registry.themed(FakeWidget(), bg="FUNDO") for _ in range(3)]
+    assert all(w.options == {"bg": "black"} for w in widgets)
+
+    widgets[2].exists = False # Destruído no Tk
+    registry.apply_theme("corporativo")
+    registry.apply_theme("corporativo") # Sem mudança, nada é reconfigurado
+
+    assert [w.options["bg"] for w in widgets] == ["#1a1a1a", "#1a1a1a", "black"]
+    assert [w.configure_calls for w in widgets] == [2, 2, 1]
+    assert len(registry._themed) == 2
+
+
+def test_unknown_theme_is_rejected(registry):
+    with pytest.raises(ValueError):
+        registry.apply_theme("inexistente")
+    assert registry.theme == "normal"
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Executor de Tarefas da UI
+
+Usa uma raiz falsa no lugar do Tk: os callbacks do `after` são executados
+manualmente, simulando o laço de eventos na thread principal.
+"""
+
+import os
+import sys
+import threading
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.ui.tasks import TaskExecutor
+
+
+class FakeRoot:
+    """Substitui o Tk: guarda os callbacks do `after` para execução manual."""
+    def __init__(self):
+        self.scheduled = []
+        self.lock = threading.Lock()
+
+    def after(self, ms, func):
+        with self.lock:
+            self.scheduled.append(func)
+            return f"after#{len(self.scheduled)}"
+
+    def run_until_idle(self, timeout=5):
+        """Executa os callbacks agendados até não restar nenhum."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                scheduled, self.scheduled = self.scheduled, []
+            if not scheduled:
+                return
+            for func in scheduled:
+                func()
+            time.sleep(0.001)
+        raise AssertionError("Fila de tarefas não esvaziou")
+
+
+def test_results_are_delivered_on_polling_thread():
+    """Os callbacks devem rodar na thread que consulta a fila (a do Tk)."""
+    root = FakeRoot()
+    executor = TaskExecutor(root, max_workers=2)
+    delivered = []
+
+    for i in range(5):
+        executor.submit(None, lambda x: x * 2, i, callback=lambda r: delivered.append((r, threading.current_thread())))
+    root.run_until_idle()
+
+    assert sorted(r for r, _ in delivered) == [0, 2, 4, 6, 8]
+    assert all(thread is threading.current_thread() for _, thread in delivered)
+    metrics = executor.metrics()
+    assert metrics["completed"] == 5
+    assert metrics["queue_depth"] == 0
+    assert metrics["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_same_key_supersedes_previous_task():
+    """Uma nova tarefa com a mesma chave descarta o resultado da anterior."""
+    root = FakeRoot()
+    executor = TaskExecutor(root, max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    delivered = []
+
+    def slow_task():
+        started.set()
+        release.wait(5)
+        return "antiga"
+
+    executor.submit("status", slow_task, callback=delivered.append)
+    started.wait(5)
+    executor.submit("status", lambda: "intermediaria", callback=delivered.append)  # Cancelada antes de começar
+    executor.submit("status", lambda: "nova", callback=delivered.append)
+    release.set()
+    root.run_until_idle()
+
+    assert delivered == ["nova"]
+    metrics = executor.metrics()
+    assert metrics["superseded"] == 1
+    assert metrics["cancelled"] == 1
+    assert metrics["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_pool_is_bounded_and_errors_are_counted():
+    """Muitas tarefas não criam threads além do limite; exceções não chegam ao Tk."""
+    root = FakeRoot()
+    executor = TaskExecutor(root, max_workers=2)
+    before = threading.active_count()
+
+    for i in range(50):
+        executor.submit(f"widget-{i}", time.sleep, 0.001)
+    executor.submit(None, lambda: 1 / 0, callback=lambda r: None)
+    assert threading.active_count() - before <= 2
+    root.run_until_idle()
+
+    metrics = executor.metrics()
+    assert metrics["errors"] == 1
+    assert metrics["completed"] == 50
+    assert metrics["latency_ms"]["max"] >= metrics["latency_ms"]["avg"] > 0
+    executor.shutdown()
+
+
+
+class EagerRoot(FakeRoot):
+    """Raiz em que o primeiro `after` roda o callback antes de retornar (corrida com a thread do Tk)."""
+    def __init__(self):
+        super().__init__()
+        self.eager = True
+
+    def after(self, ms, func):
+        if not self.eager:
+            return super().after(ms, func)
+        self.eager = False
+        time.sleep(0.05) # A tarefa termina e o _drain a entrega antes de `after` retornar
+        func()
+        return "after#imediato"
+
+
+def test_polling_survives_drain_running_before_after_returns():
+    """Um _drain que roda antes de `after` retornar não pode deixar a consulta desligada."""
+    root = EagerRoot()
+    executor = TaskExecutor(root, max_workers=1)
+    delivered = []
+
+    executor.submit(None, lambda: 1, callback=delivered.append)
+    executor.submit(None, lambda: 2, callback=delivered.append)
+    root.run_until_idle()
+    assert delivered == [1, 2]
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Testes de Responsividade da UI (sem display)
+
+Dirige a aplicação real pelo harness de `tests/ui_harness.py` e falha se
+algum callback ocupar a thread principal além do orçamento, ou se as
+interações passarem a criar threads novas a cada uso.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tests.ui_harness import UiHarness
+
+# Orçamento por callback na thread principal (folgado para máquinas de CI lentas)
+CALLBACK_BUDGET_MS = 100
+
+
+@pytest.fixture
+def harness(tmp_path):
+    harness = UiHarness(tmp_path)
+    yield harness
+    harness.close()
+
+
+def run_session(harness, rounds):
+    app = harness.app
+    for i in range(rounds):
+        harness.click(app.tab_senha.gerar_senha_btn)
+        harness.settle()
+        harness.click(app.tab_senha.copiar_btn)
+        harness.select_history(0)
+        harness.settle()
+    harness.type_text(app.tab_analyzer.password_entry, "Unimed@2024")
+    for name in ("Inglês (Básico)", "Animais (PT-BR)", "Português (Básico)"):
+        harness.select_wordlist(name)
+        harness.click(app.tab_frase.gerar_frase_btn)
+        harness.settle()
+
+
+def test_interactions_update_the_ui(harness):
+    app = harness.app
+    run_session(harness, rounds=3)
+
+    assert len(app.password_history) == 3
+    assert app.tab_senha.status_label.cget("text") == "SENHA SEGURA"
+    assert app.clipboard_text == app.vars["senha_gerada"].get()
+    harness.run_for(60_000) # A limpeza automática do clipboard
+    assert app.clipboard_text == ""
+    assert app.tab_analyzer.criteria_labels["has_symbol"].cget("text").startswith("✔")
+    assert len(app.vars["frase_gerada"].get().split("-")) == app.vars["num_palavras_var"].get()
+
+
+def test_callbacks_stay_within_budget(harness):
+    run_session(harness, rounds=5)
+
+    report = harness.report()
+    for name in ("clique:🔄 Gerar Senha", "clique:📋 Copiar", "selecao_historico", "tecla", "troca_wordlist"):
+        assert name in report
+    slow = {name: round(max_ms, 1) for name, (_, _, max_ms) in report.items() if max_ms > CALLBACK_BUDGET_MS}
+    assert not slow, f"Callbacks acima de {CALLBACK_BUDGET_MS} ms na thread principal: {slow}"
+
+
+def test_thread_count_does_not_grow_with_use(harness):
+    """Os pools são fixos: mais cliques não devem iniciar mais threads."""
+    run_session(harness, rounds=1)
+    after_one = dict(harness.threads_started)
+    run_session(harness, rounds=10)
+
+    pool_threads = {name: n for name, n in harness.threads_started.items() if name.startswith("unimed-")}
+    assert pool_threads == {name: n for name, n in after_one.items() if name.startswith("unimed-")}
+    assert pool_threads["unimed-tarefa_N"] <= 2
+
+
+def test_slow_generation_does_not_block_the_main_thread(harness):
+    """Se a geração em segundo plano atrasar, a finalização espera com `after`, sem travar o Tk."""
+    app = harness.app
+    release = threading.Event()
+    generate = app.password_generator.generate
+    def slow_generate(*options):
+        release.wait(5)
+        return generate(*options)
+    app.password_generator.generate = slow_generate
+
+    harness.click(app.tab_senha.gerar_senha_btn)
+    harness.run_for(2000) # Animação terminada com a geração ainda parada
+    assert app.vars["senha_gerada"].get() not in app.password_history
+    assert max(max_ms for _, _, max_ms in harness.report().values()) < CALLBACK_BUDGET_MS
+
+    release.set()
+    harness.settle()
+    assert app.vars["senha_gerada"].get() in app.password_history
+
+
+def test_history_selection_during_animation_keeps_generation_check(harness):
+    """Escolher uma senha do histórico durante a animação não descarta a verificação da nova senha."""
+    app = harness.app
+    harness.click(app.tab_senha.gerar_senha_btn)
+    harness.settle()
+    check = harness.app_module.check_pwned
+    def slow_check(password):
+        time.sleep(0.05)
+        return check(password)
+    harness.app_module.check_pwned = slow_check
+
+    submitted = app.tasks.metrics()["submitted"]
+    harness.click(app.tab_senha.gerar_senha_btn)
+    deadline = time.monotonic() + 5
+    while app.tasks.metrics()["submitted"] < submitted + 2 and time.monotonic() < deadline:
+        time.sleep(0.001) # Geração concluída e verificação dela enviada
+    harness.select_history(0)
+    harness.settle()
+
+    assert app.vars["senha_gerada"].get() == app.password_history.window()[0]
+    assert app.tab_senha.status_label.cget("text") == "SENHA SEGURA"
+
+
+def test_generation_error_is_shown_instead_of_a_password(harness):
+    """Se o gerador desiste (ex: registro sem senhas inéditas), a UI mostra o erro e não o grava."""
+    app = harness.app
+    def exhausted(*options):
+        raise ValueError("Não foi possível gerar uma senha inédita: aumente o comprimento ou as classes.")
+    app.password_generator.generate = exhausted
+
+    harness.click(app.tab_senha.gerar_senha_btn)
+    harness.settle()
+    assert app.vars["senha_gerada"].get().startswith("Não foi possível")
+    assert app.tab_senha.status_label.cget("text") == "ERRO NA GERAÇÃO"
+    assert len(app.password_history) == 0
+    harness.click(app.tab_senha.copiar_btn)
+    assert app.clipboard_text != app.vars["senha_gerada"].get()
+
+
+def test_closing_shuts_down_background_services(tmp_path, mocker):
+    """Fechar a janela encerra o pool de tarefas e o serviço do clipboard."""
+    harness = UiHarness(tmp_path)
+    tasks = mocker.spy(harness.app.tasks, "shutdown")
+    clipboard = mocker.spy(harness.app.clipboard, "shutdown")
+    harness.close()
+    tasks.assert_called_once()
+    clipboard.assert_called_once()
+
+
+def test_corporate_mode_is_not_persisted(harness):
+    """O modo corporativo sempre começa desligado, então não vai para as configurações."""
+    app = harness.app
+    app.vars["modo_corporativo"].set(True)
+    assert "modo_corporativo" not in app.settings_manager.load_settings()
+
+
+def test_exhausted_passphrase_list_shows_error_and_keeps_button(harness):
+    """Com uma lista minúscula as frases inéditas acabam; o erro aparece e o botão volta a funcionar."""
+    app = harness.app
+    app.tab_frase.full_wordlist_content = ["a", "b"]
+    app.vars["num_palavras_var"].set(3)
+    for _ in range(10): # Só existem 8 frases de 3 palavras
+        harness.click(app.tab_frase.gerar_frase_btn)
+        harness.settle()
+    assert app.vars["frase_gerada"].get() == app.password_generator.PASSPHRASE_ISSUE_FAILURE
+    assert app.tab_frase.gerar_frase_btn.cget("state") == "normal"
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para os Utilitários da UI
+
+Usa um canvas e widgets falsos (sem display) para verificar quantas
+operações o Tk recebe durante um gesto de arraste e quantas janelas as
+dicas (tooltips) criam.
+"""
+
+import os
+import random
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.ui import utils
+from src.ui.utils import DragPreview, ScrambleEffect, Tooltip, TooltipManager
+
+
+class FakeCanvas:
+    """Canvas mínimo que registra as chamadas e guarda os callbacks do `after`."""
+    def __init__(self):
+        self.calls = []
+        self.scheduled = {}
+        self._next_id = 0
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def after(self, ms, func):
+        after_id = f"after#{self._new_id()}"
+        self.scheduled[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def run_pending(self):
+        """Simula a passagem de um quadro."""
+        scheduled, self.scheduled = self.scheduled, {}
+        for func in scheduled.values():
+            func()
+
+    def create_rectangle(self, *coords, **options):
+        self.calls.append(("create_rectangle", coords, options))
+        return self._new_id()
+
+    def create_line(self, *coords, **options):
+        self.calls.append(("create_line", coords, options))
+        return self._new_id()
+
+    def coords(self, item_id, *coords):
+        self.calls.append(("coords", item_id, coords))
+
+    def delete(self, item_id):
+        self.calls.append(("delete", item_id))
+
+
+def test_drag_preview_creates_one_item_and_moves_it():
+    """Um gesto deve criar um item só e movê-lo com coords."""
+    canvas = FakeCanvas()
+    preview = DragPreview(canvas)
+    preview.begin("rectangle", 10, 10, outline="red", width=2)
+
+    for step in range(5):
+        preview.update(20 + step, 30 + step)
+        canvas.run_pending()
+    preview.end()
+
+    names = [call[0] for call in canvas.calls]
+    assert names == ["create_rectangle", "coords", "coords", "coords", "coords", "delete"]
+    assert canvas.calls[-2][2] == (10, 10, 24, 34)
+    assert preview.canvas_ops == 6
+
+
+def test_drag_preview_coalesces_motion_events_per_frame():
+    """Vários eventos de movimento no mesmo quadro viram um único redesenho."""
+    canvas = FakeCanvas()
+    preview = DragPreview(canvas)
+    preview.begin("line", 0, 0, fill="red")
+
+    for step in range(100):
+        preview.update(step, step)
+    assert len(canvas.scheduled) == 1
+    canvas.run_pending()
+
+    assert canvas.calls == [("create_line", (0, 0, 99, 99), {"fill": "red"})]
+    assert preview.canvas_ops == 1
+
+
+def test_drag_preview_end_cancels_pending_frame():
+    """Encerrar o gesto antes do quadro não deve desenhar nada."""
+    canvas = FakeCanvas()
+    preview = DragPreview(canvas)
+    preview.begin("rectangle", 0, 0)
+    preview.update(5, 5)
+    preview.end()
+
+    assert canvas.scheduled == {}
+    assert canvas.calls == []
+    assert preview.canvas_ops == 0
+
+
+def test_scramble_frames_are_generated_in_one_batch(mocker):
+    """Os quadros decorativos vêm de um único lote do PRNG, sem usar o CSPRNG."""
+    secrets_choice = mocker.patch("secrets.choice")
+    rng = random.Random(42)
+    spy = mocker.spy(rng, "choices")
+
+    frames = ScrambleEffect(rng).scramble_frames(64, 10)
+
+    assert len(frames) == 10
+    assert all(len(frame) == 64 for frame in frames)
+    assert all(c in ScrambleEffect.CHAR_POOL for frame in frames for c in frame)
+    assert spy.call_count == 1
+    secrets_choice.assert_not_called()
+
+
+def test_loading_frames_cycle_dots():
+    """A animação da frase-senha mantém o texto "Gerando" com pontos."""
+    frames = ScrambleEffect.loading_frames(4)
+    assert frames == ["Gerando....", "Gerando.", "Gerando..", "Gerando..."]
+
+
+class FakeWidget(FakeCanvas):
+    """Widget mínimo com posição na tela e registro dos binds."""
+    def __init__(self, x=100, y=200):
+        super().__init__()
+        self.x, self.y = x, y
+        self.bindings = {}
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def winfo_rootx(self):
+        return self.x
+
+    def winfo_rooty(self):
+        return self.y
+
+    def winfo_exists(self):
+        return True
+
+    def nametowidget(self, name):
+        return "raiz"
+
+
+def test_tooltip_passing_over_widget_maps_no_window(mocker):
+    """Entrar e sair antes do atraso não cria janela nenhuma."""
+    toplevel = mocker.patch.object(utils.tk, "Toplevel")
+    widget = FakeWidget()
+    Tooltip(widget, "Dica", manager=TooltipManager(delay_ms=500))
+
+    widget.bindings["<Enter>"](None)
+    widget.bindings["<Leave>"](None)
+
+    assert widget.scheduled == {}
+    toplevel.assert_not_called()
+
+
+def test_tooltips_share_one_window(mocker):
+    """Várias dicas reutilizam a mesma janela, só trocando texto e posição."""
+    toplevel = mocker.patch.object(utils.tk, "Toplevel")
+    label = mocker.patch.object(utils.customtkinter, "CTkLabel")
+    manager = TooltipManager()
+    widgets = [FakeWidget(x=10 * i, y=20 * i) for i in range(3)]
+    for i, widget in enumerate(widgets):
+        Tooltip(widget, f"Dica {i}", manager=manager)
+
+    for widget in widgets * 2:
+        widget.bindings["<Enter>"](None)
+        widget.run_pending()
+        widget.bindings["<Leave>"](None)
+
+    assert manager.windows_created == 1
+    toplevel.assert_called_once_with("raiz")
+    window = toplevel.return_value
+    label.return_value.configure.assert_called_with(text="Dica 2")
+    window.wm_geometry.assert_called_with("+45+65")
+    assert window.deiconify.call_count == 6
+    assert window.destroy.call_count == 0
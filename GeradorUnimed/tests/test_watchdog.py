@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o Vigia do Loop do Tk
+
+Usa uma raiz falsa (sem display): os batimentos agendados com `after`
+só rodam quando o teste quiser, simulando um loop travado.
+"""
+
+import logging
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.ui.watchdog import MainLoopWatchdog
+
+
+class FakeRoot:
+    """Guarda o último callback agendado em vez de executá-lo."""
+    def __init__(self):
+        self.pending = None
+
+    def after(self, ms, func):
+        self.pending = func
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        self.pending = None
+
+    def run_pending(self):
+        func, self.pending = self.pending, None
+        func()
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name):
+    handler = ListHandler()
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers = [handler]
+    return logger, handler.messages
+
+
+def test_stall_is_logged_once_with_duration():
+    now = [0.0]
+    logger, messages = make_logger("teste.vigia.relogio")
+    root = FakeRoot()
+    watchdog = MainLoopWatchdog(root, threshold_ms=500, heartbeat_ms=60_000, logger=logger, clock=lambda: now[0])
+    watchdog.start()
+    try:
+        now[0] = 0.4
+        assert watchdog.check() is False
+
+        now[0] = 0.6
+        assert watchdog.check() is True
+        now[0] = 2.0
+        assert watchdog.check() is False # O mesmo travamento não é registrado de novo
+
+        root.run_pending() # O loop volta a responder
+        now[0] = 2.3
+        assert watchdog.check() is False
+    finally:
+        watchdog.stop()
+
+    assert watchdog.stalls == 1
+    assert len(messages) == 2
+    assert "sem responder há 600 ms" in messages[0]
+    assert "test_stall_is_logged_once_with_duration" in messages[0] # Pilha da thread principal
+    assert "após 2000 ms" in messages[1]
+
+
+def block_main_loop(seconds):
+    time.sleep(seconds)
+
+
+def test_monitor_thread_captures_blocking_call():
+    """Com o relógio real, a thread de monitoramento flagra a chamada bloqueante."""
+    logger, messages = make_logger("teste.vigia.thread")
+    root = FakeRoot()
+    watchdog = MainLoopWatchdog(root, threshold_ms=50, heartbeat_ms=10, logger=logger)
+    watchdog.start()
+    try:
+        block_main_loop(0.3)
+        root.run_pending()
+    finally:
+        watchdog.stop()
+
+    assert watchdog.stalls == 1
+    assert "block_main_loop" in messages[0]
+    assert "voltou a responder" in messages[1]
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+Harness de Responsividade da UI (sem display)
+
+Executa a aplicação real (`src.ui.app` e os componentes) sobre um Tk falso:
+os widgets apenas guardam suas opções, e o laço de eventos é uma fila de
+callbacks agendados com `after` em um relógio virtual. O teste (ou o
+benchmark `benchmarks.bench_ui`) dispara cliques, teclas, trocas de lista
+de palavras e seleções do histórico, e o harness mede quanto tempo real
+cada callback ocupa a thread principal e quantas threads foram iniciadas.
+
+Uso:
+    harness = UiHarness(tmp_path)
+    harness.click(harness.app.tab_senha.gerar_senha_btn)
+    harness.settle()
+    harness.report()
+"""
+
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import types
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+# --- Tk falso ---
+
+class FakeTclError(Exception):
+    pass
+
+
+class FakeVariable:
+    """StringVar/IntVar/BooleanVar: guarda o valor e chama os traces de escrita."""
+    def __init__(self, master=None, value=None):
+        self._value = value
+        self._traces = []
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        for callback in list(self._traces):
+            callback("", "", "write")
+
+    def trace_add(self, mode, callback):
+        self._traces.append(callback)
+        return f"trace#{len(self._traces)}"
+
+
+class FakeIntVar(FakeVariable):
+    def get(self):
+        return int(self._value)
+
+
+class FakeBooleanVar(FakeVariable):
+    def get(self):
+        return bool(self._value)
+
+
+class FakeWidget:
+    """Widget genérico: guarda as opções e aceita qualquer chamada de layout."""
+    def __init__(self, master=None, *args, **options):
+        self.master = master
+        self.options = dict(options)
+        self.bindings = {}
+        self.exists = True
+        self._text = str(options.get("text", ""))
+        root = self.root
+        if isinstance(root, FakeTk) and root is not self:
+            root.widgets.add(self)
+
+    @property
+    def root(self):
+        widget = self
+        while widget.master is not None and isinstance(widget.master, FakeWidget):
+            widget = widget.master
+        return widget
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None # pack, grid, lift, focus, ...
+
+    def configure(self, **options):
+        self.options.update(options)
+        if "text" in options:
+            self._text = str(options["text"])
+
+    config = configure
+
+    def cget(self, option):
+        return self._text if option == "text" else self.options.get(option)
+
+    def bind(self, sequence, func=None, add=None):
+        self.bindings[sequence] = func
+
+    def after(self, ms, func=None, *args):
+        return self.root.after(ms, func, *args)
+
+    def after_cancel(self, after_id):
+        self.root.after_cancel(after_id)
+
+    def winfo_exists(self):
+        return self.exists
+
+    def nametowidget(self, name):
+        return self.root
+
+    def winfo_width(self):
+        return 1280
+
+    def winfo_height(self):
+        return 720
+
+    def destroy(self):
+        self.exists = False
+
+    # Entrada/combobox: conteúdo ligado à textvariable, se houver
+    def get(self, *args):
+        var = self.options.get("textvariable") or self.options.get("variable")
+        if var is not None:
+            return var.get()
+        return self.options.get("_value", "")
+
+    def set(self, value):
+        var = self.options.get("variable")
+        if var is not None:
+            var.set(value)
+        self.options["_value"] = value
+
+    def insert(self, index, text):
+        var = self.options.get("textvariable")
+        if var is not None:
+            var.set(var.get() + text)
+        else:
+            self.options["_value"] = self.options.get("_value", "") + text
+
+    def delete(self, first, last=None):
+        var = self.options.get("textvariable")
+        if var is not None:
+            var.set("")
+        else:
+            self.options["_value"] = ""
+
+    # Canvas
+    def canvasx(self, x):
+        return x
+
+    def canvasy(self, y):
+        return y
+
+    def create_text(self, *args, **kwargs):
+        self.root._items += 1
+        return self.root._items
+
+
+class FakeTabview(FakeWidget):
+    def add(self, name):
+        return FakeWidget(self)
+
+
+def callback_name(func):
+    """Nome legível de um callback ("App.animate_generation.animate_step.<lambda>")."""
+    return getattr(func, "__qualname__", repr(func)).replace(".<locals>", "")
+
+
+class FakeTk(FakeWidget):
+    """
+    Raiz com laço de eventos em relógio virtual.
+
+    `after` agenda na fila; `run_for(ms)` avança o relógio executando, em
+    ordem, os callbacks que vencem no intervalo. O tempo real de cada
+    callback é acumulado em `timings` pelo nome da função (chamadas, total
+    e máximo, sem guardar cada amostra: o harness também roda em sessões
+    longas de medição de memória).
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(None)
+        self.now_ms = 0
+        self._queue = []
+        self._cancelled = set()
+        self._ids = itertools.count(1)
+        self._items = 0
+        self.widgets = weakref.WeakSet() # Todos os widgets vivos da aplicação
+        self._lock = threading.Lock() # `after` pode ser chamado de outras threads
+        self.timings = defaultdict(lambda: [0, 0.0, 0.0])
+        self.clipboard_text = ""
+        self.tk = types.SimpleNamespace(call=lambda *args: "x11")
+
+    def after(self, ms, func=None, *args):
+        with self._lock:
+            after_id = f"after#{next(self._ids)}"
+            heapq.heappush(self._queue, (self.now_ms + int(ms), after_id, func, args))
+        return after_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        with self._lock:
+            self._cancelled.add(after_id)
+
+    def clock(self):
+        """Relógio virtual em segundos (para o vigia do loop)."""
+        return self.now_ms / 1000
+
+    def dispatch(self, name, func, *args):
+        """Executa `func` como se fosse um evento do Tk, medindo o tempo na thread principal."""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.timings[name]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+    def run_for(self, ms):
+        """Avança o relógio virtual `ms` milissegundos, executando os callbacks vencidos."""
+        deadline = self.now_ms + ms
+        while True:
+            with self._lock:
+                if not self._queue or self._queue[0][0] > deadline:
+                    break
+                when, after_id, func, args = heapq.heappop(self._queue)
+                if after_id in self._cancelled:
+                    self._cancelled.discard(after_id)
+                    continue
+            self.now_ms = max(self.now_ms, when)
+            self.dispatch(callback_name(func), func, *args)
+        self.now_ms = deadline
+
+    # Área de transferência e seleção (X11)
+    def clipboard_clear(self):
+        self.clipboard_text = ""
+
+    def clipboard_append(self, text):
+        self.clipboard_text += text
+
+    def clipboard_get(self):
+        return self.clipboard_text
+
+    def selection_own_get(self, selection="PRIMARY"):
+        return self if self.clipboard_text else None
+
+
+def fake_tk_modules():
+    """Módulos `tkinter` e `customtkinter` falsos, para `patch.dict(sys.modules, ...)`."""
+    tkinter = types.ModuleType("tkinter")
+    tkinter.TclError = FakeTclError
+    tkinter.StringVar = FakeVariable
+    tkinter.IntVar = FakeIntVar
+    tkinter.BooleanVar = FakeBooleanVar
+    tkinter.Toplevel = tkinter.Canvas = FakeWidget
+    tkinter.END, tkinter.WORD, tkinter.LAST = "end", "word", "last"
+    scrolledtext = types.ModuleType("tkinter.scrolledtext")
+    scrolledtext.ScrolledText = FakeWidget
+    tkinter.scrolledtext = scrolledtext
+
+    ctk = types.ModuleType("customtkinter")
+    ctk.CTk = FakeTk
+    ctk.CTkTabview = FakeTabview
+    for name in ("CTkFrame", "CTkLabel", "CTkButton", "CTkEntry", "CTkCheckBox", "CTkComboBox", "CTkOptionMenu",
+                 "CTkSlider", "CTkCanvas", "CTkTextbox", "CTkProgressBar", "CTkToplevel", "CTkImage", "CTkFont"):
+        setattr(ctk, name, type(name, (FakeWidget,), {}))
+    ctk.set_appearance_mode = ctk.set_default_color_theme = lambda *args: None
+
+    return {"tkinter": tkinter, "tkinter.scrolledtext": scrolledtext, "customtkinter": ctk}
+
+
+class FakePhotoImage:
+    """Substitui o ImageTk.PhotoImage (que exige um Tk de verdade), guardando a imagem."""
+    def __init__(self, image=None, **kwargs):
+        self.image = image.copy() if image is not None else None # O Tk guarda sua própria cópia
+
+
+def load_ui_modules():
+    """
+    Importa cópias dos módulos da UI (`src.ui.app`, `src.ui.screenshot_editor`,
+    ...) ligadas ao Tk falso, sem alterar os módulos já importados pelos
+    outros testes. Retorna {nome: módulo}.
+
+    Só o Tk e os módulos da UI são trocados e depois restaurados; os demais
+    (src.logic, src.metrics, PIL, ...) continuam sendo os mesmos objetos.
+    """
+    import src
+    import PIL.ImageTk # Com o tkinter verdadeiro, antes da troca
+    fakes = fake_tk_modules()
+    ui_names = [n for n in sys.modules if n == "src.ui" or n.startswith("src.ui.")]
+    saved = {name: sys.modules.get(name) for name in list(fakes) + ui_names}
+    previous_ui = getattr(src, "ui", None)
+    try:
+        for name in ui_names:
+            del sys.modules[name]
+        sys.modules.update(fakes)
+        import src.ui.app
+        import src.ui.screenshot_editor
+        modules = {name: module for name, module in sys.modules.items() if name.startswith("src.ui.")}
+        modules["src.ui.screenshot_editor"].ImageTk = types.SimpleNamespace(PhotoImage=FakePhotoImage)
+        return modules
+    finally:
+        for name in [n for n in sys.modules if n in fakes or n == "src.ui" or n.startswith("src.ui.")]:
+            del sys.modules[name]
+        sys.modules.update({name: module for name, module in saved.items() if module is not None})
+        if previous_ui is not None:
+            src.ui = previous_ui
+
+
+@contextmanager
+def count_thread_starts(counter):
+    """Conta as threads iniciadas (inclusive as dos pools) enquanto ativo."""
+    original_start = threading.Thread.start
+
+    def start(thread):
+        counter[re.sub(r"\d+", "N", thread.name)] += 1 # Agrupa "unimed-tarefa_0", "unimed-tarefa_1", ...
+        return original_start(thread)
+
+    with patch.object(threading.Thread, "start", start):
+        yield
+
+
+class UiHarness:
+    """Aplicação real sobre o Tk falso, com entradas sintéticas e medições."""
+    def __init__(self, config_dir, settings=None, pwned_response="0000000000000000000000000000000000A:1"):
+        # Por padrão sem a animação de fundo, que se reagenda a cada 100 ms
+        settings = {"animacao_ativa": False, **(settings or {})}
+        app_dir = os.path.join(str(config_dir), "GeradorUnimed")
+        os.makedirs(app_dir, exist_ok=True)
+        with open(os.path.join(app_dir, "config.json"), "w", encoding="utf-8") as f:
+            json.dump(settings, f)
+
+        self.ui = load_ui_modules()
+        self.app_module = self.ui["src.ui.app"]
+        self.threads_started = defaultdict(int)
+        self._patches = [
+            patch.dict(os.environ, {"XDG_CONFIG_HOME": str(config_dir), "APPDATA": str(config_dir)}),
+            # Sem rede: a API Pwned Passwords responde na hora. Função simples, não um
+            # Mock, que guardaria cada chamada e pareceria um vazamento no teste de longa duração
+            patch("src.logic.requests.get", new=lambda *args, **kwargs: types.SimpleNamespace(
+                text=pwned_response, raise_for_status=lambda: None)),
+            count_thread_starts(self.threads_started),
+        ]
+        for p in self._patches:
+            p.__enter__()
+        from src.logic import _fetch_pwned_hashes
+        _fetch_pwned_hashes.cache_clear()
+
+        self.app = self.app_module.UnimedPasswordGeneratorApp()
+        self.app.watchdog.clock = self.app.clock # O vigia acompanha o relógio virtual
+        self.run_for(0) # Inicia o vigia e o que mais estiver agendado para já
+
+    @property
+    def timings(self):
+        return self.app.timings
+
+    def run_for(self, ms):
+        self.app.run_for(ms)
+
+    def settle(self, horizon_ms=5000, timeout=10.0, step_ms=25):
+        """
+        Avança o relógio até as tarefas em segundo plano terminarem e não haver
+        callbacks pendentes nos próximos `horizon_ms` (ex: a restauração do
+        botão "Copiado!"); temporizadores mais distantes, como a limpeza do
+        clipboard, ficam na fila.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.app.tasks.metrics()["in_flight"]:
+                self.run_for(step_ms)
+                time.sleep(0.001) # Dá vez às threads do pool
+                continue
+            due = self._next_non_periodic()
+            if due is None or due > self.app.now_ms + horizon_ms:
+                return
+            self.run_for(due - self.app.now_ms)
+        raise TimeoutError("A UI não ficou ociosa a tempo.")
+
+    def _next_non_periodic(self):
+        """Horário do próximo callback que não se reagenda sozinho (None se não houver)."""
+        # O batimento do vigia e a animação se reagendam para sempre
+        periodic = ("MainLoopWatchdog._beat", "UnimedWordAnimator.animate")
+        with self.app._lock:
+            return min((when for when, after_id, func, _ in self.app._queue
+                        if after_id not in self.app._cancelled and callback_name(func) not in periodic), default=None)
+
+    # --- Entradas sintéticas ---
+
+    def click(self, button):
+        """Clique em um botão habilitado (executa o `command`)."""
+        if button.options.get("state") == "disabled":
+            return False
+        self.app.dispatch(f"clique:{button.cget('text').strip()}", button.options["command"])
+        return True
+
+    def type_text(self, entry, text):
+        """Digita `text` em `entry`, uma tecla por vez, disparando <KeyRelease>."""
+        handler = entry.bindings.get("<KeyRelease>")
+        for char in text:
+            entry.insert("end", char)
+            if handler:
+                self.app.dispatch("tecla", handler, types.SimpleNamespace(char=char, widget=entry))
+
+    def hover(self, widget, dwell_ms=600):
+        """Passa o mouse sobre `widget` por `dwell_ms` e sai (mostra e esconde a dica)."""
+        self.app.dispatch("entrada_mouse", widget.bindings["<Enter>"], types.SimpleNamespace(widget=widget))
+        self.run_for(dwell_ms)
+        self.app.dispatch("saida_mouse", widget.bindings["<Leave>"], types.SimpleNamespace(widget=widget))
+
+    def hoverable_widgets(self):
+        """Widgets vivos com dica (<Enter> associado)."""
+        return [w for w in list(self.app.widgets) if w.exists and "<Enter>" in w.bindings]
+
+    def open_editor(self, image):
+        """Abre o editor de capturas sobre `image` (com PhotoImage falso)."""
+        editor_class = self.ui["src.ui.screenshot_editor"].ScreenshotEditor
+        return self.app.dispatch("abrir_editor", editor_class, self.app, image)
+
+    def wheel(self, widget, x, y, zoom_in=True):
+        event = types.SimpleNamespace(x=x, y=y, num=4 if zoom_in else 5, delta=0)
+        self.app.dispatch("roda_mouse", widget.bindings["<MouseWheel>"], event)
+
+    def drag(self, widget, button, start, end):
+        """Arrasta com o botão `button` (1: ferramenta; 2/3: pan) de `start` até `end`."""
+        press = "<ButtonPress-1>" if button == 1 else f"<ButtonPress-{button}>"
+        motion = f"<B{button}-Motion>"
+        self.app.dispatch("arraste", widget.bindings[press], types.SimpleNamespace(x=start[0], y=start[1]))
+        self.app.dispatch("arraste", widget.bindings[motion], types.SimpleNamespace(x=end[0], y=end[1]))
+        if button == 1:
+            self.app.dispatch("arraste", widget.bindings["<ButtonRelease-1>"], types.SimpleNamespace(x=end[0], y=end[1]))
+
+    def select_wordlist(self, name):
+        tab = self.app.tab_frase
+        tab.wordlist_combo.set(name)
+        self.app.dispatch("troca_wordlist", tab.wordlist_combo.options["command"], name)
+
+    def select_history(self, index=0):
+        values = self.app.tab_senha.history_menu.options.get("values") or []
+        self.app.dispatch("selecao_historico", self.app.on_history_select, values[index])
+
+    # --- Resultados ---
+
+    def report(self):
+        """{nome: (chamadas, total ms, máximo ms)} do tempo na thread principal."""
+        return {
+            name: (calls, total * 1000, longest * 1000)
+            for name, (calls, total, longest) in sorted(self.timings.items())
+        }
+
+    def close(self):
+        try:
+            self.app.dispatch("fechar", self.app.on_closing)
+        finally:
+            for p in reversed(self._patches):
+                p.__exit__(None, None, None)